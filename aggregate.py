@@ -0,0 +1,130 @@
+import operator
+
+from table import STR, TIMESTAMP, Table, text_key
+
+
+# Combinação do acumulador de cada função com um novo valor
+COMBINE = {
+    'SUM': operator.add,
+    'AVG': operator.add,
+    'MIN': min,
+    'MAX': max,
+}
+
+
+def label(item):
+    """
+    Nome da coluna do resultado para um elemento da lista do SELECT (p.ex. 'AVG(Temperatura)').
+    """
+    if isinstance(item, tuple):
+        return f"{item[0]}({item[1]})"
+    return item
+
+
+def to_number(column, kind):
+    """
+    Devolve a conversão a aplicar aos valores de uma coluna para SUM e AVG: nenhuma para
+    colunas numéricas, float (com erro claro) para colunas de texto.
+    """
+    if kind == TIMESTAMP:
+        raise ValueError(f"Column {column} is not numeric")
+    if kind != STR:
+        return None
+
+    def convert(cell):
+        try:
+            return float(cell)
+        except ValueError:
+            raise ValueError(f"Column {column} is not numeric") from None
+
+    return convert
+
+
+def to_ordered(kind):
+    """
+    Devolve a conversão a aplicar aos valores de uma coluna para MIN e MAX: nenhuma para
+    colunas numéricas e 'timestamp'; numa coluna de texto, (text_key, texto), para que os
+    números escritos como texto se comparem pelo valor, como em SUM e AVG e no WHERE, e o
+    resultado seja o texto original.
+    """
+    if kind != STR:
+        return None
+    return lambda cell: (text_key(cell), cell)
+
+
+def group_aggregate(table, ids, items, group_by):
+    """
+    Agregação por hash numa só passagem: percorre as linhas selecionadas (ids, ou todas
+    se None) e mantém um acumulador por grupo e por função. Só os acumuladores ficam em
+    memória, por isso o espaço depende do número de grupos e não do número de linhas.
+
+    items é a lista do SELECT (nomes de colunas do GROUP BY ou tuplos (função, coluna));
+    devolve uma Table com uma linha por grupo, pela ordem em que cada grupo apareceu.
+    Sem GROUP BY toda a seleção é um único grupo.
+    """
+    for col in group_by:
+        if col not in table.header:
+            raise ValueError(f"Column {col} does not exist")
+    for item in items:
+        if isinstance(item, tuple):
+            function, col = item
+            if col == '*' and function != 'COUNT':
+                raise ValueError(f"{function}(*) is not supported")
+            if col != '*' and col not in table.header:
+                raise ValueError(f"Column {col} does not exist")
+        elif item not in group_by:
+            raise ValueError(f"Column {item} must appear in GROUP BY")
+
+    # Colunas lidas: as do GROUP BY seguidas das usadas pelas agregações
+    positions = [table.index(col) for col in group_by]
+    aggregates = []
+    for item in items:
+        if isinstance(item, tuple):
+            function, col = item
+            if function == 'COUNT':
+                aggregates.append((function, None, None))   # Sem valores nulos, conta as linhas
+                continue
+            idx = table.index(col)
+            convert = to_number(col, table.types[idx]) if function in ('SUM', 'AVG') else to_ordered(table.types[idx])
+            aggregates.append((function, len(positions), convert))
+            positions.append(idx)
+    width = len(group_by)
+
+    groups = {}
+    for row in table.rows(ids, positions):
+        key = row[:width]
+        state = groups.get(key)
+        if state is None:
+            state = groups[key] = [None] * len(aggregates) + [0]
+        state[-1] += 1
+        for k, (function, p, convert) in enumerate(aggregates):
+            if p is None:
+                continue
+            value = row[p] if convert is None else convert(row[p])
+            current = state[k]
+            state[k] = value if current is None else COMBINE[function](current, value)
+    if not groups and not group_by:
+        groups[()] = [None] * len(aggregates) + [0]     # Agregação global sobre zero linhas
+
+    rows = []
+    for key, state in groups.items():
+        count = state.pop()
+        results = iter([finish(function, value, count) for (function, _, _), value in zip(aggregates, state)])
+        rows.append([str(next(results)) if isinstance(item, tuple) else str(key[group_by.index(item)])
+                     for item in items])
+    return Table.from_rows([label(item) for item in items], rows)
+
+
+def finish(function, value, count):
+    """
+    Valor final de uma agregação ('' se não houve linhas, pois não existem valores nulos).
+    """
+    if function == 'COUNT':
+        return count
+    if value is None:
+        return ''
+    if function == 'AVG':
+        return value / count
+    if isinstance(value, tuple):
+        return value[-1]        # MIN e MAX numa coluna de texto (ver to_ordered)
+    return value
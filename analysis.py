@@ -0,0 +1,117 @@
+from parallel import condition_columns
+
+
+# Tipos de instrução SELECT na AST (ver interpreter.SELECT_KINDS)
+SELECT_KINDS = ('select_table', 'select_columns', 'select_where', 'select_where_and',
+                'select_limit', 'select_limit_columns', 'select_query')
+
+
+class ColumnAnalysis:
+    """
+    Análise das colunas usadas por um script: para cada IMPORT sem opções, as colunas da
+    tabela importada que as instruções seguintes do script podem ler (no SELECT, WHERE,
+    GROUP BY, ORDER BY, CREATE INDEX, ...). As outras não precisam de ser lidas do ficheiro.
+
+    A análise é conservadora: uma instrução que usa todas as colunas de uma tabela (PRINT,
+    EXPORT TABLE, SELECT *, JOIN) faz com que o IMPORT de onde a tabela vem leia todas as
+    colunas, e uma instrução cujo efeito não se consegue prever (p.ex. EXPLAIN, ou um CALL
+    de um procedimento desconhecido) faz com que todos os IMPORT leiam todas as colunas.
+    As colunas de uma tabela criada a partir de outra (CREATE TABLE ... SELECT *, RENAME)
+    contam como colunas da tabela de origem.
+
+    Só é válida se o script for tudo o que vai ser executado sobre as tabelas importadas:
+    instruções executadas depois (p.ex. numa sessão interativa) não veriam as colunas omitidas.
+    """
+
+    def __init__(self, interpreter):
+        """
+        Atributos:
+            interpreter (Interpreter): Interpretador que vai executar o script (procedimentos
+                já definidos e decomposição dos SELECT).
+            needs (dict): Colunas usadas, pela posição de cada IMPORT no script (None: todas).
+            sources (dict): Posições dos IMPORT de onde vêm as colunas de cada tabela.
+        """
+        self.interpreter = interpreter
+        self.needs = {}
+        self.sources = {}
+
+    def needed(self, statements):
+        """
+        Devolve {posição do IMPORT no script: colunas usadas} para os IMPORT que podem
+        ler só parte das colunas (os que não usam nenhuma coluna não são incluídos).
+        """
+        self.needs, self.sources = {}, {}
+        procedures = {name: procedure.statements for name, procedure in self.interpreter.procedures.items()}
+        for k, statement in enumerate(statements):
+            if statement[0] == 'import' and len(statement) == 3:
+                self.needs[k] = set()
+                self.sources[statement[1]] = {k}
+            else:
+                self.visit(statement, procedures)
+        return {k: columns for k, columns in self.needs.items() if columns}
+
+    def visit(self, statement, procedures, calling=()):
+        kind = statement[0]
+        if kind == 'import':
+            self.sources[statement[1]] = set()     # Colunas já escolhidas (COLUMNS) ou mapeadas
+        elif kind in ('print', 'export'):
+            self.use_all(statement[1])
+        elif kind in SELECT_KINDS:
+            self.query(statement)
+        elif kind == 'export_query':
+            self.query(statement[1])
+        elif kind == 'create_from_query':
+            table = self.interpreter.query_parts(statement[2])[0]
+            everything = self.query(statement[2])
+            self.sources[statement[1]] = set(self.sources.get(table, ())) if everything else set()
+        elif kind == 'create_select_columns':
+            _, new_table, columns, source = statement
+            if isinstance(columns, str):
+                columns = [col.strip() for col in columns.split(",")]
+            self.use(source, columns)
+            self.sources[new_table] = set()
+        elif kind == 'create_join':
+            _, new_table, table1, table2, _ = statement
+            self.use_all(table1)
+            self.use_all(table2)
+            self.sources[new_table] = set()
+        elif kind == 'create_index':
+            self.use(statement[2], [statement[3]])
+        elif kind == 'rename':
+            self.sources[statement[2]] = self.sources.pop(statement[1], set())
+        elif kind == 'discard':
+            self.sources.pop(statement[1], None)
+        elif kind == 'procedure':
+            procedures[statement[1]] = statement[2]
+        elif kind == 'call' and statement[1] in procedures and statement[1] not in calling:
+            for child in procedures[statement[1]]:
+                self.visit(child, procedures, calling + (statement[1],))
+        elif kind not in ('materialize', 'drop_index'):
+            for k in self.needs:
+                self.needs[k] = None
+
+    def query(self, statement):
+        """
+        Regista as colunas usadas por um SELECT; devolve True se projeta todas as colunas.
+        """
+        table, columns, clauses = self.interpreter.query_parts(statement)
+        if isinstance(columns, str) and columns != '*':
+            columns = [col.strip() for col in columns.split(",")]
+        if columns == '*':
+            self.use_all(table)
+            return True
+        names = [col[1] if isinstance(col, tuple) else col for col in columns]
+        names += condition_columns(clauses.get('where') or [])
+        names += clauses.get('group_by') or []
+        names += [col[1] if isinstance(col, tuple) else col for col, _ in clauses.get('order_by') or []]
+        self.use(table, names)
+        return False
+
+    def use(self, table, columns):
+        for k in self.sources.get(table, ()):
+            if self.needs[k] is not None:
+                self.needs[k].update(col for col in columns if col != '*')
+
+    def use_all(self, table):
+        for k in self.sources.get(table, ()):
+            self.needs[k] = None
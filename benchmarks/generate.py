@@ -0,0 +1,98 @@
+"""
+Gera ficheiros CSV sintéticos com o formato de examples/observacoes.csv e
+examples/estacoes.csv, para os benchmarks.
+
+Uso: python benchmarks/generate.py DIRETORIA LINHAS [--stations N] [--seed S]
+"""
+import argparse
+import csv
+import os
+import random
+from datetime import datetime, timedelta
+
+OBSERVATIONS_HEADER = ["Id", "IntensidadeVentoKM", "Temperatura", "Radiacao", "DirecaoVento",
+                       "IntensidadeVento", "Humidade", "DataHoraObservacao"]
+STATIONS_HEADER = ["Id", "Local", "Coordenadas"]
+
+DIRECTIONS = ["N", "NE", "E", "SE", "S", "SW", "W", "NW"]
+PLACES = ["Terras de Bouro/Barral (CIM)", "Graciosa / Serra das Fontes (DROTRH)", "Olhão, EPPO",
+          "Setúbal, Areias", "Braga, Merelim", "Faro, Aeroporto", "Évora", "Viana do Castelo, Chafé"]
+
+START = datetime(2025, 4, 10, 19, 0)
+
+
+def tenths(rng, low, high):
+    """
+    Valor com uma casa decimal entre low e high, escrito como o Python o volta a ler
+    (nunca '-0.0', para que a coluna seja numérica).
+    """
+    return f"{rng.randint(round(low * 10), round(high * 10)) / 10:.1f}"
+
+
+def stations_for(rows):
+    """
+    Número de estações por omissão para um ficheiro de observações com rows linhas.
+    """
+    return max(4, rows // 1000)
+
+
+def write_stations(path, stations, seed=0):
+    rng = random.Random(seed)
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(STATIONS_HEADER)
+        for i in range(1, stations + 1):
+            coordinates = f"[{rng.uniform(-31.3, -6.2):.8f},{rng.uniform(32.6, 42.2):.8f}]"
+            writer.writerow([f"E{i}", f"{rng.choice(PLACES)} {i}", coordinates])
+
+
+def write_observations(path, rows, stations, seed=0):
+    rng = random.Random(seed + 1)
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(OBSERVATIONS_HEADER)
+        batch = []
+        for i in range(rows):
+            wind_km = tenths(rng, 0, 60)
+            batch.append([
+                f"E{rng.randint(1, stations)}",
+                wind_km,
+                tenths(rng, -5, 40),
+                tenths(rng, 0, 900),
+                rng.choice(DIRECTIONS),
+                f"{float(wind_km) / 3.6:.1f}",
+                tenths(rng, 20, 100),
+                (START + timedelta(minutes=10 * (i // stations))).strftime("%Y-%m-%dT%H:%M"),
+            ])
+            if len(batch) >= 10000:
+                writer.writerows(batch)
+                batch = []
+        writer.writerows(batch)
+
+
+def generate(directory, rows, stations=None, seed=0):
+    """
+    Escreve observacoes.csv (rows linhas) e estacoes.csv em directory e devolve os dois caminhos.
+    """
+    stations = stations or stations_for(rows)
+    os.makedirs(directory, exist_ok=True)
+    observations = os.path.join(directory, "observacoes.csv")
+    stations_path = os.path.join(directory, "estacoes.csv")
+    write_stations(stations_path, stations, seed)
+    write_observations(observations, rows, stations, seed)
+    return observations, stations_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory")
+    parser.add_argument("rows", type=lambda text: int(float(text)))
+    parser.add_argument("--stations", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for path in generate(args.directory, args.rows, args.stations, args.seed):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
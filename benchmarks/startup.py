@@ -0,0 +1,46 @@
+"""
+Mede o tempo de arranque a frio de main.py: cada execução é um processo novo, como nas
+tarefas agendadas que correm muitos scripts .fca curtos.
+
+Uso: python benchmarks/startup.py [script.fca] [--runs N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def measure(command, runs):
+    """
+    Corre o comando runs vezes e devolve os tempos de parede (segundos) de cada execução.
+    """
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def report(label, times):
+    print(f"{label:<28} min {min(times) * 1000:7.1f} ms   mediana {statistics.median(times) * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("script", nargs="?", default=os.path.join("examples", "entrada.fca"))
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    report("python (sem nada)", measure([sys.executable, "-c", "pass"], args.runs))
+    report("import interpreter", measure([sys.executable, "-c", "import interpreter"], args.runs))
+    report("Interpreter()", measure([sys.executable, "-c", "import interpreter; interpreter.Interpreter()"], args.runs))
+    report(f"main.py {args.script}", measure([sys.executable, "main.py", "--no-cache", args.script], args.runs))
+
+
+if __name__ == "__main__":
+    main()
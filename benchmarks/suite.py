@@ -0,0 +1,249 @@
+"""
+Benchmark do interpretador sobre dados sintéticos (ver generate.py), de 1e3 a 1e7 linhas.
+
+Para cada tamanho mede import, SELECT (completo, WHERE, LIMIT), JOIN, CREATE TABLE ...
+SELECT, GROUP BY, ORDER BY ... LIMIT, EXPORT e CALL de um procedimento: tempo de parede,
+linhas por segundo e pico de memória (tracemalloc, numa segunda execução). O mesmo
+trabalho é feito no sqlite3 da biblioteca padrão, que serve de referência de velocidade
+e de correção (os resultados têm de ser iguais).
+
+Os resultados são escritos em JSON. Com --compare, o processo termina com código 1 se
+algum passo ficar mais lento do que o resultado anterior (para além de --tolerance) ou
+se algum resultado for diferente do do sqlite.
+
+Uso: python benchmarks/suite.py [--sizes 1e3 1e4 1e5] [--output results.json]
+                                [--compare anterior.json] [--data-dir DIR] [--no-memory]
+"""
+import argparse
+import contextlib
+import csv
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from generate import generate                       # noqa: E402
+from interpreter import Interpreter                 # noqa: E402
+from timestamps import format_timestamp, parse_timestamp    # noqa: E402
+
+NUMERIC = {"IntensidadeVentoKM", "Temperatura", "Radiacao", "IntensidadeVento", "Humidade"}
+
+# (passo, script, resultado a comparar, SQL de referência, ordem relevante)
+#   resultado: ('query', None) volta a executar o SELECT; ('table', nome) lê a tabela criada;
+#   ('csv', None) lê o ficheiro exportado.
+STEPS = [
+    ("import", 'IMPORT TABLE observacoes FROM "{observations}"; IMPORT TABLE estacoes FROM "{stations}";',
+     None, None, True),
+    ("select", "SELECT * FROM observacoes;",
+     ("query", None), "SELECT * FROM observacoes", True),
+    ("select_where", "SELECT * FROM observacoes WHERE Temperatura > 15 AND Humidade < 80;",
+     ("query", None), "SELECT * FROM observacoes WHERE Temperatura > 15 AND Humidade < 80", True),
+    ("select_limit", "SELECT Id, Temperatura FROM observacoes LIMIT 100;",
+     ("query", None), "SELECT Id, Temperatura FROM observacoes LIMIT 100", True),
+    ("join", "CREATE TABLE Junto FROM observacoes JOIN estacoes USING Id;",
+     ("table", "Junto"), "SELECT o.*, e.Local, e.Coordenadas FROM observacoes o JOIN estacoes e ON o.Id = e.Id "
+                         "ORDER BY o.rowid, e.rowid", True),
+    ("create_from_query", "CREATE TABLE Quentes SELECT * FROM observacoes WHERE Temperatura > 30;",
+     ("table", "Quentes"), "SELECT * FROM observacoes WHERE Temperatura > 30", True),
+    ("group_by", "SELECT Id, COUNT(*), AVG(Temperatura), MAX(Humidade) FROM observacoes GROUP BY Id;",
+     ("query", None), "SELECT Id, COUNT(*), AVG(Temperatura), MAX(Humidade) FROM observacoes GROUP BY Id", False),
+    ("order_by_limit", "SELECT * FROM observacoes ORDER BY Temperatura DESC, Id LIMIT 10;",
+     ("query", None), "SELECT * FROM observacoes ORDER BY Temperatura DESC, Id, rowid LIMIT 10", True),
+    ("export", 'EXPORT TABLE Quentes AS "{export}";',
+     ("csv", None), "SELECT * FROM observacoes WHERE Temperatura > 30", True),
+    ("procedure", "PROCEDURE Ventosos DO CREATE TABLE Ventosos SELECT * FROM observacoes "
+                  "WHERE IntensidadeVentoKM > 40; END; CALL Ventosos;",
+     ("table", "Ventosos"), "SELECT * FROM observacoes WHERE IntensidadeVentoKM > 40", True),
+]
+
+
+def parse_size(text):
+    return int(float(text))
+
+
+def run_quiet(function, *args):
+    """
+    Executa a função com o stdout descartado (o interpretador imprime cada instrução e resultado).
+    """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        return function(*args)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = run_quiet(function, *args)
+    return time.perf_counter() - start, result
+
+
+def peak_memory(function, *args):
+    """
+    Pico de memória alocada (bytes) durante a execução da função.
+    """
+    tracemalloc.start()
+    try:
+        run_quiet(function, *args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def normalize(rows):
+    """
+    Converte linhas para uma forma comparável entre os dois motores: datas e horas
+    ISO-8601 no formato normalizado (as colunas 'timestamp' são inteiros, mas o sqlite
+    guarda o texto original), números como float arredondados a 10 algarismos
+    significativos, o resto como texto.
+    """
+    normalized = []
+    for row in rows:
+        cells = []
+        for cell in row:
+            seconds = parse_timestamp(str(cell))
+            if seconds is not None:
+                cells.append(format_timestamp(seconds))
+                continue
+            try:
+                cells.append(f"{float(cell):.10g}")
+            except (TypeError, ValueError):
+                cells.append(str(cell))
+        normalized.append(tuple(cells))
+    return normalized
+
+
+def load_sqlite(observations, stations):
+    """
+    Cria uma base de dados sqlite em memória com as duas tabelas (colunas numéricas como REAL).
+    """
+    connection = sqlite3.connect(":memory:")
+    for name, path in (("observacoes", observations), ("estacoes", stations)):
+        with open(path, newline="") as file:
+            reader = csv.reader(file)
+            header = next(reader)
+            columns = ", ".join(f"{col} REAL" if col in NUMERIC else f"{col} TEXT" for col in header)
+            connection.execute(f"CREATE TABLE {name} ({columns})")
+            marks = ", ".join("?" * len(header))
+            connection.executemany(f"INSERT INTO {name} VALUES ({marks})", reader)
+    connection.commit()
+    return connection
+
+
+def our_result(interpreter, script, result, export_path):
+    kind, name = result
+    if kind == "query":
+        statement = interpreter.parser.parse_input(script)[0]
+        return list(interpreter.execute_select(statement).rows())
+    if kind == "table":
+        return list(interpreter.dictionary[name].rows())
+    with open(export_path, newline="") as file:
+        return list(csv.reader(file))[1:]
+
+
+def run_size(rows, data_dir, workers, memory):
+    """
+    Gera (ou reutiliza) os dados com rows linhas e mede todos os passos; devolve os registos.
+    """
+    directory = os.path.join(data_dir, str(rows))
+    observations = os.path.join(directory, "observacoes.csv")
+    stations = os.path.join(directory, "estacoes.csv")
+    if not (os.path.exists(observations) and os.path.exists(stations)):
+        generate(directory, rows)
+    export_path = os.path.join(directory, "export.csv")
+    paths = {"observations": observations, "stations": stations, "export": export_path}
+
+    interpreter = Interpreter(cache=False, workers=workers)
+    sqlite_import, connection = timed(load_sqlite, observations, stations)
+    records = []
+    for step, script, result, sql, ordered in STEPS:
+        script = script.format(**paths)
+        seconds, _ = timed(interpreter.start, script)
+        # A segunda execução (memória) do import é feita num interpretador novo: as tabelas já existem
+        again = Interpreter(cache=False, workers=workers) if step == "import" else interpreter
+        record = {
+            "rows": rows,
+            "step": step,
+            "seconds": seconds,
+            "rows_per_second": rows / seconds if seconds else None,
+            "peak_bytes": peak_memory(again.start, script) if memory else None,
+        }
+        if sql is None:
+            record["sqlite_seconds"] = sqlite_import
+            record["matches_sqlite"] = None
+        else:
+            record["sqlite_seconds"], expected = timed(lambda: connection.execute(sql).fetchall())
+            ours = normalize(our_result(interpreter, script, result, export_path))
+            expected = normalize(expected)
+            record["matches_sqlite"] = ours == expected if ordered else sorted(ours) == sorted(expected)
+        records.append(record)
+        report(record)
+    connection.close()
+    return records
+
+
+def report(record):
+    memory = f"{record['peak_bytes'] / 2 ** 20:8.1f} MiB" if record["peak_bytes"] is not None else " " * 12
+    check = {True: "ok", False: "DIFERENTE", None: "-"}[record["matches_sqlite"]]
+    print(f"{record['rows']:>10} {record['step']:<18} {record['seconds'] * 1000:10.1f} ms "
+          f"(sqlite {record['sqlite_seconds'] * 1000:10.1f} ms) {memory}  {check}", flush=True)
+
+
+def regressions(records, previous, tolerance):
+    """
+    Devolve as mensagens dos passos mais lentos do que no resultado anterior, ou diferentes do sqlite.
+    """
+    before = {(r["rows"], r["step"]): r["seconds"] for r in previous.get("results", [])}
+    problems = []
+    for record in records:
+        key = (record["rows"], record["step"])
+        if record["matches_sqlite"] is False:
+            problems.append(f"{key}: resultado diferente do sqlite")
+        if key in before and record["seconds"] > before[key] * (1 + tolerance):
+            problems.append(f"{key}: {before[key]:.3f}s -> {record['seconds']:.3f}s")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=parse_size, default=[1000, 10000, 100000])
+    parser.add_argument("--output", default="results.json")
+    parser.add_argument("--compare", help="resultado JSON anterior com que comparar os tempos")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="abrandamento tolerado (0.25 = 25%%)")
+    parser.add_argument("--data-dir", help="diretoria onde guardar (e reutilizar) os dados gerados")
+    parser.add_argument("--workers", type=int, help="processos usados no WHERE (ver Interpreter)")
+    parser.add_argument("--no-memory", action="store_true", help="não mede o pico de memória")
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        data_dir = args.data_dir or stack.enter_context(tempfile.TemporaryDirectory())
+        records = []
+        for rows in args.sizes:
+            records.extend(run_size(rows, data_dir, args.workers, not args.no_memory))
+
+    results = {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sqlite": sqlite3.sqlite_version,
+        "results": records,
+    }
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+    problems = [f"{(r['rows'], r['step'])}: resultado diferente do sqlite" for r in records if r["matches_sqlite"] is False]
+    if args.compare:
+        with open(args.compare) as file:
+            problems = regressions(records, json.load(file), args.tolerance)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+from collections import OrderedDict
+import hashlib
+import os
+import pickle
+import sys
+import threading
+
+from table import EncodedColumn, NumberColumn, Table, TableView, TimestampColumn, ViewColumn
+
+
+# Tamanho máximo, por omissão, da cache de resultados das consultas
+RESULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def default_directory():
+    """
+    Diretoria da cache: $FCA_CACHE_DIR, ou $XDG_CACHE_HOME/pl-fca, ou ~/.cache/pl-fca.
+    """
+    if os.environ.get('FCA_CACHE_DIR'):
+        return os.environ['FCA_CACHE_DIR']
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'pl-fca')
+
+
+class TableCache:
+    """
+    Cache persistente, em formato binário (pickle), das tabelas importadas de ficheiros CSV.
+
+    Cada entrada guarda a tabela já convertida para colunas tipadas e é identificada pelo
+    caminho absoluto do ficheiro; só é usada se o tamanho e a data de modificação do
+    ficheiro forem os mesmos de quando foi criada. O espaço total é limitado a max_bytes:
+    quando é ultrapassado são apagadas as entradas usadas há mais tempo (LRU, pela data
+    de modificação da entrada, atualizada a cada leitura).
+    """
+
+    SUFFIX = '.fcache'
+
+    # Versão do formato das entradas: tem de mudar sempre que mudam as classes das colunas
+    # ou a inferência de tipos, para que as entradas antigas não sejam usadas
+    # (2: colunas codificadas por dicionário; 3: colunas 'timestamp'; 4: colunas 'float' com
+    # inteiros; 5: forma de escrita das colunas 'timestamp')
+    FORMAT = 5
+
+    def __init__(self, directory=None, max_bytes=1024 * 1024 * 1024):
+        """
+        Atributos:
+            directory (str): Diretoria onde são guardadas as entradas.
+            max_bytes (int): Tamanho máximo total da cache.
+        """
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+
+    def entry_path(self, file_path):
+        key = hashlib.sha1(os.path.abspath(file_path).encode()).hexdigest()
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def signature(self, file_path):
+        stat = os.stat(file_path)
+        return {'format': self.FORMAT, 'source': os.path.abspath(file_path), 'size': stat.st_size,
+                'mtime': stat.st_mtime_ns}
+
+    def load(self, file_path):
+        """
+        Devolve a tabela guardada para o ficheiro, ou None se não existir ou estiver desatualizada.
+        """
+        path = self.entry_path(file_path)
+        try:
+            with open(path, 'rb') as file:
+                if pickle.load(file) != self.signature(file_path):
+                    return None
+                header, types, columns = pickle.load(file)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, AttributeError, ImportError):
+            # Entrada corrompida ou de uma versão com outras classes
+            self.remove(path)
+            return None
+        return Table(header, types, columns)
+
+    def store(self, file_path, table):
+        """
+        Guarda a tabela importada do ficheiro e aplica o limite de tamanho da cache.
+        """
+        import tempfile     # Importado só aqui, para não atrasar o arranque do interpretador
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                pickle.dump(self.signature(file_path), file, pickle.HIGHEST_PROTOCOL)
+                pickle.dump((table.header, table.types, table.columns), file, pickle.HIGHEST_PROTOCOL)
+            if os.path.getsize(temp) > self.max_bytes:
+                os.remove(temp)
+                return
+            os.replace(temp, self.entry_path(file_path))
+        except OSError:
+            self.remove(temp)
+            return
+        self.evict()
+
+    def entries(self):
+        """
+        Lista as entradas como (última utilização, tamanho, caminho), da mais antiga para a mais recente.
+        """
+        found = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return found
+        for name in names:
+            if name.endswith(self.SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                found.append((stat.st_mtime_ns, stat.st_size, path))
+        return sorted(found)
+
+    def evict(self):
+        """
+        Apaga as entradas menos usadas até o total caber em max_bytes.
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self.remove(path)
+            total -= size
+
+    def clear(self):
+        """
+        Apaga todas as entradas da cache.
+        """
+        for _, _, path in self.entries():
+            self.remove(path)
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def parts(column):
+    """
+    Itera os objetos que ocupam a memória de uma coluna: a própria coluna e, nas colunas
+    compostas, os dicionários, códigos, instantes (e a sua forma de escrita), reais e
+    vetores de seleção.
+    """
+    yield column
+    if isinstance(column, EncodedColumn):
+        yield from parts(column.values)
+        yield from parts(column.codes)
+    elif isinstance(column, TimestampColumn):
+        yield column.epochs
+        if not isinstance(column.layouts, int):
+            yield column.layouts
+    elif isinstance(column, NumberColumn):
+        yield column.values
+    elif isinstance(column, ViewColumn):
+        yield from parts(column.column)
+        yield from parts(column.ids)
+
+
+def result_bytes(result, shared):
+    """
+    Estimativa da memória ocupada só por um resultado guardado na ResultCache: as posições
+    das linhas (vista) e as colunas que não partilha com shared, a tabela consultada.
+
+    A estimativa é profunda: conta os dicionários e códigos das colunas codificadas, os
+    instantes das colunas 'timestamp' e os valores (p.ex. strings) das listas. Não conta
+    as partes nem os valores partilhados com shared (p.ex. as chaves de um GROUP BY,
+    que são os textos da coluna agrupada), e cada valor só conta uma vez.
+    """
+    size = 0
+    if isinstance(shared, TableView):
+        shared = shared.source
+    if isinstance(result, TableView):
+        size, result = sys.getsizeof(result.ids), result.source
+    shared_parts = [part for column in getattr(shared, 'columns', ()) for part in parts(column)]
+    owned = set(map(id, shared_parts))
+    values = None
+    for column in result.columns:
+        for part in parts(column):
+            if id(part) in owned:
+                continue
+            owned.add(id(part))
+            size += sys.getsizeof(part)
+            if isinstance(part, list):
+                if values is None:
+                    values = {id(value) for shared_part in shared_parts if isinstance(shared_part, list)
+                              for value in shared_part}
+                new = {id(value): value for value in part if id(value) not in values}
+                values.update(new)
+                size += sum(map(sys.getsizeof, new.values()))
+    return size
+
+
+class ResultCache:
+    """
+    Cache em memória dos resultados das consultas (SELECT), para não voltar a percorrer
+    uma tabela que não mudou.
+
+    A chave é (tabela, versão da tabela, consulta normalizada): a versão muda sempre que
+    a tabela é importada, criada, substituída, renomeada ou removida (ver
+    Interpreter.touch), por isso um resultado nunca é usado depois de a tabela mudar. Os
+    resultados são guardados como vistas (só as posições das linhas) e o espaço total,
+    estimado com result_bytes, é limitado a max_bytes: quando é ultrapassado são removidos
+    os resultados usados há mais tempo (LRU).
+    """
+
+    def __init__(self, max_bytes=RESULT_CACHE_BYTES):
+        """
+        Atributos:
+            max_bytes (int): Tamanho máximo (estimado) do total dos resultados guardados.
+            entries (OrderedDict): Chave -> (resultado, tamanho), do menos para o mais recente.
+            size (int): Tamanho total dos resultados guardados.
+            hits, misses, evictions (int): Consultas encontradas, não encontradas e resultados removidos por falta de espaço.
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = self.misses = self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Devolve o resultado guardado para a chave (None se não existir) e conta-o nas estatísticas.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def peek(self, key):
+        """
+        Devolve o resultado guardado para a chave sem alterar a ordem LRU nem as estatísticas.
+        """
+        entry = self.entries.get(key)
+        return None if entry is None else entry[0]
+
+    def put(self, key, result, size):
+        """
+        Guarda um resultado e remove os menos usados até o total caber em max_bytes.
+        """
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self.entries[key] = (result, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, old) = self.entries.popitem(last=False)
+                self.size -= old
+                self.evictions += 1
+
+    def invalidate(self, table_name):
+        """
+        Remove os resultados das consultas à tabela (de qualquer versão), libertando a memória das tabelas de origem.
+        """
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == table_name]:
+                self.size -= self.entries.pop(key)[1]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """
+        Devolve as estatísticas da cache como um dicionário.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.size,
+        }
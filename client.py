@@ -0,0 +1,50 @@
+import codecs
+import socket
+import sys
+
+from server import TRAILER
+
+
+def run(path, script, stream=None):
+    """
+    Envia um script ao servidor (ver server.Server) no socket path e escreve a sua saída
+    em stream (por omissão, o sys.stdout) à medida que é recebida. Devolve None se o
+    script terminou sem erros, ou a mensagem do erro.
+    """
+    stream = stream or sys.stdout
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    status = None
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(script.encode('utf-8'))
+        sock.shutdown(socket.SHUT_WR)
+        for chunk in iter(lambda: sock.recv(65536), b''):
+            text = decoder.decode(chunk)
+            if status is None:
+                text, found, rest = text.partition(TRAILER)
+                stream.write(text)
+                if found:
+                    status = rest
+            else:
+                status += text
+    stream.flush()
+    if status is None:
+        return "Connection closed by the server"
+    status = status.rstrip('\n')
+    return None if status == 'OK' else status[len('ERROR '):]
+
+
+if __name__ == '__main__':
+    # Utilização: python client.py SOCKET [FICHEIRO] (sem ficheiro, o script é lido do stdin)
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python client.py SOCKET [FILE]")
+        sys.exit(2)
+    if len(sys.argv) == 3:
+        with open(sys.argv[2], "r") as file:
+            script = file.read()
+    else:
+        script = sys.stdin.read()
+    error = run(sys.argv[1], script)
+    if error is not None:
+        print(error)
+        sys.exit(1)
@@ -0,0 +1,36 @@
+import importlib
+import os
+
+
+# Módulo da biblioteca padrão usado para cada extensão de ficheiro comprimido
+COMPRESSORS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'lzma'}
+
+
+def compressor(file_path):
+    """
+    Devolve o módulo (gzip, bz2 ou lzma) que lê e escreve o ficheiro, escolhido pela
+    extensão, ou None se o ficheiro não estiver comprimido. Os módulos só são importados
+    quando são precisos.
+    """
+    name = COMPRESSORS.get(os.path.splitext(file_path)[1].lower())
+    return importlib.import_module(name) if name else None
+
+
+def decompressed(raw, file_path):
+    """
+    Envolve um ficheiro binário aberto para leitura no descompressor indicado pela extensão
+    de file_path (ou devolve-o tal como está). Fechar o resultado não fecha raw.
+    """
+    module = compressor(file_path)
+    return module.open(raw, 'rb') if module else raw
+
+
+def open_text(file_path, mode='r', newline=None):
+    """
+    Abre um ficheiro de texto, comprimindo ou descomprimindo-o de forma transparente
+    conforme a extensão.
+    """
+    module = compressor(file_path)
+    if module is None:
+        return open(file_path, mode, newline=newline)
+    return module.open(file_path, mode + 't', newline=newline)
@@ -0,0 +1,102 @@
+from bisect import bisect_left, bisect_right
+from itertools import compress
+
+from table import STR, TIMESTAMP, epochs_of
+from timestamps import Timestamp, parse_timestamp
+
+
+class Index:
+    """
+    Índice secundário sobre uma coluna de uma tabela.
+
+    Agrupa as posições das linhas por valor (índice hash, para '=' e '<>') e mantém os
+    valores distintos ordenados (índice ordenado, pesquisado com bisect, para '<', '<=',
+    '>' e '>='). As posições devolvidas estão sempre por ordem crescente, para que o
+    resultado de um SELECT tenha a mesma ordem de uma leitura completa da tabela.
+    """
+
+    def __init__(self, name, table_name, table, column):
+        """
+        Atributos:
+            name (str): Nome do índice.
+            table_name (str): Nome da tabela indexada (atualizado em RENAME TABLE).
+            source (Table): Tabela indexada; o índice deixa de ser válido se a tabela for substituída.
+            column (str): Nome da coluna indexada.
+            groups (dict): Posições das linhas para cada valor.
+            keys (list): Valores distintos, ordenados.
+        """
+        self.name = name
+        self.table_name = table_name
+        self.source = table
+        self.column = column
+        idx = table.index(column)
+        self.numeric = table.types[idx] != STR
+        self.timestamp = table.types[idx] == TIMESTAMP
+        self.size = len(table)
+        groups = {}
+        # Numa coluna 'timestamp' as chaves são os instantes (inteiros)
+        values = epochs_of(table.columns[idx]) if self.timestamp else None
+        for pos, value in enumerate(table.columns[idx] if values is None else values):
+            group = groups.get(value)
+            if group is None:
+                groups[value] = [pos]
+            else:
+                group.append(pos)
+        self.groups = groups
+        self.keys = sorted(groups)
+
+    def operand(self, val):
+        """
+        Converte o literal de uma condição para o tipo da coluna, ou devolve None se o
+        índice não der o mesmo resultado que a comparação linha a linha (ver predicates).
+        """
+        if self.timestamp:
+            return parse_timestamp(val, dates=True) if isinstance(val, str) else val
+        if isinstance(val, Timestamp):
+            val = str(val)
+        try:
+            number = float(val)
+        except ValueError:
+            number = None
+        if self.numeric:
+            return number
+        if number is not None or parse_timestamp(val, dates=True) is not None:
+            return None         # Comparado como número ou instante célula a célula (ver predicates)
+        return val
+
+    def supports(self, op, val):
+        """
+        Indica se o índice resolve a condição "coluna op val" (ver lookup).
+        """
+        return op in ('=', '<>', '<', '<=', '>', '>=') and self.operand(val) is not None
+
+    def lookup(self, op, val):
+        """
+        Devolve as posições (ordenadas) das linhas que satisfazem "coluna op val", ou None
+        se o índice não se aplicar a esta condição.
+        """
+        key = self.operand(val)
+        if key is None:
+            return None
+        if op == '=':
+            return self.groups.get(key, [])
+        if op == '<>':
+            mask = bytearray(b'\x01') * self.size
+            for pos in self.groups.get(key, ()):
+                mask[pos] = 0
+            return list(compress(range(self.size), mask))
+        if op == '<':
+            keys = self.keys[:bisect_left(self.keys, key)]
+        elif op == '<=':
+            keys = self.keys[:bisect_right(self.keys, key)]
+        elif op == '>':
+            keys = self.keys[bisect_right(self.keys, key):]
+        elif op == '>=':
+            keys = self.keys[bisect_left(self.keys, key):]
+        else:
+            return None
+        ids = []
+        for value in keys:
+            ids.extend(self.groups[value])
+        ids.sort()
+        return ids
@@ -1,5 +1,224 @@
 from parser import Parser
+from join import is_sorted, join_ids
+from predicates import compile_condition, compile_conditions
+from table import FLOAT, INT, STR, TIMESTAMP, Selection, Table, TableBuilder, TableView, TimestampColumn, codes_of, dictionary_of, epochs_of, numbers_of, text_key
+from mapped import MappedTable
+from cache import RESULT_CACHE_BYTES, ResultCache, TableCache, result_bytes
+from index import Index
+from aggregate import group_aggregate, label
+from sort import SORT_BUFFER, sort_ids
+from parallel import PARALLEL_THRESHOLD, ScanPool, condition_columns
+from profiling import Profiler, counted
+from plans import Procedure, QueryPlan, StatementPlan
+from scheduler import Scheduler
+from analysis import ColumnAnalysis
+from writer import CSV, ResultWriter, redirected
+from compression import compressor, decompressed
+from array import array
+from bisect import bisect_right
+from contextlib import contextmanager
+from itertools import compress, count, islice
+import copy
 import csv
+import gc
+import io
+import os
+import sys
+
+# Tipos de instrução SELECT na AST, todos executados por execute_select
+SELECT_KINDS = ('select_table', 'select_columns', 'select_where', 'select_where_and',
+                'select_limit', 'select_limit_columns', 'select_query')
+
+# Versões das tabelas (ver Interpreter.touch): únicas no processo, partilhadas por todos os interpretadores
+VERSIONS = count(1)
+
+# Estimativa do custo em memória de uma linha lida pelo csv.reader (lista + strings)
+ROW_OVERHEAD = 56
+CELL_OVERHEAD = 57
+
+
+@contextmanager
+def paused_gc():
+    """
+    Suspende o garbage collector cíclico durante a criação de muitos objetos que não
+    formam ciclos (p.ex. as linhas lidas pelo csv.reader), evitando recolhas repetidas.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def print_progress(file_path, done, total):
+    """
+    Mostra o progresso de uma importação no stderr (para usar como Interpreter.progress).
+    """
+    percent = 100 * done // total if total else 100
+    end = '\n' if done >= total else ''
+    print(f"\rIMPORT {file_path}: {percent}% ({done}/{total} bytes)", end=end, file=sys.stderr)
+
+
+def import_positions(header, columns=None, where=None, needed=None):
+    """
+    Posições das colunas do ficheiro guardadas numa importação com opções (None: todas).
+
+    columns são as colunas pedidas (COLUMNS), por essa ordem; needed é o conjunto das
+    colunas usadas pelo script (ver analysis.ColumnAnalysis), guardadas pela ordem do
+    ficheiro. As colunas de columns e where têm de existir no ficheiro.
+    """
+    for name in (columns or []) + condition_columns(where or []):
+        if name not in header:
+            raise ValueError(f"Column {name} does not exist")
+    if columns:
+        return [header.index(name) for name in columns]
+    if needed:
+        return [i for i, name in enumerate(header) if name in needed] or None
+    return None
+
+
+class ImportFilter:
+    """
+    WHERE de um IMPORT (ver read_csv): avaliado bloco a bloco sobre as linhas de texto,
+    com o mesmo resultado que sobre a tabela importada por inteiro.
+
+    O tipo final de uma coluna só é conhecido no fim do ficheiro, mas só pode ser o do
+    primeiro bloco ou 'str' (ver TableBuilder); uma coluna 'int' também pode passar a
+    'float', com os mesmos resultados. Enquanto os blocos de uma coluna tiverem o tipo do
+    primeiro, cada condição sobre ela é avaliada nas duas hipóteses: as linhas que falham
+    uma condição em ambas são descartadas e as que passam todas em ambas são guardadas.
+    As restantes (raras: p.ex. um literal de texto comparado com uma coluna de datas) são
+    guardadas provisoriamente e decididas em finish, já com os tipos finais.
+    """
+
+    def __init__(self, header, where):
+        """
+        Atributos:
+            where (list): Condições do WHERE.
+            names (list): Colunas usadas nas condições, e positions as suas posições no ficheiro.
+            columns (list): Posição em names da coluna de cada condição.
+            types (list): Tipo de cada coluna de names em todos os blocos lidos ('str' se
+                variou); None antes do primeiro bloco.
+            kept (int): Linhas guardadas até agora.
+            pending (dict): Resultados de cada condição, nas duas hipóteses, das linhas
+                guardadas provisoriamente, pela sua posição na tabela.
+        """
+        self.where = where
+        self.names = condition_columns(where)
+        self.positions = [header.index(name) for name in self.names]
+        self.columns = [self.names.index(cond[1] if cond[0] == 'AND' else cond[0]) for cond in where]
+        self.types = None
+        self.kept = 0
+        self.pending = {}
+
+    def filter(self, rows):
+        """
+        Devolve as linhas de um bloco que são (ou podem ser) guardadas.
+        """
+        builder = TableBuilder(self.names)
+        builder.append(rows, self.positions)
+        typed = builder.build()
+        if self.types is None:
+            self.types = list(typed.types)
+        else:
+            self.types = [kind if kind == chunk_kind else FLOAT if {kind, chunk_kind} <= {INT, FLOAT} else STR
+                          for kind, chunk_kind in zip(self.types, typed.types)]
+        texts = Table(self.names, [STR] * len(self.names),
+                      [[row[p] if p < len(row) else '' for row in rows] for p in self.positions])
+        results = []
+        for cond, j in zip(self.where, self.columns):
+            text = condition_results(texts, cond)
+            if self.types[j] == STR:
+                results.append((text, text))
+            else:
+                results.append((condition_results(typed, cond), text))
+        if all(first == text for first, text in results):
+            # As duas hipóteses dão o mesmo resultado: nenhuma linha fica por decidir
+            selected = list(compress(rows, map(all, zip(*(text for _, text in results)))))
+            self.kept += len(selected)
+            return selected
+        selected = []
+        for row, outcomes in zip(rows, zip(*(zip(first, text) for first, text in results))):
+            if all(first and text for first, text in outcomes):
+                selected.append(row)
+            elif all(first or text for first, text in outcomes):
+                self.pending[self.kept + len(selected)] = outcomes
+                selected.append(row)
+        self.kept += len(selected)
+        return selected
+
+    def finish(self, table):
+        """
+        Decide as linhas guardadas provisoriamente, com os tipos finais das colunas.
+        """
+        if not self.pending:
+            return table
+        final = [self.types[j] != STR for j in self.columns]
+        rejected = {k for k, outcomes in self.pending.items()
+                    if not all(first if typed else text for (first, text), typed in zip(outcomes, final))}
+        return table.take(array('l', (k for k in range(len(table)) if k not in rejected)))
+
+
+def condition_results(table, cond):
+    """
+    Devolve o resultado (bool) de uma condição para cada linha da tabela.
+    """
+    idx, mask = compile_condition(table, cond)
+    column = table.columns[idx]
+    return list(mask(epochs_of(column) if isinstance(column, TimestampColumn) else column))
+
+
+def restrict_table(table, columns=None, where=None, needed=None):
+    """
+    Aplica as opções de uma importação (ver read_csv) a uma tabela já lida por inteiro.
+    """
+    positions = import_positions(table.header, columns, where, needed)
+    if not where:
+        return table if positions is None else table.project(positions)
+    ids = array('l', compile_conditions(table, where)(range(len(table))))
+    return table.take(ids, positions)
+
+
+def read_csv(file_path, memory_budget, progress=None, columns=None, where=None, needed=None):
+    """
+    Lê um ficheiro CSV e devolve o seu conteúdo como uma Table, com o tipo de cada coluna inferido.
+
+    O ficheiro é lido em blocos cujo tamanho estimado em memória não passa de
+    memory_budget; cada bloco é convertido para colunas antes de ler o seguinte.
+    Ficheiros .gz, .bz2 e .xz são descomprimidos à medida que são lidos (o progresso
+    conta os bytes comprimidos).
+
+    Com columns ou needed (ver import_positions), as outras colunas não são convertidas
+    nem guardadas; com where, as linhas de cada bloco que não satisfazem as condições são
+    descartadas antes de o bloco ser convertido (ver ImportFilter). O tipo de cada coluna
+    é inferido só das linhas guardadas, como se o ficheiro tivesse apenas essas linhas.
+    """
+    total = os.path.getsize(file_path)
+    with paused_gc(), open(file_path, 'rb') as raw, io.TextIOWrapper(decompressed(raw, file_path)) as file:
+        rows = filter(None, csv.reader(file))
+        header = next((row for row in rows if not row[0].startswith('#')), [])
+        positions = import_positions(header, columns, where, needed)
+        selection = ImportFilter(header, where) if where else None
+        builder = TableBuilder(header if positions is None else [header[i] for i in positions])
+        chunk_rows = 1
+        while True:
+            chunk = list(islice(rows, chunk_rows))
+            if not chunk:
+                break
+            # O tamanho do próximo bloco é estimado a partir da primeira linha deste
+            row_size = ROW_OVERHEAD + sum(CELL_OVERHEAD + len(cell) for cell in chunk[0])
+            chunk_rows = max(1, memory_budget // row_size)
+            chunk = [row for row in chunk if not row[0].startswith('#')]
+            if selection is not None and chunk:
+                chunk = selection.filter(chunk)
+            builder.append(chunk, positions)
+            if progress:
+                progress(file_path, raw.tell(), total)
+        table = builder.build()
+        return table if selection is None else selection.finish(table)
+
 
 class Interpreter:
     """
@@ -9,93 +228,281 @@ class Interpreter:
     Suporta operações básicas semelhantes a SQL, como SELECT, WHERE, LIMIT, JOIN e procedimentos.
     """
 
-    def __init__(self):
+    def __init__(self, memory_budget=64 * 1024 * 1024, progress=None, cache=True,
+                 workers=None, parallel_threshold=PARALLEL_THRESHOLD, sort_buffer=SORT_BUFFER,
+                 quiet=False, profile=False, writer=None, concurrency=1, result_cache=RESULT_CACHE_BYTES,
+                 prune_imports=False):
         """
         Atributos:
-            parser (Parser): Instância da classe Parser para analisar comandos de entrada.
-            dictionary (dict): Armazena tabelas por nome, cada uma como um dicionário com as chaves 'header' e 'data'.
+            parser (Parser): Instância (partilhada pelo processo) da classe Parser para analisar comandos de entrada.
+            dictionary (dict): Armazena tabelas por nome, cada uma como uma Table (colunas tipadas).
             procedures (dict): Armazena procedimentos definidos pelo utilizador por nome.
+            indexes (dict): Armazena os índices (CREATE INDEX) por nome.
+            memory_budget (int): Memória máxima (bytes, estimada) do bloco de linhas lido de cada vez na importação.
+            progress (callable): Função chamada como progress(file_path, bytes_lidos, bytes_totais) durante a importação.
+            cache (TableCache): Cache persistente das tabelas importadas (None se desativada).
+            scan_pool (ScanPool): Avaliação paralela do WHERE em tabelas com pelo menos parallel_threshold
+                linhas, com workers processos (por omissão, o número de CPUs; 1 desativa).
+            sort_buffer (int): Número máximo de linhas ordenadas em memória no ORDER BY (acima disso, ordenação externa).
+            quiet (bool): Não imprime cada instrução antes de a executar.
+            profiler (Profiler): Medições de cada instrução executada (profile=True), em profiler.records.
+            writer (ResultWriter): Escreve os resultados de SELECT e PRINT (por omissão, no stdout, como listas).
+            concurrency (int): Instruções independentes de um script executadas em simultâneo por
+                start (ver Scheduler); 1 executa-as uma a uma.
+            offload_reads (bool): Lê os ficheiros importados num processo do pool (ver read_file).
+            versions (dict): Versão atual de cada tabela, alterada sempre que a tabela muda.
+            results (ResultCache): Cache dos resultados das consultas, com result_cache bytes (None se 0).
+            shared_tables (bool): As tabelas podem estar em uso noutros interpretadores (ver snapshot);
+                DISCARD não fecha então os ficheiros mapeados.
+            prune_imports (bool): Cada IMPORT de um script executado por start só lê as colunas
+                que o script usa (ver compile_script); só para scripts executados de uma vez.
         """
-        self.parser = Parser()
+        self.parser = Parser.shared()
         self.dictionary = {}
         self.procedures = {}
+        self.indexes = {}
+        self.memory_budget = memory_budget
+        self.progress = progress
+        self.cache = TableCache() if cache is True else (cache or None)
+        self.scan_pool = ScanPool(workers, parallel_threshold)
+        self.sort_buffer = sort_buffer
+        self.quiet = quiet
+        self.profiler = Profiler() if profile else None
+        self.writer = writer or ResultWriter()
+        self.concurrency = concurrency
+        self.offload_reads = False
+        self.shared_tables = False
+        self.versions = {}
+        self.results = ResultCache(result_cache) if result_cache else None
+        self.prune_imports = prune_imports
 
     def start(self, input_string):
         """
-        Analisa e executa uma sequência de comandos a partir da string de entrada.
+        Analisa e executa uma sequência de comandos a partir da string de entrada. Com
+        concurrency > 1, as instruções independentes são executadas em paralelo.
+        """
+        parser = self.parse(input_string)
+        if self.concurrency > 1 and len(parser) > 1:
+            Scheduler(self, self.concurrency).run(parser)
+            return
+        for plan in self.compile_script(parser):
+            self.run(plan)
+
+    def parse(self, input_string):
+        """
+        Analisa uma sequência de comandos e devolve a lista das suas instruções (AST).
         """
-        parser = self.parser.parse_input(input_string)
-        if parser is None:
+        statements = self.parser.parse_input(input_string)
+        if statements is None:
             raise ValueError("Parser error")
-        for statement in parser:
-            print(statement)
-            stmt = statement[0]
-            if stmt == 'import':
-                self.import_table(statement[1], statement[2])
-            elif stmt == 'export':
-                self.write_file(statement[1], statement[2])
-            elif stmt == 'discard':
-                self.discard_table(statement[1])
-            elif stmt == 'rename':
-                self.rename_table(statement[1], statement[2])
-            elif stmt == 'print':
-                self.print_table(statement[1])
-            elif stmt in ('select_table', 'select_columns', 'select_where', 'select_where_and', 'select_limit', 'select_limit_columns'):
-                result = self.execute_select(statement)
-                self.print_result(result)
-            elif stmt == 'create_from_query':
-                table_name, query = statement[1], statement[2]
-                result = self.execute_select(query)
-                self.dictionary[table_name] = result
-            elif stmt == 'create_join':
-                self.create_join_table(*statement[1:])
-            elif stmt == 'create_select_columns':
-                self.create_select_columns(*statement[1:])
-            elif stmt == 'procedure':
-                self.procedures[statement[1]] = statement[2]
-            elif stmt == 'call':
-                self.call_procedure(statement[1])
+        return statements
+
+    def start_stream(self, source):
+        """
+        Modo streaming: analisa e executa uma instrução de cada vez, à medida que o texto
+        é lido. source pode ser uma string ou um ficheiro aberto (lido linha a linha), por
+        isso a execução começa logo e a memória não cresce com o tamanho do script.
+        As instruções anteriores a um erro de sintaxe já terão sido executadas.
+        """
+        for statement in self.parser.parse_statements(source):
+            self.execute(statement)
+
+    def execute(self, statement):
+        """
+        Compila e executa uma instrução já analisada.
+        """
+        self.run(self.compile(statement))
+
+    def run(self, plan):
+        """
+        Executa uma instrução compilada (medindo-a, se o profiler estiver ativo). É o único
+        caminho de execução, tanto para as instruções de topo como para as de um procedimento.
+        """
+        if not self.quiet:
+            print(plan.statement)
+        if self.profiler is None:
+            plan.execute(self)
+            return
+        if plan.text is None:
+            plan.text = self.statement_to_string(plan.statement)
+        with self.profiler.measure(plan.text, plan.kind):
+            plan.execute(self)
+
+    def compile(self, statement):
+        """
+        Compila uma instrução num StatementPlan: o comando é escolhido e os argumentos
+        extraídos uma só vez, e cada SELECT passa a um QueryPlan, resolvido para o esquema
+        da tabela na primeira execução. O plano não depende deste interpretador: pode ser
+        executado por qualquer outro (p.ex. as sessões do servidor, ver snapshot).
+        """
+        stmt = statement[0]
+        if stmt == 'import':
+            method, args = Interpreter.import_table, statement[1:]
+        elif stmt == 'export':
+            method, args = Interpreter.write_file, (statement[1], statement[2])
+        elif stmt == 'export_query':
+            method, args = Interpreter.export_query, (self.compile_query(statement[1]), statement[2])
+        elif stmt == 'discard':
+            method, args = Interpreter.discard_table, (statement[1],)
+        elif stmt == 'rename':
+            method, args = Interpreter.rename_table, (statement[1], statement[2])
+        elif stmt == 'print':
+            method, args = Interpreter.print_table, (statement[1],)
+        elif stmt in SELECT_KINDS:
+            method, args = Interpreter.print_query, (self.compile_query(statement),)
+        elif stmt == 'create_from_query':
+            method, args = Interpreter.create_from_query, (statement[1], self.compile_query(statement[2]))
+        elif stmt == 'create_join':
+            method, args = Interpreter.report_join, statement[1:]
+        elif stmt == 'create_select_columns':
+            method, args = Interpreter.create_select_columns, statement[1:]
+        elif stmt == 'materialize':
+            method, args = Interpreter.materialize_table, (statement[1],)
+        elif stmt == 'procedure':
+            method, args = Interpreter.define_procedure, (statement[1], statement[2])
+        elif stmt == 'call':
+            method, args = Interpreter.call_procedure, (statement[1],)
+        elif stmt == 'create_index':
+            method, args = Interpreter.create_index, statement[1:]
+        elif stmt == 'drop_index':
+            method, args = Interpreter.drop_index, (statement[1],)
+        elif stmt == 'explain':
+            method, args = Interpreter.explain, (statement[1], statement[2])
+        else:
+            raise ValueError(f"Unknown statement type: {stmt}")
+        return StatementPlan(statement, method, args)
+
+    def compile_script(self, statements):
+        """
+        Compila as instruções de um script. Com prune_imports, cada IMPORT sem opções
+        só lê as colunas usadas pelas instruções seguintes (ver analysis.ColumnAnalysis);
+        a instrução (AST) não muda, só os argumentos do seu plano.
+        """
+        plans = [self.compile(statement) for statement in statements]
+        if self.prune_imports:
+            for k, columns in ColumnAnalysis(self).needed(statements).items():
+                plans[k].args = statements[k][1:] + ({'needed': columns},)
+        return plans
+
+    def snapshot(self):
+        """
+        Devolve uma cópia do interpretador com o seu próprio catálogo (tabelas,
+        procedimentos e índices), que pode ser alterado sem afetar este. As tabelas, que
+        são imutáveis, e os recursos (parser, cache, pool, writer) são partilhados, por
+        isso a cópia é imediata. Usado pelo servidor (ver server.Server).
+        """
+        session = copy.copy(self)
+        session.dictionary = dict(self.dictionary)
+        session.procedures = dict(self.procedures)
+        session.indexes = dict(self.indexes)
+        session.versions = dict(self.versions)
+        session.profiler = None
+        session.concurrency = 1
+        session.offload_reads = False
+        session.shared_tables = self.shared_tables = True
+        return session
+
+    def compile_query(self, statement):
+        """
+        Compila qualquer forma de SELECT da AST num QueryPlan.
+        """
+        return QueryPlan(*self.query_parts(statement))
+
+    def note(self, scanned=0, produced=0):
+        """
+        Regista linhas lidas e produzidas na instrução em curso (só com o profiler ativo).
+        """
+        if self.profiler is not None:
+            self.profiler.note(scanned, produced)
+
+    def close(self):
+        """
+        Fecha o ficheiro de resultados, termina os processos da avaliação paralela e
+        esvazia a cache de resultados.
+        """
+        self.writer.close()
+        self.scan_pool.close()
+        if self.results is not None:
+            self.results.clear()
 
     # --------- Comandos - Tabela de dados ---------
 
-    def read_file(self, file_path):
+    def read_file(self, file_path, columns=None, where=None, needed=None):
         """
-        Lê um ficheiro CSV e devolve o seu conteúdo como um dicionário com 'header' e 'data'.
+        Lê um ficheiro CSV e devolve o seu conteúdo como uma Table (ver read_csv, também
+        para as opções columns, where e needed).
+
+        Com offload_reads (ativo enquanto o Scheduler executa um script), a leitura é feita
+        num processo do pool, para que várias importações corram em paralelo.
         """
-        data = []
-        header = None
-        with open(file_path, 'r') as file:
-            reader = csv.reader(file)
-            for row in reader:
-                if row[0].startswith('#'):
-                    continue
-                if header is None:
-                    header = row
-                    continue
-                data.append(row)
-            return {"header": header, "data": data}
+        if self.offload_reads and self.progress is None:
+            return self.scan_pool.call(read_csv, file_path, self.memory_budget, None, columns, where, needed)
+        return read_csv(file_path, self.memory_budget, self.progress, columns, where, needed)
 
     def write_file(self, table_name, file_path):
         """
-        Escreve a tabela especificada num ficheiro CSV.
+        Escreve a tabela especificada num ficheiro CSV (comprimido se a extensão for .gz, .bz2 ou .xz).
         """
         if table_name not in self.dictionary:
             raise ValueError("Table does not exist")
         table = self.dictionary[table_name]
-        with open(file_path, 'w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(table["header"])
-            for row in table["data"]:
-                writer.writerow(row)
+        self.write_csv(file_path, table.header, table.rows())
+        self.note(scanned=len(table), produced=len(table))
 
-    def import_table(self, table_name, file_path):
+    def export_query(self, query, file_path):
+        """
+        Escreve o resultado de um SELECT (AST ou QueryPlan) num ficheiro CSV à medida que
+        as linhas são produzidas, sem criar uma tabela intermédia.
+        """
+        result = self.execute_select(query)
+        self.note(produced=self.write_csv(file_path, result.header, result.rows()))
+
+    def write_csv(self, file_path, header, rows):
+        """
+        Escreve o cabeçalho e as linhas num ficheiro CSV; devolve o número de linhas.
+        """
+        writer = ResultWriter(file_path, CSV)
+        try:
+            return writer.write(header, rows)
+        finally:
+            writer.close()
+
+    def import_table(self, table_name, file_path, options=None):
         """
         Importa uma tabela de um ficheiro CSV e armazena-a com o nome dado.
+
+        Se a cache estiver ativa, a tabela é carregada da cache quando o ficheiro não
+        mudou desde a última importação, e guardada nela caso contrário. Uma importação
+        com columns, where ou needed não é guardada na cache (a tabela está incompleta),
+        mas pode partir da tabela completa já guardada.
+
+        Opções:
+            mapped (bool): Mapeia o ficheiro em memória em vez de o ler (ver MappedTable);
+                só o índice de linhas é construído, as células são lidas a pedido.
+            columns (list): Só estas colunas são lidas, por esta ordem (COLUMNS).
+            where (list): Só as linhas que satisfazem as condições são lidas (WHERE).
+            needed (set): Colunas usadas pelo script (ver analysis.ColumnAnalysis): as
+                outras não são lidas.
         """
         if table_name in self.dictionary:
             raise ValueError("Table already exists")
-        data = self.read_file(file_path)
+        options = options or {}
+        pushdown = {key: options[key] for key in ('columns', 'where', 'needed') if options.get(key)}
+        if options.get('mapped'):
+            if compressor(file_path):
+                raise ValueError("Compressed files cannot be mapped")
+            data = MappedTable(file_path)
+        else:
+            data = self.cache.load(file_path) if self.cache else None
+            if data is not None and pushdown:
+                data = restrict_table(data, **pushdown)
+            elif data is None:
+                data = self.read_file(file_path, **pushdown)
+                if self.cache and not pushdown:
+                    self.cache.store(file_path, data)
         self.dictionary[table_name] = data
+        self.touch(table_name)
+        self.note(scanned=len(data), produced=len(data))
 
     def rename_table(self, old_name, new_name):
         """
@@ -103,7 +510,13 @@ class Interpreter:
         """
         if old_name not in self.dictionary:
             raise ValueError("Table does not exist")
-        self.dictionary[new_name] = self.dictionary.pop(old_name)
+        self.store_table(new_name, self.dictionary.pop(old_name))
+        self.touch(old_name)
+        for name, index in list(self.indexes.items()):
+            if index.table_name == old_name:
+                # Cópia: o índice original pode pertencer também a outro catálogo (ver snapshot)
+                index = self.indexes[name] = copy.copy(index)
+                index.table_name = new_name
 
     def discard_table(self, table_name):
         """
@@ -111,7 +524,54 @@ class Interpreter:
         """
         if table_name not in self.dictionary:
             raise ValueError("Table does not exist")
-        del self.dictionary[table_name]
+        table = self.dictionary.pop(table_name)
+        self.touch(table_name)
+        self.release(table)
+        if isinstance(table, MappedTable) and not self.shared_tables:
+            table.close()
+        for name in [name for name, index in self.indexes.items() if index.table_name == table_name]:
+            del self.indexes[name]
+
+    def store_table(self, table_name, table):
+        """
+        Guarda uma tabela com o nome dado. Se substituir outra, as vistas sobre a tabela
+        substituída são materializadas.
+        """
+        previous = self.dictionary.get(table_name)
+        self.dictionary[table_name] = table
+        self.touch(table_name)
+        if previous is not None and previous is not table:
+            self.release(previous)
+
+    def touch(self, table_name):
+        """
+        Dá uma nova versão à tabela, que mudou (ou deixou de existir): os resultados
+        guardados das consultas à tabela deixam de ser usados.
+        """
+        self.versions[table_name] = next(VERSIONS)
+        if self.results is not None:
+            self.results.invalidate(table_name)
+
+    def release(self, table):
+        """
+        Materializa as vistas (TableView) cuja origem é a tabela dada, que deixou de estar
+        no dicionário, para que a sua memória possa ser libertada.
+        """
+        for name, data in list(self.dictionary.items()):
+            if isinstance(data, TableView) and data.source is table:
+                self.dictionary[name] = data.materialize()
+                self.touch(name)        # Liberta também os resultados guardados, que referem a tabela de origem
+
+    def materialize_table(self, table_name):
+        """
+        Copia os valores de uma vista para uma tabela independente (sem efeito noutras tabelas).
+        """
+        if table_name not in self.dictionary:
+            raise ValueError("Table does not exist")
+        table = self.dictionary[table_name]
+        if isinstance(table, TableView):
+            self.dictionary[table_name] = table.materialize()
+            self.note(scanned=len(table), produced=len(table))
 
     def print_table(self, table_name):
         """
@@ -119,10 +579,8 @@ class Interpreter:
         """
         if table_name not in self.dictionary:
             raise ValueError("Table does not exist")
-        table = self.dictionary[table_name]
-        print(table["header"])
-        for row in table["data"]:
-            print(row)
+        self.note(scanned=len(self.dictionary[table_name]))
+        self.note(produced=self.print_result(self.dictionary[table_name]))
 
     # --------- Comandos - Queries ---------
 
@@ -130,135 +588,292 @@ class Interpreter:
         """
         Seleciona colunas e linhas de uma tabela, podendo filtrar por condições e limitar o número de linhas.
         """
-        if table_name not in self.dictionary:
+        return self.stream_table(table_name, columns, conditions, limit).materialize()
+
+    def stream_table(self, table_name, columns, conditions=None, limit=None):
+        """
+        Versão preguiçosa de select_table: devolve uma Selection que percorre a tabela,
+        filtra, limita e projeta linha a linha, parando assim que o limite é atingido.
+        """
+        return self.scan_query(QueryPlan(table_name, columns, {'where': conditions}), limit)
+
+    def scan_query(self, plan, limit=None, project=True):
+        """
+        Leitura, WHERE, LIMIT e projeção de uma consulta compilada (sem project, todas as
+        colunas); devolve uma Selection preguiçosa.
+        """
+        if plan.table_name not in self.dictionary:
             raise ValueError("Table does not exist")
-        table = self.dictionary[table_name]
-        header = table["header"]
-        data = table["data"]
+        table = self.dictionary[plan.table_name]
+        binding = plan.bind(table)
+        positions = binding.positions if project else list(range(len(table.header)))
+        if not plan.where and not limit:
+            self.note(scanned=len(table))
+            return Selection(table, positions)
 
-        if columns == "*":
-            selected_columns = header
-        elif isinstance(columns, list):
-            selected_columns = columns
-        else:
-            selected_columns = [col.strip() for col in columns.split(",")]
+        ids = range(len(table))
+        if plan.where:
+            ids, skip = self.use_index(plan.table_name, table, plan.where)
+            conditions, prepared = binding.conditions(table, skip)
+            candidates = ids
+            # Com LIMIT a leitura sequencial pára mais cedo; sem ele, tabelas grandes são divididas
+            if conditions and not limit and self.scan_pool.applies(table, ids):
+                ids = self.scan_pool.filter(table, conditions)
+            elif conditions:
+                ids = compile_conditions(table, conditions, prepared)(ids)
+            if limit:
+                ids = islice(ids, int(limit))
+                if self.profiler:
+                    # Linhas lidas: até à última selecionada, se o limite foi atingido
+                    ids = counted(ids, lambda count, last: self.note(
+                        scanned=bisect_right(candidates, last) if count == int(limit) else len(candidates)))
+            else:
+                self.note(scanned=len(candidates))
+        elif limit:
+            ids = range(min(int(limit), len(table)))
+            self.note(scanned=len(ids))
+        return Selection(table, positions, ids)
 
-        if conditions:
-            data = [row for row in data if self.evaluate_conditions(row, header, conditions)]
+    def query_table(self, table_name, columns, clauses):
+        """
+        Forma geral do SELECT (WHERE, GROUP BY, ORDER BY e LIMIT combinados, funções de agregação).
+        """
+        return self.run_query(QueryPlan(table_name, columns, clauses))
 
-        if limit:
-            data = data[:int(limit)]
+    def run_query(self, plan):
+        """
+        Executa uma consulta compilada e devolve o resultado como uma Selection preguiçosa.
+        Com agregações, as linhas filtradas passam diretamente para a agregação por hash,
+        sem serem materializadas; ORDER BY e LIMIT aplicam-se então aos grupos. ORDER BY
+        com LIMIT mantém só as primeiras linhas num heap em vez de ordenar tudo.
+        """
+        if plan.group_by or plan.aggregates:
+            if plan.columns == '*':
+                raise ValueError("SELECT * cannot be used with GROUP BY")
+            selection = self.scan_query(plan, project=False)
+            table = group_aggregate(selection.table, selection.ids, plan.columns, plan.group_by)
+            positions, ids = list(range(len(table.header))), None
+        elif plan.order_by:
+            selection = self.scan_query(plan)
+            table, positions, ids = selection.table, selection.positions, selection.ids
+        else:
+            return self.scan_query(plan, plan.limit)
 
-        selected_data = []
-        for row in data:
-            selected_row = [row[header.index(col)] for col in selected_columns]
-            selected_data.append(selected_row)
+        if plan.order_by:
+            keys = [(label(col), direction == 'DESC') for col, direction in plan.order_by]
+            ids = sort_ids(table, ids, keys, plan.limit, self.sort_buffer)
+        elif plan.limit:
+            ids = range(min(int(plan.limit), len(table)))
+        return Selection(table, positions, ids)
 
-        return {"header": selected_columns, "data": selected_data}
+    def use_index(self, table_name, table, conditions):
+        """
+        Procura um índice da tabela que resolva uma das condições (de preferência uma
+        igualdade). Devolve (posições candidatas, posição da condição resolvida pelo
+        índice, ou None).
+        """
+        choice = self.choose_index(table_name, table, conditions)
+        if choice is None:
+            return range(len(table)), None
+        index, i = choice
+        col, op, val = conditions[i][1:] if conditions[i][0] == 'AND' else conditions[i]
+        return index.lookup(op, val), i
 
-    def evaluate_conditions(self, row, header, conditions):
+    def choose_index(self, table_name, table, conditions):
         """
-        Avalia uma lista de condições numa linha da tabela.
+        Escolhe o índice a usar numa consulta: devolve (índice, posição da condição que
+        resolve) ou None. Um índice de uma tabela que entretanto foi substituída (CREATE
+        TABLE com o mesmo nome) é reconstruído sobre a nova tabela.
         """
-        for cond in conditions:
-            if cond[0] == 'AND':
-                _, col, op, val = cond
-            else:
-                col, op, val = cond
+        indexes = {}
+        for name, index in list(self.indexes.items()):
+            if index.table_name != table_name:
+                continue
+            if index.source is not table:
+                if index.column not in table.header:
+                    continue
+                index = self.indexes[name] = Index(name, table_name, table, index.column)
+            indexes.setdefault(index.column, index)
+        if indexes:
+            ordered = sorted(range(len(conditions)), key=lambda i: conditions[i][-2] != '=')
+            for i in ordered:
+                cond = conditions[i]
+                col, op, val = cond[1:] if cond[0] == 'AND' else cond
+                if col in indexes and indexes[col].supports(op, val):
+                    return indexes[col], i
+        return None
 
-            idx = header.index(col)
-            cell = row[idx]
-            if not self.apply_operator(cell, op, val):
-                return False
-        return True
+    def execute_select(self, statement):
+        """
+        Executa uma instrução SELECT analisada (ou já compilada num QueryPlan) e devolve o
+        resultado, como uma Selection preguiçosa.
+        """
+        plan = statement if isinstance(statement, QueryPlan) else self.compile_query(statement)
+        if self.results is None or not (plan.where or plan.group_by or plan.order_by or plan.aggregates):
+            return self.run_query(plan)
+        key = self.result_key(plan)
+        cached = self.results.get(key)
+        if cached is None:
+            selection = self.run_query(plan)
+            if not isinstance(selection.table, (Table, TableView)):
+                return selection        # Não é guardado: seria uma cópia da tabela mapeada
+            cached = selection.view()
+            self.results.put(key, cached, result_bytes(cached, self.dictionary[plan.table_name]))
+        return Selection(cached, list(range(len(cached.header))))
 
-    def apply_operator(self, cell, op, val):
+    def result_key(self, plan):
         """
-        Aplica um operador de comparação entre o valor de uma célula e um valor dado.
+        Chave de uma consulta na cache de resultados: tabela, versão e consulta normalizada.
         """
-        try:
-            cell = float(cell)
-            val = float(val)
-        except ValueError:
-            pass
-
-        if op == '=': return cell == val
-        elif op == '<>': return cell != val
-        elif op == '<': return cell < val
-        elif op == '>': return cell > val
-        elif op == '<=': return cell <= val
-        elif op == '>=': return cell >= val
-        return False
+        return plan.table_name, self.versions.get(plan.table_name), plan.key
 
-    def execute_select(self, statement):
+    def print_query(self, query):
         """
-        Executa uma instrução SELECT analisada e devolve o resultado.
+        Executa um SELECT e escreve o resultado.
+        """
+        self.note(produced=self.print_result(self.execute_select(query)))
+
+    def query_parts(self, statement):
+        """
+        Decompõe qualquer forma de SELECT da AST em (tabela, colunas, cláusulas).
         """
         kind = statement[0]
 
-        if kind == 'select_table':
+        if kind in ('select_table', 'select_columns'):
             _, cols, table = statement
-            return self.select_table(table, cols)
-        
-        elif kind == 'select_columns':
-            _, cols, table = statement
-            return self.select_table(table, cols)
+            return table, cols, {}
 
-        elif kind == 'select_where':
+        elif kind in ('select_where', 'select_where_and'):
             _, table, cond = statement
-            return self.select_table(table, '*', cond)
+            return table, '*', {'where': cond}
 
-        elif kind == 'select_where_and':
-            _, table, cond = statement
-            return self.select_table(table, '*', cond)
-        
         elif kind == 'select_limit':
             _, table, limit = statement
-            return self.select_table(table, '*', None, limit)
-        
+            return table, '*', {'limit': limit}
+
         elif kind == 'select_limit_columns':
             _, cols, table, limit = statement
-            return self.select_table(table, cols, None, limit)
-        
+            return table, cols, {'limit': limit}
+
+        elif kind == 'select_query':
+            _, table, cols, clauses = statement
+            return table, cols, clauses
+
         else:
             raise ValueError(f"Unknown select kind: {kind}")
-        
+
     def print_result(self, result):
         """
-        Imprime o cabeçalho e as linhas de um resultado de consulta.
+        Escreve o cabeçalho e as linhas de um resultado de consulta; devolve o número de linhas.
         """
-        print(result["header"])
-        for row in result["data"]:
-            print(row)
+        return self.writer.write(result.header, result.rows())
 
     # --------- Comandos - Criação ---------
 
+    def create_from_query(self, table_name, query):
+        """
+        Cria uma tabela com o resultado de um SELECT (AST ou QueryPlan), como vista sempre que possível.
+        """
+        self.store_table(table_name, self.execute_select(query).view())
+        self.note(produced=len(self.dictionary[table_name]))
+
+    def report_join(self, new_table, table1, table2, join_key):
+        """
+        CREATE TABLE ... JOIN: cria a tabela e escreve a estratégia de junção usada (só
+        sem quiet, como o texto de cada instrução).
+        """
+        strategy = self.create_join_table(new_table, table1, table2, join_key)
+        if not self.quiet:
+            self.writer.message(f"Join strategy: {strategy}")
+
     def create_join_table(self, new_table, table1, table2, join_key):
         """
         Cria uma nova tabela juntando duas tabelas por uma chave especificada.
+        Devolve a estratégia de junção usada ('hash' ou 'merge').
         """
         if table1 not in self.dictionary or table2 not in self.dictionary:
             raise ValueError("One or both tables do not exist")
         t1 = self.dictionary[table1]
         t2 = self.dictionary[table2]
-        idx1 = t1["header"].index(join_key)
-        idx2 = t2["header"].index(join_key)
-
-        header = t1["header"] + [col for col in t2["header"] if col != join_key]
-        data = []
-        for row1 in t1["data"]:
-            for row2 in t2["data"]:
-                if row1[idx1] == row2[idx2]:
-                    joined_row = row1 + [row2[i] for i in range(len(row2)) if i != idx2]
-                    data.append(joined_row)
-        self.dictionary[new_table] = {"header": header, "data": data}
+        keys1, keys2 = self.join_keys(t1, t2, join_key)
+        ids1, ids2, strategy = join_ids(keys1, keys2)
+
+        idx2 = t2.index(join_key)
+        left = t1.take(ids1)
+        right = t2.take(ids2, [i for i in range(len(t2.header)) if i != idx2])
+        self.store_table(new_table, Table(left.header + right.header,
+                                          left.types + right.types,
+                                          left.columns + right.columns))
+        self.note(scanned=len(t1) + len(t2), produced=len(ids1))
+        return strategy
+
+    def join_keys(self, t1, t2, join_key):
+        """
+        Devolve as colunas de chaves das duas tabelas, prontas a comparar.
+        """
+        idx1 = t1.index(join_key)
+        idx2 = t2.index(join_key)
+        keys1, keys2 = t1.columns[idx1], t2.columns[idx2]
+        if {t1.types[idx1], t2.types[idx2]} == {STR, TIMESTAMP}:
+            # Datas e horas contra texto (p.ex. uma MappedTable): as células de texto que são
+            # instantes comparam-se pelo instante, como no WHERE (ver text_key)
+            def instants(keys, kind):
+                if kind == STR:
+                    return list(map(text_key, keys))
+                return [(1, seconds) for seconds in epochs_of(keys)]
+
+            return instants(keys1, t1.types[idx1]), instants(keys2, t2.types[idx2])
+        if t1.types[idx1] != t2.types[idx2]:
+            # Tipos diferentes: compara pelo texto, como no ficheiro original
+            return list(map(str, keys1)), list(map(str, keys2))
+        codes1, codes2 = codes_of(keys1), codes_of(keys2)
+        if codes1 is not None and codes2 is not None:
+            # Colunas codificadas por dicionário: compara os códigos, renumerados pela ordem
+            # dos textos dos dois dicionários juntos (a igualdade e a ordem são as dos textos)
+            values1, values2 = dictionary_of(keys1), dictionary_of(keys2)
+            if values1 is not values2:
+                rank = {text: code for code, text in enumerate(sorted(set(values1).union(values2)))}
+                codes1 = map(array('l', map(rank.__getitem__, values1)).__getitem__, codes1)
+                codes2 = map(array('l', map(rank.__getitem__, values2)).__getitem__, codes2)
+            return array('l', codes1), array('l', codes2)
+        epochs1, epochs2 = epochs_of(keys1), epochs_of(keys2)
+        if epochs1 is not None and epochs2 is not None:
+            # Colunas 'timestamp': compara os instantes (inteiros)
+            return (epochs1 if isinstance(epochs1, array) else array('q', epochs1),
+                    epochs2 if isinstance(epochs2, array) else array('q', epochs2))
+        # Colunas 'float' com inteiros (NumberColumn): compara os reais
+        keys1 = keys1 if numbers_of(keys1) is None else numbers_of(keys1)
+        keys2 = keys2 if numbers_of(keys2) is None else numbers_of(keys2)
+        # Colunas lidas a pedido (MappedTable) são descodificadas uma só vez
+        keys1 = keys1 if isinstance(keys1, (array, list)) else list(keys1)
+        keys2 = keys2 if isinstance(keys2, (array, list)) else list(keys2)
+        return keys1, keys2
 
     def create_select_columns(self, new_table, columns, source_table):
         """
-        Cria uma nova tabela selecionando colunas específicas de uma tabela existente.
+        Cria uma nova tabela selecionando colunas específicas de uma tabela existente (sem copiar valores).
         """
-        result = self.select_table(source_table, columns)
-        self.dictionary[new_table] = result
+        self.store_table(new_table, self.stream_table(source_table, columns).view())
+
+    # --------- Índices ---------
+
+    def create_index(self, index_name, table_name, column):
+        """
+        Cria um índice (hash e ordenado) sobre uma coluna de uma tabela.
+        """
+        if index_name in self.indexes:
+            raise ValueError("Index already exists")
+        if table_name not in self.dictionary:
+            raise ValueError("Table does not exist")
+        self.indexes[index_name] = Index(index_name, table_name, self.dictionary[table_name], column)
+
+    def drop_index(self, index_name):
+        """
+        Remove um índice.
+        """
+        if index_name not in self.indexes:
+            raise ValueError("Index does not exist")
+        del self.indexes[index_name]
 
     # --------- Procedimentos ---------
 
@@ -268,47 +883,165 @@ class Interpreter:
         """
         if name in self.procedures:
             raise ValueError("Procedure already exists")
-        self.procedures[name] = statements
+        self.define_procedure(name, statements)
         return f"Procedure {name} created"
-    
+
+    def define_procedure(self, name, statements):
+        """
+        Define (ou redefine) um procedimento, compilando já as suas instruções.
+        """
+        self.procedures[name] = Procedure(name, statements, [self.compile(statement) for statement in statements])
+
     def call_procedure(self, name):
         """
-        Executa um procedimento guardado pelo nome.
+        Executa um procedimento guardado pelo nome, pelos planos compilados na definição.
         """
         if name not in self.procedures:
             raise ValueError("Procedure does not exist")
-        
-        statements = self.procedures[name]
-        for statement in statements:
-            print(statement)
-            stmt_type = statement[0]
-
-            if stmt_type == 'print':
-                self.print_table(statement[1])
-            elif stmt_type in ('select_table', 'select_columns', 'select_where', 'select_where_and', 'select_limit', 'select_limit_columns'):
-                result = self.execute_select(statement)
-                self.print_result(result)
-            elif stmt_type == 'import':
-                self.import_table(statement[1], statement[2])
-            elif stmt_type == 'export':
-                self.write_file(statement[1], statement[2])
-            elif stmt_type == 'discard':
-                self.discard_table(statement[1])
-            elif stmt_type == 'rename':
-                self.rename_table(statement[1], statement[2])
-            elif stmt_type == 'create_from_query':
-                result = self.execute_select(statement[2])
-                self.dictionary[statement[1]] = result
-            elif stmt_type == 'create_join':
-                self.create_join_table(*statement[1:])
-            elif stmt_type == 'create_select_columns':
-                self.create_select_columns(*statement[1:])
-            elif stmt_type == 'procedure':
-                self.procedures[statement[1]] = statement[2]
-            elif stmt_type == 'call':
-                self.call_procedure(statement[1])
+        for plan in self.procedures[name].plans:
+            self.run(plan)
+
+    # --------- EXPLAIN ---------
+
+    def explain(self, statement, analyze=False):
+        """
+        EXPLAIN: imprime o plano de execução da instrução, sem a executar.
+        EXPLAIN ANALYZE: executa também a instrução (sem imprimir o resultado) e imprime
+        as medições: tempo, linhas lidas e produzidas e pico de memória, com as de cada
+        instrução de um procedimento em separado.
+        """
+        for line in self.plan(statement):
+            self.writer.message(line)
+        if not analyze:
+            return
+        outer, writer = self.profiler, self.writer
+        self.profiler = outer or Profiler()
+        # Os resultados da instrução são descartados, mesmo que o writer escreva num ficheiro
+        self.writer = ResultWriter(None, writer.format, writer.max_rows, writer.batch)
+        try:
+            with open(os.devnull, 'w') as devnull, redirected(devnull), \
+                    self.profiler.measure(self.statement_to_string(statement), statement[0]) as record:
+                self.compile(statement).execute(self)
+        finally:
+            self.profiler, self.writer = outer, writer
+        writer.message("Execution:")
+        for line in record.lines(1):
+            writer.message(line)
+
+    def plan(self, statement, depth=0):
+        """
+        Descreve, linha a linha, como a instrução vai ser executada.
+        """
+        pad = '  ' * depth
+        lines = [pad + self.statement_to_string(statement)]
+        try:
+            steps = self.plan_steps(statement, lines, depth)
+        except ValueError as error:
+            # P.ex. uma tabela que só vai ser criada por uma instrução anterior do procedimento
+            steps = [f"Not planned: {error}"]
+        lines.extend(f"{pad}  -> {step}" for step in steps)
+        return lines
+
+    def plan_steps(self, statement, lines, depth):
+        """
+        Devolve os passos de execução da instrução (ver plan). As instruções de um
+        procedimento chamado (CALL) ou de um EXPLAIN são descritas à parte, com mais um
+        nível de indentação, e acrescentadas diretamente a lines.
+        """
+        kind = statement[0]
+        steps = []
+        if kind in SELECT_KINDS:
+            steps = self.plan_query(*self.query_parts(statement))
+        elif kind == 'create_from_query':
+            source = self.dictionary.get(self.query_parts(statement[2])[0])
+            store = "Store as table" if isinstance(source, MappedTable) else "Store as view"
+            steps = self.plan_query(*self.query_parts(statement[2])) + [f"{store} {statement[1]}"]
+        elif kind == 'materialize':
+            if statement[1] not in self.dictionary:
+                raise ValueError("Table does not exist")
+            table = self.dictionary[statement[1]]
+            steps = [f"Copy {len(table)} rows from view"] if isinstance(table, TableView) else ["Already materialized"]
+        elif kind == 'export_query':
+            steps = self.plan_query(*self.query_parts(statement[1])) + [f"Stream to {statement[2]}"]
+        elif kind == 'create_join':
+            _, new_table, table1, table2, join_key = statement
+            if table1 not in self.dictionary or table2 not in self.dictionary:
+                raise ValueError("One or both tables do not exist")
+            t1, t2 = self.dictionary[table1], self.dictionary[table2]
+            keys1, keys2 = self.join_keys(t1, t2, join_key)
+            if is_sorted(keys1) and is_sorted(keys2):
+                steps = [f"Merge join {table1} ({len(t1)} rows) and {table2} ({len(t2)} rows) on {join_key}"]
+            else:
+                build, probe = (table2, table1) if len(t2) <= len(t1) else (table1, table2)
+                steps = [f"Hash join on {join_key}: build on {build}, probe {probe}"]
+            steps.append(f"Store as table {new_table}")
+        elif kind == 'import':
+            options = statement[3] if len(statement) > 3 else {}
+            if options.get('mapped'):
+                steps = ["Memory-map file and build row offset index"]
+            else:
+                steps = ["Read CSV in chunks" + (" (or load from cache)" if self.cache else "")]
+                if options.get('where'):
+                    steps.append("Filter while reading: " +
+                                 ' AND '.join(self.condition_to_string(c) for c in options['where']))
+                if options.get('columns'):
+                    steps.append("Keep columns: " + ', '.join(options['columns']))
+        elif kind == 'call':
+            if statement[1] not in self.procedures:
+                raise ValueError("Procedure does not exist")
+            for child in self.procedures[statement[1]].statements:
+                lines.extend(self.plan(child, depth + 1))
+        elif kind == 'explain':
+            lines.extend(self.plan(statement[1], depth + 1))
+        return steps
+
+    def plan_query(self, table_name, columns, clauses):
+        """
+        Passos de execução de um SELECT, pela mesma ordem de query_table e stream_table.
+        """
+        if table_name not in self.dictionary:
+            raise ValueError("Table does not exist")
+        table = self.dictionary[table_name]
+        if self.results is not None:
+            cached = self.results.peek(self.result_key(QueryPlan(table_name, columns, clauses)))
+            if cached is not None:
+                return [f"Cached result for {table_name} ({len(cached)} rows)"]
+        where = clauses.get('where') or []
+        group_by = clauses.get('group_by') or []
+        order_by = clauses.get('order_by') or []
+        limit = clauses.get('limit') or None
+        aggregates = columns != '*' and any(isinstance(col, tuple) for col in columns)
+        steps = []
+
+        choice = self.choose_index(table_name, table, where) if where else None
+        if choice is not None:
+            index, i = choice
+            steps.append(f"Index scan {index.name} on {table_name} ({self.condition_to_string(where[i])})")
+            where = where[:i] + where[i + 1:]
+        else:
+            source = ("Mapped scan" if isinstance(table, MappedTable) else
+                      "View scan" if isinstance(table, TableView) else "Scan")
+            steps.append(f"{source} {table_name} ({len(table)} rows)")
+        if where:
+            # LIMIT só limita a leitura quando não há agregação nem ordenação
+            early_limit = limit and not (group_by or aggregates or order_by)
+            parallel = choice is None and not early_limit and self.scan_pool.applies(table, range(len(table)))
+            text = "Filter: " + ' AND '.join(self.condition_to_string(c) for c in where)
+            steps.append(text + (f" (parallel, {self.scan_pool.workers} workers)" if parallel else ""))
+        if group_by or aggregates:
+            functions = ', '.join(label(col) for col in columns if isinstance(col, tuple))
+            steps.append("Hash aggregate" + (f" by {', '.join(group_by)}" if group_by else "") + f": {functions}")
+        if order_by:
+            keys = ', '.join(f"{label(col)} {direction}" for col, direction in order_by)
+            if limit:
+                steps.append(f"Top-{int(limit)} heap by {keys}")
             else:
-                raise ValueError(f"Unknown statement type: {stmt_type}")
+                steps.append(f"Sort by {keys} (external merge above {self.sort_buffer} rows)")
+        elif limit:
+            steps.append(f"Limit {int(limit)}")
+        if not (group_by or aggregates):
+            steps.append("Project: " + ("*" if columns == '*' else ', '.join(columns)))
+        return steps
 
     def statement_to_string(self, stmt):
         kind = stmt[0]
@@ -317,10 +1050,19 @@ class Interpreter:
             return f"PRINT TABLE {stmt[1]}"
         
         elif kind == 'import':
-            return f"IMPORT TABLE {stmt[1]} FROM '{stmt[2]}'"
+            options = stmt[3] if len(stmt) > 3 else {}
+            text = f"IMPORT TABLE {stmt[1]} FROM '{stmt[2]}'" + (" MAPPED" if options.get('mapped') else "")
+            if options.get('columns'):
+                text += " COLUMNS " + ', '.join(options['columns'])
+            if options.get('where'):
+                text += " WHERE " + ' AND '.join(self.condition_to_string(c) for c in options['where'])
+            return text
         
         elif kind == 'export':
             return f"EXPORT TABLE {stmt[1]} AS '{stmt[2]}'"
+
+        elif kind == 'export_query':
+            return f"EXPORT {self.statement_to_string(stmt[1])} AS '{stmt[2]}'"
         
         elif kind == 'discard':
             return f"DISCARD TABLE {stmt[1]}"
@@ -336,7 +1078,7 @@ class Interpreter:
             return f"SELECT {cols} FROM {stmt[2]}"
         
         elif kind == 'select_where':
-            cond = self.condition_to_string(stmt[2])
+            cond = self.condition_to_string(stmt[2][0])
             return f"SELECT * FROM {stmt[1]} WHERE {cond}"
         
         elif kind == 'select_where_and':
@@ -349,9 +1091,54 @@ class Interpreter:
         elif kind == 'select_limit_columns':
             cols = ', '.join(stmt[1])
             return f"SELECT {cols} FROM {stmt[2]} LIMIT {stmt[3]}"
+
+        elif kind == 'select_query':
+            _, table, cols, clauses = stmt
+            cols = cols if cols == '*' else ', '.join(label(col) for col in cols)
+            text = f"SELECT {cols} FROM {table}"
+            if clauses.get('where'):
+                text += " WHERE " + ' AND '.join(self.condition_to_string(c) for c in clauses['where'])
+            if clauses.get('group_by'):
+                text += " GROUP BY " + ', '.join(clauses['group_by'])
+            if clauses.get('order_by'):
+                text += " ORDER BY " + ', '.join(f"{label(col)} {direction}" for col, direction in clauses['order_by'])
+            if clauses.get('limit'):
+                text += f" LIMIT {clauses['limit']}"
+            return text
         
+        elif kind == 'create_from_query':
+            return f"CREATE TABLE {stmt[1]} {self.statement_to_string(stmt[2])}"
+
+        elif kind == 'create_join':
+            return f"CREATE TABLE {stmt[1]} FROM {stmt[2]} JOIN {stmt[3]} USING {stmt[4]}"
+
+        elif kind == 'create_select_columns':
+            return f"CREATE TABLE {stmt[1]} SELECT {', '.join(stmt[2])} FROM {stmt[3]}"
+
+        elif kind == 'materialize':
+            return f"MATERIALIZE TABLE {stmt[1]}"
+
+        elif kind == 'procedure':
+            return f"PROCEDURE {stmt[1]} DO ... END"
+
+        elif kind == 'explain':
+            analyze = " ANALYZE" if stmt[2] else ""
+            return f"EXPLAIN{analyze} {self.statement_to_string(stmt[1])}"
+
         elif kind == 'call':
             return f"CALL {stmt[1]}"
+
+        elif kind == 'create_index':
+            return f"CREATE INDEX {stmt[1]} ON {stmt[2]} ({stmt[3]})"
+
+        elif kind == 'drop_index':
+            return f"DROP INDEX {stmt[1]}"
         
         else:
-            raise NotImplementedError(f"statement_to_string not implemented for '{kind}'")
\ No newline at end of file
+            raise NotImplementedError(f"statement_to_string not implemented for '{kind}'")
+
+    def condition_to_string(self, cond):
+        if cond[0] == 'AND':
+            cond = cond[1:]
+        col, op, val = cond
+        return f'{col} {op} "{val}"' if isinstance(val, str) else f"{col} {op} {val!r}"
@@ -0,0 +1,82 @@
+from itertools import islice
+
+
+def join_ids(left_keys, right_keys):
+    """
+    Junta duas colunas de chaves e devolve as posições das linhas que correspondem.
+
+    Escolhe a estratégia conforme os dados: 'merge' quando ambos os lados já estão
+    ordenados pela chave, caso contrário 'hash' (tabela de dispersão construída sobre o
+    lado mais pequeno). Os pares saem pela mesma ordem de um ciclo aninhado sobre
+    left × right.
+
+    Devolve um tuplo (posições à esquerda, posições à direita, estratégia).
+    """
+    if is_sorted(left_keys) and is_sorted(right_keys):
+        return merge_join(left_keys, right_keys) + ('merge',)
+    return hash_join(left_keys, right_keys) + ('hash',)
+
+
+def is_sorted(keys):
+    """
+    Verifica, numa só passagem, se as chaves estão em ordem não decrescente.
+    """
+    return all(a <= b for a, b in zip(keys, islice(keys, 1, None)))
+
+
+def hash_join(left_keys, right_keys):
+    """
+    Hash join: constrói a tabela de dispersão sobre o lado mais pequeno e percorre o maior.
+    """
+    left_ids, right_ids = [], []
+    if len(right_keys) <= len(left_keys):
+        buckets = {}
+        for pos, key in enumerate(right_keys):
+            buckets.setdefault(key, []).append(pos)
+        for pos, key in enumerate(left_keys):
+            matches = buckets.get(key)
+            if matches is not None:
+                left_ids.extend([pos] * len(matches))
+                right_ids.extend(matches)
+        return left_ids, right_ids
+
+    # O lado esquerdo é o mais pequeno: agrupa as correspondências por posição à
+    # esquerda, para manter a ordem do lado esquerdo no resultado.
+    buckets = {}
+    for pos, key in enumerate(left_keys):
+        buckets.setdefault(key, []).append(pos)
+    matches = {}
+    for pos, key in enumerate(right_keys):
+        for left in buckets.get(key, ()):
+            matches.setdefault(left, []).append(pos)
+    for pos in sorted(matches):
+        found = matches[pos]
+        left_ids.extend([pos] * len(found))
+        right_ids.extend(found)
+    return left_ids, right_ids
+
+
+def merge_join(left_keys, right_keys):
+    """
+    Sort-merge join para entradas já ordenadas pela chave.
+    """
+    left_ids, right_ids = [], []
+    i, j = 0, 0
+    n, m = len(left_keys), len(right_keys)
+    while i < n and j < m:
+        k1, k2 = left_keys[i], right_keys[j]
+        if k1 < k2:
+            i += 1
+        elif k1 > k2:
+            j += 1
+        else:
+            end = j
+            while end < m and right_keys[end] == k2:
+                end += 1
+            group = range(j, end)
+            while i < n and left_keys[i] == k1:
+                left_ids.extend([i] * len(group))
+                right_ids.extend(group)
+                i += 1
+            j = end
+    return left_ids, right_ids
@@ -16,10 +16,14 @@ class Lexer:
         'LESS_EQUAL', 
         'GREATER_EQUAL',
         'COMMA', 
-        'SEMICOLON'
+        'SEMICOLON',
+        'LPAREN',
+        'RPAREN'
     ]
 
-    # Palavras-chave
+    # Palavras-chave (sem distinção de maiúsculas). Uma tabela ou coluna com o nome de uma
+    # delas (p.ex. count, min, index, on, timestamp, columns) escreve-se entre acentos
+    # graves: SELECT `count` FROM `index`;
     reserved = {
         'import': 'IMPORT',
         'table': 'TABLE',
@@ -40,6 +44,25 @@ class Lexer:
         'rename': 'RENAME',
         'print': 'PRINT',
         'limit': 'LIMIT',
+        'mapped': 'MAPPED',
+        'index': 'INDEX',
+        'on': 'ON',
+        'drop': 'DROP',
+        'group': 'GROUP',
+        'by': 'BY',
+        'count': 'COUNT',
+        'sum': 'SUM',
+        'avg': 'AVG',
+        'min': 'MIN',
+        'max': 'MAX',
+        'order': 'ORDER',
+        'asc': 'ASC',
+        'desc': 'DESC',
+        'explain': 'EXPLAIN',
+        'analyze': 'ANALYZE',
+        'materialize': 'MATERIALIZE',
+        'timestamp': 'TIMESTAMP',
+        'columns': 'COLUMNS',
     }
 
     tokens += list(reserved.values())
@@ -54,6 +77,8 @@ class Lexer:
     t_COMMA = r','
     t_SEMICOLON = r';'
     t_STAR = r'\*'
+    t_LPAREN = r'\('
+    t_RPAREN = r'\)'
 
     # Constrói o analisador léxico
     def build (self, **kwargs):
@@ -71,10 +96,15 @@ class Lexer:
         t.value = float(t.value) if '.' in t.value else int(t.value)
         return t
 
-    # Reconhece identificadores e verifica se são palavras reservadas
+    # Reconhece identificadores e verifica se são palavras reservadas. Um identificador entre
+    # acentos graves (p.ex. `count` ou `Data Hora`) nunca é palavra reservada: permite usar
+    # tabelas e colunas com o nome de uma palavra-chave
     def t_ID(self, t):
-        r'[a-zA-Z_][a-zA-Z_0-9]*'
-        t.type = self.reserved.get(t.value.lower(), 'ID')
+        r'`[^`\n]+`|[a-zA-Z_][a-zA-Z_0-9]*'
+        if t.value.startswith('`'):
+            t.value = t.value[1:-1]
+        else:
+            t.type = self.reserved.get(t.value.lower(), 'ID')
         return t
 
     # Ignora comentários de linha (começam com --)
@@ -1,15 +1,65 @@
 import sys
 from interpreter import Interpreter
+from cache import RESULT_CACHE_BYTES, TableCache
+from writer import ResultWriter
+from server import Server
 
 class main:
 
-    interpreter = Interpreter()
+    # Opções: --no-cache (não usa a cache de importação), --clear-cache (apaga a cache),
+    # --stream (executa o ficheiro instrução a instrução, à medida que é lido),
+    # --workers=N (processos usados no WHERE de tabelas grandes; 1 desativa o paralelismo),
+    # --quiet (não imprime cada instrução antes de a executar),
+    # --format=list|table|csv|tsv (formato dos resultados), --max-rows=N (linhas escritas por
+    # resultado, seguidas de um resumo), --output=FICHEIRO (escreve os resultados num ficheiro),
+    # --parallel=N (executa até N instruções independentes do script em simultâneo),
+    # --result-cache=BYTES (tamanho da cache de resultados das consultas; 0 desativa),
+    # --cache-stats (escreve no stderr, no fim, as estatísticas da cache de resultados),
+    # --prune-imports (cada IMPORT do ficheiro só lê as colunas que o script usa; ignorada
+    # no modo interativo, com --stream e com --serve, em que há instruções posteriores ao script),
+    # --serve=SOCKET (servidor: executa o ficheiro, se indicado, e depois os scripts enviados
+    # por client.py através do socket Unix SOCKET, sobre as mesmas tabelas)
+    options = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
 
-    if len(sys.argv) == 2:
+    if "--clear-cache" in options:
+        TableCache().clear()
+        if not args:
+            sys.exit(0)
+
+    values = dict(arg[2:].split("=", 1) for arg in options if "=" in arg)
+    max_rows = int(values["max-rows"]) if "max-rows" in values else None
+    writer = ResultWriter(values.get("output"), values.get("format", "list"), max_rows)
+    interpreter = Interpreter(cache="--no-cache" not in options,
+                              workers=int(values["workers"]) if "workers" in values else None,
+                              quiet="--quiet" in options, writer=writer,
+                              concurrency=int(values.get("parallel", 1)),
+                              result_cache=int(values.get("result-cache", RESULT_CACHE_BYTES)),
+                              prune_imports="--prune-imports" in options and len(args) == 1 and "serve" not in values)
+
+    if "serve" in values:
+        try:
+            if args:
+                with open(args[0], "r") as file:
+                    interpreter.start(file.read())
+            server = Server(values["serve"], interpreter)
+        except Exception as e:
+            print(e)
+        else:
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.server_close()
+    elif len(args) == 1:
             try:
-                with open(sys.argv[1], "r") as file:
-                    contents = file.read()
-                    resultado = interpreter.start(contents)
+                with open(args[0], "r") as file:
+                    if "--stream" in options:
+                        interpreter.start_stream(file)
+                    else:
+                        contents = file.read()
+                        resultado = interpreter.start(contents)
             except Exception as e:
                 print(e)
     else:
@@ -20,5 +70,9 @@ class main:
                 resultado = interpreter.start(expr)
             except Exception as e:
                 print(e)
-    
 
+
+
+    if "--cache-stats" in options and interpreter.results is not None:
+        print("Result cache:", interpreter.results.stats(), file=sys.stderr)
+    interpreter.close()
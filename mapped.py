@@ -0,0 +1,220 @@
+from array import array
+import csv
+import io
+import locale
+import mmap
+import os
+import re
+
+from table import STR, TableBuilder
+
+
+# Tamanho (bytes) dos blocos percorridos na construção do índice
+BLOCK = 1 << 20
+
+# Linhas descodificadas de uma só vez numa leitura sequencial
+SCAN_ROWS = 4096
+
+LINE_END = re.compile(rb'\n')
+
+
+def index_rows(data):
+    """
+    Constrói o índice de linhas de um ficheiro CSV: um array com a posição (em bytes)
+    do início de cada linha lógica, ignorando linhas vazias e comentários ('#').
+
+    Os blocos sem aspas, comentários nem linhas vazias são indexados com uma expressão
+    regular; os restantes linha a linha, seguindo as aspas para não partir campos com
+    quebras de linha.
+    """
+    offsets = array('q')
+    size = len(data)
+    pos = 0
+    in_quotes = False
+    while pos < size:
+        stop = data.find(b'\n', min(pos + BLOCK, size) - 1)
+        stop = size if stop == -1 else stop + 1
+        block = data[pos:stop]
+        if (not in_quotes and block[:1] not in (b'#', b'\r', b'\n')
+                and b'"' not in block and b'#' not in block
+                and b'\n\n' not in block and b'\n\r\n' not in block):
+            offsets.append(pos)
+            offsets.extend(pos + match.end() for match in LINE_END.finditer(block))
+            if offsets[-1] == stop:
+                offsets.pop()
+        else:
+            in_quotes = index_lines(block, pos, offsets, in_quotes)
+        pos = stop
+    return offsets
+
+
+def index_lines(block, base, offsets, in_quotes):
+    """
+    Indexa um bloco linha a linha; devolve se o bloco termina dentro de um campo entre aspas.
+    """
+    start = 0
+    size = len(block)
+    while start < size:
+        end = block.find(b'\n', start)
+        end = size if end == -1 else end + 1
+        line = block[start:end]
+        if not in_quotes and line.strip() and not line.startswith((b'#', b'"#')):
+            offsets.append(base + start)
+        if line.count(b'"') % 2:
+            in_quotes = not in_quotes
+        start = end
+    return in_quotes
+
+
+class MappedTable:
+    """
+    Tabela sobre um ficheiro CSV mapeado em memória (mmap).
+
+    Na importação só é construído o índice de linhas (um array de posições em bytes);
+    as linhas e as células são descodificadas apenas quando uma consulta, junção ou
+    exportação lhes acede. Todas as colunas são do tipo 'str': as comparações com um
+    número ou com um instante (TIMESTAMP "..." ou texto ISO-8601) convertem cada célula
+    (ver predicates.compile_condition), por isso o WHERE seleciona as mesmas linhas que
+    numa tabela importada, e o ORDER BY ordena da mesma forma (ver sort.column_key). As
+    datas e horas são, no entanto, agrupadas (GROUP BY) pelo texto do ficheiro: o mesmo
+    instante escrito de duas formas dá dois grupos, e não um como numa coluna 'timestamp'.
+    Uma seleção materializada (CREATE TABLE ... SELECT, JOIN) produz uma Table normal,
+    já tipada.
+
+    O ficheiro não deve ser alterado enquanto a tabela estiver importada.
+    """
+
+    def __init__(self, file_path):
+        """
+        Atributos:
+            file_path (str): Caminho do ficheiro CSV.
+            header (list): Nomes das colunas.
+            types (list): Tipo de cada coluna (sempre 'str').
+            columns (list): Uma MappedColumn por coluna.
+            offsets (array): Início de cada linha (a primeira é o cabeçalho), mais o fim do ficheiro.
+        """
+        self.file_path = file_path
+        self.encoding = locale.getpreferredencoding(False)
+        self.file = open(file_path, 'rb')
+        size = os.fstat(self.file.fileno()).st_size
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+        self.offsets = index_rows(self.data)
+        self.offsets.append(size)
+        self.cached = (None, None)
+        self.header = self.decode(0, pad=False) if len(self.offsets) > 1 else []
+        self.types = [STR] * len(self.header)
+        self.columns = [MappedColumn(self, j) for j in range(len(self.header))]
+
+    def __len__(self):
+        return max(0, len(self.offsets) - 2)
+
+    def __getitem__(self, key):
+        # Compatibilidade com a representação antiga {"header": [...], "data": [[str, ...], ...]}
+        if key == 'header':
+            return self.header
+        if key == 'data':
+            return list(self.text_rows())
+        raise KeyError(key)
+
+    def index(self, name):
+        return self.header.index(name)
+
+    def decode(self, k, pad=True):
+        """
+        Descodifica a linha lógica k do índice (0 é o cabeçalho).
+        """
+        text = self.data[self.offsets[k]:self.offsets[k + 1]].decode(self.encoding)
+        row = next(csv.reader(io.StringIO(text)), [])
+        return self.pad(row) if pad else row
+
+    def pad(self, row):
+        width = len(self.header)
+        if len(row) < width:
+            row = row + [''] * (width - len(row))
+        return row
+
+    def row(self, i):
+        """
+        Devolve a linha de dados i (lista de strings), guardando a última descodificada.
+        """
+        cached = self.cached        # Lido uma só vez: a tabela pode ser lida por várias threads
+        if cached[0] != i:
+            cached = self.cached = (i, self.decode(i + 1))
+        return cached[1]
+
+    def scan(self, start=0, stop=None):
+        """
+        Itera sequencialmente as linhas de dados entre start e stop, descodificando
+        blocos de linhas com um único csv.reader.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        for first in range(start, stop, SCAN_ROWS):
+            last = min(first + SCAN_ROWS, stop)
+            text = self.data[self.offsets[first + 1]:self.offsets[last + 1]].decode(self.encoding)
+            for row in csv.reader(io.StringIO(text)):
+                if not row or row[0].startswith('#'):
+                    continue
+                yield self.pad(row)
+
+    def rows(self, ids=None, positions=None):
+        """
+        Itera as linhas como tuplos, todas ou só as das posições ids, opcionalmente só
+        com as colunas nas posições dadas.
+        """
+        rows = self.scan() if ids is None else map(self.row, ids)
+        if positions is None:
+            return map(tuple, rows)
+        return (tuple(row[p] for p in positions) for row in rows)
+
+    def text_rows(self, ids=None, positions=None):
+        return map(list, self.rows(ids, positions))
+
+    def take(self, ids, positions=None):
+        """
+        Descodifica as linhas nas posições ids e constrói com elas uma Table tipada.
+        """
+        if positions is None:
+            positions = range(len(self.header))
+        builder = TableBuilder([self.header[p] for p in positions])
+        chunk = []
+        for row in self.rows(ids, positions):
+            chunk.append(list(row))
+            if len(chunk) >= SCAN_ROWS:
+                builder.append(chunk)
+                chunk = []
+        builder.append(chunk)
+        return builder.build()
+
+    def project(self, positions):
+        return self.take(range(len(self)), positions)
+
+    def close(self):
+        """
+        Liberta o mapeamento e o ficheiro.
+        """
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+
+class MappedColumn:
+    """
+    Coluna de uma MappedTable: sequência só de leitura cujos valores são descodificados a pedido.
+    """
+
+    def __init__(self, table, j):
+        self.table = table
+        self.j = j
+
+    def __len__(self):
+        return len(self.table)
+
+    def __getitem__(self, i):
+        return self.table.row(i)[self.j]
+
+    def __iter__(self):
+        return self.scan(0, len(self.table))
+
+    def scan(self, start, stop):
+        j = self.j
+        return (row[j] for row in self.table.scan(start, stop))
@@ -0,0 +1,134 @@
+from itertools import chain
+from array import array
+import os
+import threading
+
+from predicates import compile_conditions
+from table import Table
+
+
+# Número mínimo de linhas para uma consulta ser dividida entre vários processos
+PARALLEL_THRESHOLD = 200_000
+
+# Partições por processo: mais do que uma equilibra a carga quando as partições demoram tempos diferentes
+PARTITIONS_PER_WORKER = 2
+
+
+def condition_columns(conditions):
+    """
+    Devolve os nomes (sem repetições, pela ordem de aparição) das colunas usadas nas condições.
+    """
+    names = []
+    for cond in conditions:
+        col = cond[1] if cond[0] == 'AND' else cond[0]
+        if col not in names:
+            names.append(col)
+    return names
+
+
+def filter_partition(header, types, columns, conditions, start):
+    """
+    Avalia as condições sobre uma partição (só com as colunas usadas nas condições) e
+    devolve as posições, já relativas à tabela completa, das linhas que as satisfazem.
+    Corre num processo (ou thread) do pool.
+    """
+    partition = Table(header, types, columns)
+    ids = compile_conditions(partition, conditions)(range(len(partition)))
+    return array('q', (start + i for i in ids))
+
+
+class ScanPool:
+    """
+    Avaliação paralela das condições WHERE de uma consulta sobre uma tabela grande.
+
+    A tabela é dividida em partições de linhas contíguas; cada partição (só com as
+    colunas das condições) é filtrada num processo do pool e os resultados são juntos
+    pela ordem das partições, por isso as posições saem pela mesma ordem (e são as
+    mesmas) que no caminho sequencial. Se não for possível criar processos, é usado um
+    pool de threads. O pool é criado no primeiro uso e reutilizado pelas consultas seguintes.
+    """
+
+    def __init__(self, workers=None, threshold=PARALLEL_THRESHOLD):
+        """
+        Atributos:
+            workers (int): Número de processos (por omissão, o número de CPUs); 1 desativa o paralelismo.
+            threshold (int): Número de linhas abaixo do qual a consulta é avaliada sequencialmente.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.threshold = threshold
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def applies(self, table, ids):
+        """
+        Indica se vale a pena dividir a consulta: tabela em memória (colunas que podem ser
+        enviadas para outro processo), leitura completa e pelo menos threshold linhas.
+        """
+        return (self.workers > 1 and isinstance(table, Table) and isinstance(ids, range)
+                and ids == range(len(table)) and len(table) >= self.threshold)
+
+    def filter(self, table, conditions):
+        """
+        Devolve um iterador com as posições das linhas da tabela que satisfazem as condições.
+        """
+        names = condition_columns(conditions)
+        positions = [table.index(name) for name in names]
+        types = [table.types[p] for p in positions]
+        size = len(table)
+        step = -(-size // (self.workers * PARTITIONS_PER_WORKER))
+        tasks = []
+        for start in range(0, size, step):
+            stop = min(start + step, size)
+            tasks.append((names, types, [table.columns[p][start:stop] for p in positions], conditions, start))
+        return chain.from_iterable(self.run(tasks))
+
+    def run(self, tasks, function=filter_partition):
+        """
+        Executa function(*task) para cada tarefa no pool e devolve os resultados pela ordem das tarefas.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+        executor = None
+        try:
+            executor = self.start()
+            futures = [executor.submit(function, *task) for task in tasks]
+            return [future.result() for future in futures]
+        except (BrokenProcessPool, OSError):
+            # Não foi possível usar processos (p.ex. terminaram de forma anormal): passa a usar threads
+            with self.lock:
+                if self.executor is executor:
+                    self.close()
+                    self.executor = ThreadPoolExecutor(self.workers)
+                executor = self.executor
+            futures = [executor.submit(function, *task) for task in tasks]
+            return [future.result() for future in futures]
+
+    def call(self, function, *args):
+        """
+        Executa function(*args) num processo do pool e devolve o resultado. A thread que
+        espera não retém o GIL, por isso várias chamadas feitas de threads diferentes
+        correm em paralelo. Com um só processo, a função é chamada diretamente.
+        """
+        if self.workers <= 1:
+            return function(*args)
+        return self.run([args], function)[0]
+
+    def start(self):
+        # Importado só aqui, para não atrasar o arranque do interpretador
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        with self.lock:
+            if self.executor is None:
+                try:
+                    self.executor = ProcessPoolExecutor(self.workers)
+                except (NotImplementedError, ImportError):
+                    # Plataforma sem multiprocessing funcional
+                    self.executor = ThreadPoolExecutor(self.workers)
+            return self.executor
+
+    def close(self):
+        """
+        Termina os processos do pool (um novo pool é criado se voltar a ser preciso).
+        """
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
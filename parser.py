@@ -1,12 +1,82 @@
 import ply.yacc as yacc
 from lexer import Lexer
+from itertools import chain
+import re
+import threading
+
+from timestamps import Timestamp
+
+
+# Elementos relevantes para separar instruções: strings, identificadores entre acentos
+# graves, comentários, palavras e ';' (como no lexer, um comentário {- ... -} não atravessa linhas)
+STATEMENT_TOKEN = re.compile(r'"[^"\n]*"?|`[^`\n]*`?|--[^\n]*|\{-.*?(?:-\}|\Z)|[A-Za-z_][A-Za-z_0-9]*|;')
+COMMENT = re.compile(r'--[^\n]*|\{-.*?-\}')
+
+
+def split_statements(chunks):
+    """
+    Separa o texto de um script, recebido aos bocados (p.ex. as linhas de um ficheiro),
+    no texto de cada instrução, devolvido assim que o ';' final é lido.
+
+    Um ';' dentro de uma string, de um comentário ou de um PROCEDURE ... END não termina
+    a instrução. Só o texto da instrução em curso fica em memória.
+    """
+    buffer, pos, depth = '', 0, 0
+    for chunk in chain(chunks, [None]):
+        eof = chunk is None
+        if not eof:
+            buffer += chunk
+        start = 0
+        while True:
+            match = STATEMENT_TOKEN.search(buffer, pos)
+            if match is None:
+                # Um '{' ou '-' final pode ser o início de um comentário no bocado seguinte
+                pos = len(buffer) if eof else max(pos, len(buffer) - 1)
+                break
+            text = match.group()
+            if match.end() == len(buffer) and text != ';' and not eof:
+                pos = match.start()         # Pode continuar no bocado seguinte
+                break
+            pos = match.end()
+            if text == ';':
+                if depth == 0:
+                    yield buffer[start:pos]
+                    start = pos
+            elif text[0] not in '"`-{':
+                word = text.lower()
+                if word == 'procedure':
+                    depth += 1
+                elif word == 'end' and depth:
+                    depth -= 1
+        buffer, pos = buffer[start:], pos - start
+    if COMMENT.sub('', buffer).strip():
+        yield buffer
+
 
 class Parser:
-    def __init__(self):
+    shared_instance = None
+
+    def __init__(self, debug=False):
+        """
+        Por omissão o parser arranca em modo rápido: carrega as tabelas pré-construídas de
+        parsetab.py (se a gramática não mudou) sem escrever parsetab.py nem parser.out.
+        Com debug=True as tabelas são regeneradas e escritas, com o relatório parser.out;
+        usar depois de alterar a gramática (python parser.py).
+        """
         self.lexer = Lexer()                    # Cria uma instância do lexer
         self.tokens = self.lexer.tokens         # Usa os tokens definidos no lexer
         self.lexer.build()                      # Constrói o lexer
-        self.parser = yacc.yacc(module=self)    # Constrói o parser com as regras da própria classe
+        self.parser = yacc.yacc(module=self, debug=debug, write_tables=debug)   # Constrói o parser com as regras da própria classe
+        self.lock = threading.Lock()            # O lexer e o parser do PLY guardam estado: uma análise de cada vez
+
+    @classmethod
+    def shared(cls):
+        """
+        Devolve um parser partilhado por todo o processo, construído na primeira chamada.
+        """
+        if cls.shared_instance is None:
+            cls.shared_instance = cls()
+        return cls.shared_instance
 
     # ---------------------
     # Regras de Produção
@@ -20,24 +90,37 @@ class Parser:
         '''statement_list : statement_list statement
                           | statement'''
         if len(p) == 3:
-            p[0] = p[1] + [p[2]]
+            p[1].append(p[2])       # Acrescenta no lugar: a lista não é copiada a cada instrução
+            p[0] = p[1]
         else:
             p[0] = [p[1]]
 
     def p_statement(self, p):
         '''statement : import_table
                      | export_table
+                     | export_query
                      | discard_table
+                     | materialize_table
                      | rename_table
                      | print_table
                      | select_table
                      | create_table_select
                      | create_table_join
-                     | create_table_from_select_columns
                      | procedure
-                     | call_procedure'''
+                     | call_procedure
+                     | create_index
+                     | drop_index
+                     | explain'''
         p[0] = p[1]
 
+    def p_explain(self, p):
+        '''explain : EXPLAIN statement
+                   | EXPLAIN ANALYZE statement'''
+        if len(p) == 3:
+            p[0] = ('explain', p[2], False)
+        else:
+            p[0] = ('explain', p[3], True)     # ANALYZE: executa e mede a instrução
+
     # --------- Operators ---------
 
     def p_operator(self, p):
@@ -52,17 +135,41 @@ class Parser:
     # --------- Comandos - Tabela de dados ---------
 
     def p_import_table(self, p):
-        'import_table : IMPORT TABLE ID FROM STRING SEMICOLON'
-        p[0] = ('import', p[3], p[5])
+        '''import_table : IMPORT TABLE ID FROM STRING import_columns where_clause SEMICOLON
+                        | IMPORT TABLE ID FROM STRING MAPPED SEMICOLON'''
+        if len(p) == 8:
+            p[0] = ('import', p[3], p[5], {'mapped': True})    # Opções de importação
+        elif p[6] is None and p[7] is None:
+            p[0] = ('import', p[3], p[5])
+        else:
+            options = {}
+            if p[6] is not None:
+                options['columns'] = p[6]
+            if p[7] is not None:
+                options['where'] = p[7]
+            p[0] = ('import', p[3], p[5], options)
+
+    def p_import_columns(self, p):
+        '''import_columns : COLUMNS comma_id
+                          | empty'''
+        p[0] = p[2] if len(p) == 3 else None
 
     def p_export_table(self, p):
         'export_table : EXPORT TABLE ID AS STRING SEMICOLON'
         p[0] = ('export', p[3], p[5])
 
+    def p_export_query(self, p):
+        'export_query : EXPORT select_query AS STRING SEMICOLON'
+        p[0] = ('export_query', p[2], p[4])
+
     def p_discard_table(self, p):
         'discard_table : DISCARD TABLE ID SEMICOLON'
         p[0] = ('discard', p[3])
 
+    def p_materialize_table(self, p):
+        'materialize_table : MATERIALIZE TABLE ID SEMICOLON'
+        p[0] = ('materialize', p[3])
+
     def p_rename_table(self, p):
         'rename_table : RENAME TABLE ID ID SEMICOLON'
         p[0] = ('rename', p[3], p[4])
@@ -74,36 +181,103 @@ class Parser:
     # --------- Comandos - Queries --------- 
 
     def p_select_table(self, p):
-        '''select_table : SELECT STAR FROM ID SEMICOLON
-                        | select_columns
-                        | select_where
-                        | select_where_and
-                        | select_limit
-                        | select_limit_columns'''
+        'select_table : select_query SEMICOLON'
+        p[0] = p[1]
+
+    def p_select_query(self, p):
+        'select_query : SELECT projection FROM ID where_clause group_clause order_clause limit_clause'
+        _, _, cols, _, table, conditions, group_by, order_by, limit = p
+        aggregates = cols != '*' and any(isinstance(col, tuple) for col in cols)
+        clauses = {'where': conditions, 'group_by': group_by or [], 'order_by': order_by or [], 'limit': limit}
+        if group_by is not None or order_by is not None or aggregates:
+            # Consulta com agregação ou ordenação: forma geral, com as cláusulas num dicionário
+            p[0] = ('select_query', table, cols, clauses)
+        elif conditions and limit is None and cols == '*':
+            p[0] = ('select_where', table, conditions) if len(conditions) == 1 else ('select_where_and', table, conditions)
+        elif not conditions and limit is None:
+            p[0] = ('select_table', cols, table) if cols == '*' else ('select_columns', cols, table)
+        elif not conditions:
+            p[0] = ('select_limit', table, limit) if cols == '*' else ('select_limit_columns', cols, table, limit)
+        else:
+            p[0] = ('select_query', table, cols, clauses)
+
+    def p_projection(self, p):
+        '''projection : STAR
+                      | select_list'''
+        p[0] = p[1]
+
+    def p_select_list(self, p):
+        '''select_list : select_list COMMA select_item
+                       | select_item'''
         if len(p) == 2:
+            p[0] = [p[1]]
+        else:
+            p[1].append(p[3])
             p[0] = p[1]
+
+    def p_select_item(self, p):
+        '''select_item : ID
+                       | aggregate'''
+        p[0] = p[1]
+
+    def p_aggregate(self, p):
+        '''aggregate : aggregate_function LPAREN STAR RPAREN
+                     | aggregate_function LPAREN ID RPAREN'''
+        p[0] = (p[1].upper(), p[3])     # p.ex. ('AVG', 'Temperatura') ou ('COUNT', '*')
+
+    def p_aggregate_function(self, p):
+        '''aggregate_function : COUNT
+                              | SUM
+                              | AVG
+                              | MIN
+                              | MAX'''
+        p[0] = p[1]
+
+    def p_where_clause(self, p):
+        '''where_clause : WHERE condition
+                        | WHERE condition and_list
+                        | empty'''
+        if len(p) == 2:
+            p[0] = None
+        elif len(p) == 3:
+            p[0] = [p[2]]
         else:
-            p[0] = ('select_table', p[2], p[4])
+            p[0] = [p[2]] + p[3]
+
+    def p_group_clause(self, p):
+        '''group_clause : GROUP BY comma_id
+                        | empty'''
+        p[0] = p[3] if len(p) == 4 else None
 
-    def p_select_columns(self, p):
-        'select_columns : SELECT comma_id FROM ID SEMICOLON'
-        p[0] = ('select_columns', p[2], p[4])
+    def p_order_clause(self, p):
+        '''order_clause : ORDER BY order_list
+                        | empty'''
+        p[0] = p[3] if len(p) == 4 else None
 
-    def p_select_where(self, p):
-        'select_where : SELECT STAR FROM ID WHERE condition SEMICOLON'
-        p[0] = ('select_where', p[4], [p[6]])
+    def p_order_list(self, p):
+        '''order_list : order_list COMMA order_item
+                      | order_item'''
+        if len(p) == 2:
+            p[0] = [p[1]]
+        else:
+            p[1].append(p[3])
+            p[0] = p[1]
 
-    def p_select_where_and(self, p):
-        'select_where_and : SELECT STAR FROM ID WHERE condition and_list SEMICOLON'
-        p[0] = ('select_where_and', p[4], [p[6]] + p[7])
+    def p_order_item(self, p):
+        '''order_item : select_item
+                      | select_item ASC
+                      | select_item DESC'''
+        direction = p[2].upper() if len(p) == 3 else 'ASC'
+        p[0] = (p[1], direction)    # A coluna pode ser uma agregação, p.ex. (('AVG', 'Temperatura'), 'DESC')
 
-    def p_select_limit(self, p):
-        'select_limit : SELECT STAR FROM ID LIMIT NUMBER SEMICOLON'
-        p[0] = ('select_limit', p[4], p[6])
+    def p_limit_clause(self, p):
+        '''limit_clause : LIMIT NUMBER
+                        | empty'''
+        p[0] = p[2] if len(p) == 3 else None
 
-    def p_select_limit_columns(self, p):
-        'select_limit_columns : SELECT comma_id FROM ID LIMIT NUMBER SEMICOLON'
-        p[0] = ('select_limit_columns', p[2], p[4], p[6])
+    def p_empty(self, p):
+        'empty :'
+        p[0] = None
 
     def p_condition(self, p):
         'condition : ID operator value'
@@ -115,6 +289,10 @@ class Parser:
                  | NUMBER'''
         p[0] = p[1]
 
+    def p_value_timestamp(self, p):
+        'value : TIMESTAMP STRING'
+        p[0] = Timestamp.parse(p[2])
+
     def p_and_list(self, p):
         '''and_list : AND condition
                     | and_list AND condition'''
@@ -141,9 +319,15 @@ class Parser:
         'create_table_join : CREATE TABLE ID FROM ID JOIN ID USING ID SEMICOLON'
         p[0] = ('create_join', p[3], p[5], p[7], p[9])
 
-    def p_create_table_from_select_columns(self, p):
-        'create_table_from_select_columns : CREATE TABLE ID SELECT comma_id FROM ID SEMICOLON'
-        p[0] = ('create_select_columns', p[3], p[5], p[7])
+    # --------- Comandos - Índices ---------
+
+    def p_create_index(self, p):
+        'create_index : CREATE INDEX ID ON ID LPAREN ID RPAREN SEMICOLON'
+        p[0] = ('create_index', p[3], p[5], p[7])
+
+    def p_drop_index(self, p):
+        'drop_index : DROP INDEX ID SEMICOLON'
+        p[0] = ('drop_index', p[3])
 
     # --------- Comandos - Procedimentos ---------
 
@@ -169,5 +353,25 @@ class Parser:
         """
         Função para parsear a entrada e retornar a AST(árvore sintática).
         """
-        result = self.parser.parse(data, lexer=self.lexer.lexer)
+        with self.lock:
+            result = self.parser.parse(data, lexer=self.lexer.lexer)
         return result
+
+    def parse_statements(self, chunks):
+        """
+        Analisa um script instrução a instrução, devolvendo cada AST assim que a
+        instrução termina. Aceita uma string ou um iterável de bocados de texto (p.ex.
+        um ficheiro aberto). Lança ValueError na primeira instrução inválida.
+        """
+        if isinstance(chunks, str):
+            chunks = [chunks]
+        for text in split_statements(chunks):
+            result = self.parse_input(text)
+            if result is None:
+                raise ValueError("Parser error")
+            yield from result
+
+
+if __name__ == '__main__':
+    # Regenera parsetab.py e parser.out depois de alterações à gramática
+    Parser(debug=True)
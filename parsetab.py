@@ -6,9 +6,9 @@ _tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = 'AND AS CALL COMMA CREATE DISCARD DO END EQUALS EXPORT FROM GREATER_EQUAL GREATER_THAN ID IMPORT JOIN LESS_EQUAL LESS_THAN LIMIT NOT_EQUAL NUMBER PRINT PROCEDURE RENAME SELECT SEMICOLON STAR STRING TABLE USING WHEREprogram : statement_liststatement_list : statement_list statement\n| statementstatement : import_table\n| export_table\n| discard_table\n| rename_table\n| print_table\n| select_table\n| create_table_select\n| create_table_join\n| create_table_from_select_columns\n| procedure\n| call_procedureoperator : EQUALS\n| NOT_EQUAL\n| LESS_THAN\n| GREATER_THAN\n| LESS_EQUAL\n| GREATER_EQUALimport_table : IMPORT TABLE ID FROM STRING SEMICOLONexport_table : EXPORT TABLE ID AS STRING SEMICOLONdiscard_table : DISCARD TABLE ID SEMICOLONrename_table : RENAME TABLE ID ID SEMICOLONprint_table : PRINT TABLE ID SEMICOLONselect_table : SELECT STAR FROM ID SEMICOLON\n| select_columns\n| select_where\n| select_where_and\n| select_limit\n| select_limit_columnsselect_columns : SELECT comma_id FROM ID SEMICOLONselect_where : SELECT STAR FROM ID WHERE condition SEMICOLONselect_where_and : SELECT STAR FROM ID WHERE condition and_list SEMICOLONselect_limit : SELECT STAR FROM ID LIMIT NUMBER SEMICOLONselect_limit_columns : SELECT comma_id FROM ID LIMIT NUMBER SEMICOLONcondition : ID operator valuevalue : ID\n| STRING\n| NUMBERand_list : AND condition\n| and_list AND conditioncomma_id : ID COMMA comma_id\n| IDcreate_table_select : CREATE TABLE ID select_tablecreate_table_join : CREATE TABLE ID FROM ID JOIN ID USING ID SEMICOLONcreate_table_from_select_columns : CREATE TABLE ID SELECT comma_id FROM ID SEMICOLONprocedure : PROCEDURE ID DO statement_list END SEMICOLONcall_procedure : CALL ID SEMICOLON'
+_lr_signature = 'ANALYZE AND AS ASC AVG BY CALL COLUMNS COMMA COUNT CREATE DESC DISCARD DO DROP END EQUALS EXPLAIN EXPORT FROM GREATER_EQUAL GREATER_THAN GROUP ID IMPORT INDEX JOIN LESS_EQUAL LESS_THAN LIMIT LPAREN MAPPED MATERIALIZE MAX MIN NOT_EQUAL NUMBER ON ORDER PRINT PROCEDURE RENAME RPAREN SELECT SEMICOLON STAR STRING SUM TABLE TIMESTAMP USING WHEREprogram : statement_liststatement_list : statement_list statement\n                          | statementstatement : import_table\n                     | export_table\n                     | export_query\n                     | discard_table\n                     | materialize_table\n                     | rename_table\n                     | print_table\n                     | select_table\n                     | create_table_select\n                     | create_table_join\n                     | procedure\n                     | call_procedure\n                     | create_index\n                     | drop_index\n                     | explainexplain : EXPLAIN statement\n                   | EXPLAIN ANALYZE statementoperator : EQUALS\n                    | NOT_EQUAL\n                    | LESS_THAN\n                    | GREATER_THAN\n                    | LESS_EQUAL\n                    | GREATER_EQUALimport_table : IMPORT TABLE ID FROM STRING import_columns where_clause SEMICOLON\n                        | IMPORT TABLE ID FROM STRING MAPPED SEMICOLONimport_columns : COLUMNS comma_id\n                          | emptyexport_table : EXPORT TABLE ID AS STRING SEMICOLONexport_query : EXPORT select_query AS STRING SEMICOLONdiscard_table : DISCARD TABLE ID SEMICOLONmaterialize_table : MATERIALIZE TABLE ID SEMICOLONrename_table : RENAME TABLE ID ID SEMICOLONprint_table : PRINT TABLE ID SEMICOLONselect_table : select_query SEMICOLONselect_query : SELECT projection FROM ID where_clause group_clause order_clause limit_clauseprojection : STAR\n                      | select_listselect_list : select_list COMMA select_item\n                       | select_itemselect_item : ID\n                       | aggregateaggregate : aggregate_function LPAREN STAR RPAREN\n                     | aggregate_function LPAREN ID RPARENaggregate_function : COUNT\n                              | SUM\n                              | AVG\n                              | MIN\n                              | MAXwhere_clause : WHERE condition\n                        | WHERE condition and_list\n                        | emptygroup_clause : GROUP BY comma_id\n                        | emptyorder_clause : ORDER BY order_list\n                        | emptyorder_list : order_list COMMA order_item\n                      | order_itemorder_item : select_item\n                      | select_item ASC\n                      | select_item DESClimit_clause : LIMIT NUMBER\n                        | emptyempty :condition : ID operator valuevalue : ID\n                 | STRING\n                 | NUMBERvalue : TIMESTAMP STRINGand_list : AND condition\n                    | and_list AND conditioncomma_id : ID COMMA comma_id\n                    | IDcreate_table_select : CREATE TABLE ID select_tablecreate_table_join : CREATE TABLE ID FROM ID JOIN ID USING ID SEMICOLONcreate_index : CREATE INDEX ID ON ID LPAREN ID RPAREN SEMICOLONdrop_index : DROP INDEX ID SEMICOLONprocedure : PROCEDURE ID DO statement_list END SEMICOLONcall_procedure : CALL ID SEMICOLON'
     
-_lr_action_items = {'IMPORT':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,21,22,23,24,25,29,50,51,54,56,60,63,66,67,70,75,76,83,91,94,95,102,106,109,],[15,15,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-27,-28,-29,-30,-31,-2,15,-49,-23,-25,-45,15,-24,-26,-32,-21,-22,-48,-33,-35,-36,-34,-32,-46,]),'EXPORT':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,21,22,23,24,25,29,50,51,54,56,60,63,66,67,70,75,76,83,91,94,95,102,106,109,],[16,16,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-27,-28,-29,-30,-31,-2,16,-49,-23,-25,-45,16,-24,-26,-32,-21,-22,-48,-33,-35,-36,-34,-32,-46,]),'DISCARD':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,21,22,23,24,25,29,50,51,54,56,60,63,66,67,70,75,76,83,91,94,95,102,106,109,],[17,17,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-27,-28,-29,-30,-31,-2,17,-49,-23,-25,-45,17,-24,-26,-32,-21,-22,-48,-33,-35,-36,-34,-32,-46,]),'RENAME':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,21,22,23,24,25,29,50,51,54,56,60,63,66,67,70,75,76,83,91,94,95,102,106,109,],[18,18,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-27,-28,-29,-30,-31,-2,18,-49,-23,-25,-45,18,-24,-26,-32,-21,-22,-48,-33,-35,-36,-34,-32,-46,]),'PRINT':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,21,22,23,24,25,29,50,51,54,56,60,63,66,67,70,75,76,83,91,94,95,102,106,109,],[19,19,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-27,-28,-29,-30,-31,-2,19,-49,-23,-25,-45,19,-24,-26,-32,-21,-22,-48,-33,-35,-36,-34,-32,-46,]),'SELECT':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,21,22,23,24,25,29,49,50,51,54,56,60,63,66,67,70,75,76,83,91,94,95,102,106,109,],[20,20,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-27,-28,-29,-30,-31,-2,62,20,-49,-23,-25,-45,20,-24,-26,-32,-21,-22,-48,-33,-35,-36,-34,-32,-46,]),'CREATE':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,21,22,23,24,25,29,50,51,54,56,60,63,66,67,70,75,76,83,91,94,95,102,106,109,],[26,26,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-27,-28,-29,-30,-31,-2,26,-49,-23,-25,-45,26,-24,-26,-32,-21,-22,-48,-33,-35,-36,-34,-32,-46,]),'PROCEDURE':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,21,22,23,24,25,29,50,51,54,56,60,63,66,67,70,75,76,83,91,94,95,102,106,109,],[27,27,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-27,-28,-29,-30,-31,-2,27,-49,-23,-25,-45,27,-24,-26,-32,-21,-22,-48,-33,-35,-36,-34,-32,-46,]),'CALL':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,21,22,23,24,25,29,50,51,54,56,60,63,66,67,70,75,76,83,91,94,95,102,106,109,],[28,28,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-27,-28,-29,-30,-31,-2,28,-49,-23,-25,-45,28,-24,-26,-32,-21,-22,-48,-33,-35,-36,-34,-32,-46,]),'$end':([1,2,3,4,5,6,7,8,9,10,11,12,13,14,21,22,23,24,25,29,51,54,56,60,66,67,70,75,76,83,91,94,95,102,106,109,],[0,-1,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-27,-28,-29,-30,-31,-2,-49,-23,-25,-45,-24,-26,-32,-21,-22,-48,-33,-35,-36,-34,-32,-46,]),'END':([3,4,5,6,7,8,9,10,11,12,13,14,21,22,23,24,25,29,51,54,56,60,63,66,67,70,75,76,83,91,94,95,102,106,109,],[-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-27,-28,-29,-30,-31,-2,-49,-23,-25,-45,74,-24,-26,-32,-21,-22,-48,-33,-35,-36,-34,-32,-46,]),'TABLE':([15,16,17,18,19,26,],[30,31,32,33,34,38,]),'STAR':([20,62,],[35,35,]),'ID':([20,27,28,30,31,32,33,34,38,44,46,47,48,61,62,68,81,82,84,85,86,87,88,89,90,93,103,105,],[36,39,40,41,42,43,44,45,49,55,57,36,59,72,36,77,96,97,98,-15,-16,-17,-18,-19,-20,77,77,108,]),'FROM':([35,36,37,41,49,58,73,],[46,-44,48,52,61,-43,82,]),'COMMA':([36,],[47,]),'DO':([39,],[50,]),'SEMICOLON':([40,43,45,55,57,59,64,65,74,78,79,80,92,97,98,99,100,101,104,107,108,],[51,54,56,66,67,70,75,76,83,91,94,95,102,106,-38,-37,-39,-40,-41,-42,109,]),'AS':([42,],[53,]),'STRING':([52,53,84,85,86,87,88,89,90,],[64,65,100,-15,-16,-17,-18,-19,-20,]),'WHERE':([57,],[68,]),'LIMIT':([57,59,97,],[69,71,71,]),'NUMBER':([69,71,84,85,86,87,88,89,90,],[79,80,101,-15,-16,-17,-18,-19,-20,]),'JOIN':([72,],[81,]),'EQUALS':([77,],[85,]),'NOT_EQUAL':([77,],[86,]),'LESS_THAN':([77,],[87,]),'GREATER_THAN':([77,],[88,]),'LESS_EQUAL':([77,],[89,]),'GREATER_EQUAL':([77,],[90,]),'AND':([78,92,98,99,100,101,104,107,],[93,103,-38,-37,-39,-40,-41,-42,]),'USING':([96,],[105,]),}
+_lr_action_items = {'IMPORT':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,30,32,36,46,47,69,70,72,79,80,82,83,86,87,94,95,108,111,118,136,154,161,],[19,19,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,19,-2,-37,-19,19,19,-81,-20,-33,-34,-36,-76,19,-79,-32,-35,-31,-80,-28,-27,-78,-77,]),'EXPORT':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,30,32,36,46,47,69,70,72,79,80,82,83,86,87,94,95,108,111,118,136,154,161,],[20,20,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,20,-2,-37,-19,20,20,-81,-20,-33,-34,-36,-76,20,-79,-32,-35,-31,-80,-28,-27,-78,-77,]),'DISCARD':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,30,32,36,46,47,69,70,72,79,80,82,83,86,87,94,95,108,111,118,136,154,161,],[22,22,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,22,-2,-37,-19,22,22,-81,-20,-33,-34,-36,-76,22,-79,-32,-35,-31,-80,-28,-27,-78,-77,]),'MATERIALIZE':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,30,32,36,46,47,69,70,72,79,80,82,83,86,87,94,95,108,111,118,136,154,161,],[23,23,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,23,-2,-37,-19,23,23,-81,-20,-33,-34,-36,-76,23,-79,-32,-35,-31,-80,-28,-27,-78,-77,]),'RENAME':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,30,32,36,46,47,69,70,72,79,80,82,83,86,87,94,95,108,111,118,136,154,161,],[24,24,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,24,-2,-37,-19,24,24,-81,-20,-33,-34,-36,-76,24,-79,-32,-35,-31,-80,-28,-27,-78,-77,]),'PRINT':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,30,32,36,46,47,69,70,72,79,80,82,83,86,87,94,95,108,111,118,136,154,161,],[25,25,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,25,-2,-37,-19,25,25,-81,-20,-33,-34,-36,-76,25,-79,-32,-35,-31,-80,-28,-27,-78,-77,]),'CREATE':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,30,32,36,46,47,69,70,72,79,80,82,83,86,87,94,95,108,111,118,136,154,161,],[26,26,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,26,-2,-37,-19,26,26,-81,-20,-33,-34,-36,-76,26,-79,-32,-35,-31,-80,-28,-27,-78,-77,]),'PROCEDURE':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,30,32,36,46,47,69,70,72,79,80,82,83,86,87,94,95,108,111,118,136,154,161,],[27,27,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,27,-2,-37,-19,27,27,-81,-20,-33,-34,-36,-76,27,-79,-32,-35,-31,-80,-28,-27,-78,-77,]),'CALL':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,30,32,36,46,47,69,70,72,79,80,82,83,86,87,94,95,108,111,118,136,154,161,],[28,28,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,28,-2,-37,-19,28,28,-81,-20,-33,-34,-36,-76,28,-79,-32,-35,-31,-80,-28,-27,-78,-77,]),'DROP':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,30,32,36,46,47,69,70,72,79,80,82,83,86,87,94,95,108,111,118,136,154,161,],[29,29,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,29,-2,-37,-19,29,29,-81,-20,-33,-34,-36,-76,29,-79,-32,-35,-31,-80,-28,-27,-78,-77,]),'EXPLAIN':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,30,32,36,46,47,69,70,72,79,80,82,83,86,87,94,95,108,111,118,136,154,161,],[30,30,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,30,-2,-37,-19,30,30,-81,-20,-33,-34,-36,-76,30,-79,-32,-35,-31,-80,-28,-27,-78,-77,]),'SELECT':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,20,30,32,36,46,47,67,69,70,72,79,80,82,83,86,87,94,95,108,111,118,136,154,161,],[31,31,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,31,31,-2,-37,-19,31,31,31,-81,-20,-33,-34,-36,-76,31,-79,-32,-35,-31,-80,-28,-27,-78,-77,]),'$end':([1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,32,36,46,70,72,79,80,82,83,87,94,95,108,111,118,136,154,161,],[0,-1,-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,-2,-37,-19,-81,-20,-33,-34,-36,-76,-79,-32,-35,-31,-80,-28,-27,-78,-77,]),'END':([3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,32,36,46,70,72,79,80,82,83,86,87,94,95,108,111,118,136,154,161,],[-3,-4,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-16,-17,-18,-2,-37,-19,-81,-20,-33,-34,-36,-76,98,-79,-32,-35,-31,-80,-28,-27,-78,-77,]),'TABLE':([19,20,22,23,24,25,26,],[33,34,37,38,39,40,41,]),'SEMICOLON':([21,44,49,53,63,64,66,71,78,81,88,92,93,98,99,101,102,103,104,105,107,112,114,115,117,119,120,123,125,127,139,140,142,144,146,147,148,149,150,152,153,155,156,157,158,159,160,163,164,165,],[36,70,-43,-44,79,80,82,87,94,95,-66,-66,108,111,-66,-54,-45,-46,-66,118,-30,-66,-56,-52,136,-29,-75,-66,-58,-53,154,-38,-65,-55,-72,-68,-67,-69,-70,-74,161,-64,-57,-60,-61,-73,-71,-62,-63,-59,]),'INDEX':([26,29,],[42,45,]),'ID':([27,28,31,33,34,37,38,39,40,41,42,45,65,73,74,75,84,85,100,106,109,110,126,128,129,130,131,132,133,134,135,137,138,143,145,162,],[43,44,49,60,61,63,64,65,66,67,68,71,81,88,49,91,96,97,116,120,121,122,120,116,147,-21,-22,-23,-24,-25,-26,120,153,49,116,49,]),'ANALYZE':([30,],[47,]),'STAR':([31,75,],[50,90,]),'COUNT':([31,74,143,162,],[55,55,55,55,]),'SUM':([31,74,143,162,],[56,56,56,56,]),'AVG':([31,74,143,162,],[57,57,57,57,]),'MIN':([31,74,143,162,],[58,58,58,58,]),'MAX':([31,74,143,162,],[59,59,59,59,]),'AS':([35,49,53,61,88,99,101,102,103,112,114,115,120,123,125,127,140,142,144,146,147,148,149,150,152,155,156,157,158,159,160,163,164,165,],[62,-43,-44,77,-66,-66,-54,-45,-46,-66,-56,-52,-75,-66,-58,-53,-38,-65,-55,-72,-68,-67,-69,-70,-74,-64,-57,-60,-61,-73,-71,-62,-63,-59,]),'DO':([43,],[69,]),'FROM':([48,49,50,51,52,53,60,67,89,102,103,],[73,-43,-39,-40,-42,-44,76,84,-41,-45,-46,]),'COMMA':([49,51,52,53,89,102,103,120,156,157,158,163,164,165,],[-43,74,-42,-44,-41,-45,-46,137,162,-60,-61,-62,-63,-59,]),'ASC':([49,53,102,103,158,],[-43,-44,-45,-46,163,]),'DESC':([49,53,102,103,158,],[-43,-44,-45,-46,164,]),'LIMIT':([49,53,88,99,101,102,103,112,114,115,120,123,125,127,144,146,147,148,149,150,152,156,157,158,159,160,163,164,165,],[-43,-44,-66,-66,-54,-45,-46,-66,-56,-52,-75,141,-58,-53,-55,-72,-68,-67,-69,-70,-74,-57,-60,-61,-73,-71,-62,-63,-59,]),'LPAREN':([54,55,56,57,58,59,97,],[75,-47,-48,-49,-50,-51,110,]),'STRING':([62,76,77,129,130,131,132,133,134,135,151,],[78,92,93,149,-21,-22,-23,-24,-25,-26,160,]),'ON':([68,],[85,]),'WHERE':([88,92,104,107,119,120,152,],[100,-66,100,-30,-29,-75,-74,]),'GROUP':([88,99,101,115,127,146,147,148,149,150,159,160,],[-66,113,-54,-52,-53,-72,-68,-67,-69,-70,-73,-71,]),'ORDER':([88,99,101,112,114,115,120,127,144,146,147,148,149,150,152,159,160,],[-66,-66,-54,124,-56,-52,-75,-53,-55,-72,-68,-67,-69,-70,-74,-73,-71,]),'RPAREN':([90,91,122,],[102,103,139,]),'MAPPED':([92,],[105,]),'COLUMNS':([92,],[106,]),'JOIN':([96,],[109,]),'BY':([113,124,],[126,143,]),'AND':([115,127,146,147,148,149,150,159,160,],[128,145,-72,-68,-67,-69,-70,-73,-71,]),'EQUALS':([116,],[130,]),'NOT_EQUAL':([116,],[131,]),'LESS_THAN':([116,],[132,]),'GREATER_THAN':([116,],[133,]),'LESS_EQUAL':([116,],[134,]),'GREATER_EQUAL':([116,],[135,]),'USING':([121,],[138,]),'NUMBER':([129,130,131,132,133,134,135,141,],[150,-21,-22,-23,-24,-25,-26,155,]),'TIMESTAMP':([129,130,131,132,133,134,135,],[151,-21,-22,-23,-24,-25,-26,]),}
 
 _lr_action = {}
 for _k, _v in _lr_action_items.items():
@@ -17,7 +17,7 @@ for _k, _v in _lr_action_items.items():
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'program':([0,],[1,]),'statement_list':([0,50,],[2,63,]),'statement':([0,2,50,63,],[3,29,3,29,]),'import_table':([0,2,50,63,],[4,4,4,4,]),'export_table':([0,2,50,63,],[5,5,5,5,]),'discard_table':([0,2,50,63,],[6,6,6,6,]),'rename_table':([0,2,50,63,],[7,7,7,7,]),'print_table':([0,2,50,63,],[8,8,8,8,]),'select_table':([0,2,49,50,63,],[9,9,60,9,9,]),'create_table_select':([0,2,50,63,],[10,10,10,10,]),'create_table_join':([0,2,50,63,],[11,11,11,11,]),'create_table_from_select_columns':([0,2,50,63,],[12,12,12,12,]),'procedure':([0,2,50,63,],[13,13,13,13,]),'call_procedure':([0,2,50,63,],[14,14,14,14,]),'select_columns':([0,2,49,50,63,],[21,21,21,21,21,]),'select_where':([0,2,49,50,63,],[22,22,22,22,22,]),'select_where_and':([0,2,49,50,63,],[23,23,23,23,23,]),'select_limit':([0,2,49,50,63,],[24,24,24,24,24,]),'select_limit_columns':([0,2,49,50,63,],[25,25,25,25,25,]),'comma_id':([20,47,62,],[37,58,73,]),'condition':([68,93,103,],[78,104,107,]),'operator':([77,],[84,]),'and_list':([78,],[92,]),'value':([84,],[99,]),}
+_lr_goto_items = {'program':([0,],[1,]),'statement_list':([0,69,],[2,86,]),'statement':([0,2,30,47,69,86,],[3,32,46,72,3,32,]),'import_table':([0,2,30,47,69,86,],[4,4,4,4,4,4,]),'export_table':([0,2,30,47,69,86,],[5,5,5,5,5,5,]),'export_query':([0,2,30,47,69,86,],[6,6,6,6,6,6,]),'discard_table':([0,2,30,47,69,86,],[7,7,7,7,7,7,]),'materialize_table':([0,2,30,47,69,86,],[8,8,8,8,8,8,]),'rename_table':([0,2,30,47,69,86,],[9,9,9,9,9,9,]),'print_table':([0,2,30,47,69,86,],[10,10,10,10,10,10,]),'select_table':([0,2,30,47,67,69,86,],[11,11,11,11,83,11,11,]),'create_table_select':([0,2,30,47,69,86,],[12,12,12,12,12,12,]),'create_table_join':([0,2,30,47,69,86,],[13,13,13,13,13,13,]),'procedure':([0,2,30,47,69,86,],[14,14,14,14,14,14,]),'call_procedure':([0,2,30,47,69,86,],[15,15,15,15,15,15,]),'create_index':([0,2,30,47,69,86,],[16,16,16,16,16,16,]),'drop_index':([0,2,30,47,69,86,],[17,17,17,17,17,17,]),'explain':([0,2,30,47,69,86,],[18,18,18,18,18,18,]),'select_query':([0,2,20,30,47,67,69,86,],[21,21,35,21,21,21,21,21,]),'projection':([31,],[48,]),'select_list':([31,],[51,]),'select_item':([31,74,143,162,],[52,89,158,158,]),'aggregate':([31,74,143,162,],[53,53,53,53,]),'aggregate_function':([31,74,143,162,],[54,54,54,54,]),'where_clause':([88,104,],[99,117,]),'empty':([88,92,99,104,112,123,],[101,107,114,101,125,142,]),'import_columns':([92,],[104,]),'group_clause':([99,],[112,]),'condition':([100,128,145,],[115,146,159,]),'comma_id':([106,126,137,],[119,144,152,]),'order_clause':([112,],[123,]),'and_list':([115,],[127,]),'operator':([116,],[129,]),'limit_clause':([123,],[140,]),'value':([129,],[148,]),'order_list':([143,],[156,]),'order_item':([143,162,],[157,165,]),}
 
 _lr_goto = {}
 for _k, _v in _lr_goto_items.items():
@@ -27,53 +27,85 @@ for _k, _v in _lr_goto_items.items():
 del _lr_goto_items
 _lr_productions = [
   ("S' -> program","S'",1,None,None,None),
-  ('program -> statement_list','program',1,'p_program','parser.py',16),
-  ('statement_list -> statement_list statement','statement_list',2,'p_statement_list','parser.py',20),
-  ('statement_list -> statement','statement_list',1,'p_statement_list','parser.py',21),
-  ('statement -> import_table','statement',1,'p_statement','parser.py',28),
-  ('statement -> export_table','statement',1,'p_statement','parser.py',29),
-  ('statement -> discard_table','statement',1,'p_statement','parser.py',30),
-  ('statement -> rename_table','statement',1,'p_statement','parser.py',31),
-  ('statement -> print_table','statement',1,'p_statement','parser.py',32),
-  ('statement -> select_table','statement',1,'p_statement','parser.py',33),
-  ('statement -> create_table_select','statement',1,'p_statement','parser.py',34),
-  ('statement -> create_table_join','statement',1,'p_statement','parser.py',35),
-  ('statement -> create_table_from_select_columns','statement',1,'p_statement','parser.py',36),
-  ('statement -> procedure','statement',1,'p_statement','parser.py',37),
-  ('statement -> call_procedure','statement',1,'p_statement','parser.py',38),
-  ('operator -> EQUALS','operator',1,'p_operator','parser.py',44),
-  ('operator -> NOT_EQUAL','operator',1,'p_operator','parser.py',45),
-  ('operator -> LESS_THAN','operator',1,'p_operator','parser.py',46),
-  ('operator -> GREATER_THAN','operator',1,'p_operator','parser.py',47),
-  ('operator -> LESS_EQUAL','operator',1,'p_operator','parser.py',48),
-  ('operator -> GREATER_EQUAL','operator',1,'p_operator','parser.py',49),
-  ('import_table -> IMPORT TABLE ID FROM STRING SEMICOLON','import_table',6,'p_import_table','parser.py',55),
-  ('export_table -> EXPORT TABLE ID AS STRING SEMICOLON','export_table',6,'p_export_table','parser.py',59),
-  ('discard_table -> DISCARD TABLE ID SEMICOLON','discard_table',4,'p_discard_table','parser.py',63),
-  ('rename_table -> RENAME TABLE ID ID SEMICOLON','rename_table',5,'p_rename_table','parser.py',67),
-  ('print_table -> PRINT TABLE ID SEMICOLON','print_table',4,'p_print_table','parser.py',71),
-  ('select_table -> SELECT STAR FROM ID SEMICOLON','select_table',5,'p_select_table','parser.py',77),
-  ('select_table -> select_columns','select_table',1,'p_select_table','parser.py',78),
-  ('select_table -> select_where','select_table',1,'p_select_table','parser.py',79),
-  ('select_table -> select_where_and','select_table',1,'p_select_table','parser.py',80),
-  ('select_table -> select_limit','select_table',1,'p_select_table','parser.py',81),
-  ('select_table -> select_limit_columns','select_table',1,'p_select_table','parser.py',82),
-  ('select_columns -> SELECT comma_id FROM ID SEMICOLON','select_columns',5,'p_select_columns','parser.py',89),
-  ('select_where -> SELECT STAR FROM ID WHERE condition SEMICOLON','select_where',7,'p_select_where','parser.py',93),
-  ('select_where_and -> SELECT STAR FROM ID WHERE condition and_list SEMICOLON','select_where_and',8,'p_select_where_and','parser.py',97),
-  ('select_limit -> SELECT STAR FROM ID LIMIT NUMBER SEMICOLON','select_limit',7,'p_select_limit','parser.py',101),
-  ('select_limit_columns -> SELECT comma_id FROM ID LIMIT NUMBER SEMICOLON','select_limit_columns',7,'p_select_limit_columns','parser.py',105),
-  ('condition -> ID operator value','condition',3,'p_condition','parser.py',109),
-  ('value -> ID','value',1,'p_value','parser.py',113),
-  ('value -> STRING','value',1,'p_value','parser.py',114),
-  ('value -> NUMBER','value',1,'p_value','parser.py',115),
-  ('and_list -> AND condition','and_list',2,'p_and_list','parser.py',119),
-  ('and_list -> and_list AND condition','and_list',3,'p_and_list','parser.py',120),
-  ('comma_id -> ID COMMA comma_id','comma_id',3,'p_comma_id','parser.py',127),
-  ('comma_id -> ID','comma_id',1,'p_comma_id','parser.py',128),
-  ('create_table_select -> CREATE TABLE ID select_table','create_table_select',4,'p_create_table_select','parser.py',137),
-  ('create_table_join -> CREATE TABLE ID FROM ID JOIN ID USING ID SEMICOLON','create_table_join',10,'p_create_table_join','parser.py',141),
-  ('create_table_from_select_columns -> CREATE TABLE ID SELECT comma_id FROM ID SEMICOLON','create_table_from_select_columns',8,'p_create_table_from_select_columns','parser.py',145),
-  ('procedure -> PROCEDURE ID DO statement_list END SEMICOLON','procedure',6,'p_procedure','parser.py',151),
-  ('call_procedure -> CALL ID SEMICOLON','call_procedure',3,'p_call_procedure','parser.py',155),
+  ('program -> statement_list','program',1,'p_program','parser.py',86),
+  ('statement_list -> statement_list statement','statement_list',2,'p_statement_list','parser.py',90),
+  ('statement_list -> statement','statement_list',1,'p_statement_list','parser.py',91),
+  ('statement -> import_table','statement',1,'p_statement','parser.py',99),
+  ('statement -> export_table','statement',1,'p_statement','parser.py',100),
+  ('statement -> export_query','statement',1,'p_statement','parser.py',101),
+  ('statement -> discard_table','statement',1,'p_statement','parser.py',102),
+  ('statement -> materialize_table','statement',1,'p_statement','parser.py',103),
+  ('statement -> rename_table','statement',1,'p_statement','parser.py',104),
+  ('statement -> print_table','statement',1,'p_statement','parser.py',105),
+  ('statement -> select_table','statement',1,'p_statement','parser.py',106),
+  ('statement -> create_table_select','statement',1,'p_statement','parser.py',107),
+  ('statement -> create_table_join','statement',1,'p_statement','parser.py',108),
+  ('statement -> procedure','statement',1,'p_statement','parser.py',109),
+  ('statement -> call_procedure','statement',1,'p_statement','parser.py',110),
+  ('statement -> create_index','statement',1,'p_statement','parser.py',111),
+  ('statement -> drop_index','statement',1,'p_statement','parser.py',112),
+  ('statement -> explain','statement',1,'p_statement','parser.py',113),
+  ('explain -> EXPLAIN statement','explain',2,'p_explain','parser.py',117),
+  ('explain -> EXPLAIN ANALYZE statement','explain',3,'p_explain','parser.py',118),
+  ('operator -> EQUALS','operator',1,'p_operator','parser.py',127),
+  ('operator -> NOT_EQUAL','operator',1,'p_operator','parser.py',128),
+  ('operator -> LESS_THAN','operator',1,'p_operator','parser.py',129),
+  ('operator -> GREATER_THAN','operator',1,'p_operator','parser.py',130),
+  ('operator -> LESS_EQUAL','operator',1,'p_operator','parser.py',131),
+  ('operator -> GREATER_EQUAL','operator',1,'p_operator','parser.py',132),
+  ('import_table -> IMPORT TABLE ID FROM STRING import_columns where_clause SEMICOLON','import_table',8,'p_import_table','parser.py',138),
+  ('import_table -> IMPORT TABLE ID FROM STRING MAPPED SEMICOLON','import_table',7,'p_import_table','parser.py',139),
+  ('import_columns -> COLUMNS comma_id','import_columns',2,'p_import_columns','parser.py',153),
+  ('import_columns -> empty','import_columns',1,'p_import_columns','parser.py',154),
+  ('export_table -> EXPORT TABLE ID AS STRING SEMICOLON','export_table',6,'p_export_table','parser.py',158),
+  ('export_query -> EXPORT select_query AS STRING SEMICOLON','export_query',5,'p_export_query','parser.py',162),
+  ('discard_table -> DISCARD TABLE ID SEMICOLON','discard_table',4,'p_discard_table','parser.py',166),
+  ('materialize_table -> MATERIALIZE TABLE ID SEMICOLON','materialize_table',4,'p_materialize_table','parser.py',170),
+  ('rename_table -> RENAME TABLE ID ID SEMICOLON','rename_table',5,'p_rename_table','parser.py',174),
+  ('print_table -> PRINT TABLE ID SEMICOLON','print_table',4,'p_print_table','parser.py',178),
+  ('select_table -> select_query SEMICOLON','select_table',2,'p_select_table','parser.py',184),
+  ('select_query -> SELECT projection FROM ID where_clause group_clause order_clause limit_clause','select_query',8,'p_select_query','parser.py',188),
+  ('projection -> STAR','projection',1,'p_projection','parser.py',205),
+  ('projection -> select_list','projection',1,'p_projection','parser.py',206),
+  ('select_list -> select_list COMMA select_item','select_list',3,'p_select_list','parser.py',210),
+  ('select_list -> select_item','select_list',1,'p_select_list','parser.py',211),
+  ('select_item -> ID','select_item',1,'p_select_item','parser.py',219),
+  ('select_item -> aggregate','select_item',1,'p_select_item','parser.py',220),
+  ('aggregate -> aggregate_function LPAREN STAR RPAREN','aggregate',4,'p_aggregate','parser.py',224),
+  ('aggregate -> aggregate_function LPAREN ID RPAREN','aggregate',4,'p_aggregate','parser.py',225),
+  ('aggregate_function -> COUNT','aggregate_function',1,'p_aggregate_function','parser.py',229),
+  ('aggregate_function -> SUM','aggregate_function',1,'p_aggregate_function','parser.py',230),
+  ('aggregate_function -> AVG','aggregate_function',1,'p_aggregate_function','parser.py',231),
+  ('aggregate_function -> MIN','aggregate_function',1,'p_aggregate_function','parser.py',232),
+  ('aggregate_function -> MAX','aggregate_function',1,'p_aggregate_function','parser.py',233),
+  ('where_clause -> WHERE condition','where_clause',2,'p_where_clause','parser.py',237),
+  ('where_clause -> WHERE condition and_list','where_clause',3,'p_where_clause','parser.py',238),
+  ('where_clause -> empty','where_clause',1,'p_where_clause','parser.py',239),
+  ('group_clause -> GROUP BY comma_id','group_clause',3,'p_group_clause','parser.py',248),
+  ('group_clause -> empty','group_clause',1,'p_group_clause','parser.py',249),
+  ('order_clause -> ORDER BY order_list','order_clause',3,'p_order_clause','parser.py',253),
+  ('order_clause -> empty','order_clause',1,'p_order_clause','parser.py',254),
+  ('order_list -> order_list COMMA order_item','order_list',3,'p_order_list','parser.py',258),
+  ('order_list -> order_item','order_list',1,'p_order_list','parser.py',259),
+  ('order_item -> select_item','order_item',1,'p_order_item','parser.py',267),
+  ('order_item -> select_item ASC','order_item',2,'p_order_item','parser.py',268),
+  ('order_item -> select_item DESC','order_item',2,'p_order_item','parser.py',269),
+  ('limit_clause -> LIMIT NUMBER','limit_clause',2,'p_limit_clause','parser.py',274),
+  ('limit_clause -> empty','limit_clause',1,'p_limit_clause','parser.py',275),
+  ('empty -> <empty>','empty',0,'p_empty','parser.py',279),
+  ('condition -> ID operator value','condition',3,'p_condition','parser.py',283),
+  ('value -> ID','value',1,'p_value','parser.py',287),
+  ('value -> STRING','value',1,'p_value','parser.py',288),
+  ('value -> NUMBER','value',1,'p_value','parser.py',289),
+  ('value -> TIMESTAMP STRING','value',2,'p_value_timestamp','parser.py',293),
+  ('and_list -> AND condition','and_list',2,'p_and_list','parser.py',297),
+  ('and_list -> and_list AND condition','and_list',3,'p_and_list','parser.py',298),
+  ('comma_id -> ID COMMA comma_id','comma_id',3,'p_comma_id','parser.py',305),
+  ('comma_id -> ID','comma_id',1,'p_comma_id','parser.py',306),
+  ('create_table_select -> CREATE TABLE ID select_table','create_table_select',4,'p_create_table_select','parser.py',315),
+  ('create_table_join -> CREATE TABLE ID FROM ID JOIN ID USING ID SEMICOLON','create_table_join',10,'p_create_table_join','parser.py',319),
+  ('create_index -> CREATE INDEX ID ON ID LPAREN ID RPAREN SEMICOLON','create_index',9,'p_create_index','parser.py',325),
+  ('drop_index -> DROP INDEX ID SEMICOLON','drop_index',4,'p_drop_index','parser.py',329),
+  ('procedure -> PROCEDURE ID DO statement_list END SEMICOLON','procedure',6,'p_procedure','parser.py',335),
+  ('call_procedure -> CALL ID SEMICOLON','call_procedure',3,'p_call_procedure','parser.py',339),
 ]
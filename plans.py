@@ -0,0 +1,142 @@
+from predicates import prepare_conditions
+from timestamps import Timestamp
+
+
+def freeze(value):
+    """
+    Converte listas e dicionários da AST em tuplos, para que possam ser usados como chave.
+    """
+    if isinstance(value, Timestamp):
+        return 'TIMESTAMP', int(value)     # Diferente do número com o mesmo valor
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class StatementPlan:
+    """
+    Instrução compilada: a instrução original (AST), o método do interpretador que a
+    executa e os seus argumentos. A escolha do comando e a extração dos argumentos são
+    feitas uma só vez, quando a instrução é compilada (ver Interpreter.compile).
+    """
+
+    __slots__ = ('statement', 'kind', 'method', 'args', 'text')
+
+    def __init__(self, statement, method, args):
+        """
+        Atributos:
+            statement (tuple): Instrução na AST.
+            kind (str): Tipo da instrução (p.ex. 'select_where', 'call').
+            method (function): Método (não ligado) do Interpreter que executa a instrução.
+            args (tuple): Argumentos do método.
+            text (str): Texto da instrução, calculado na primeira medição do profiler.
+        """
+        self.statement = statement
+        self.kind = statement[0]
+        self.method = method
+        self.args = args
+        self.text = None
+
+    def execute(self, interpreter):
+        return self.method(interpreter, *self.args)
+
+
+class Procedure:
+    """
+    Procedimento (PROCEDURE ... END): as instruções, tal como foram escritas, e os seus
+    planos compilados no momento da definição, reutilizados em cada CALL.
+    """
+
+    __slots__ = ('name', 'statements', 'plans')
+
+    def __init__(self, name, statements, plans):
+        self.name = name
+        self.statements = statements
+        self.plans = plans
+
+
+class QueryPlan:
+    """
+    SELECT compilado: tabela, colunas e cláusulas, e a sua resolução (Binding) para o
+    esquema (cabeçalho e tipos) da tabela.
+
+    A resolução é feita na primeira execução e reutilizada enquanto o esquema da tabela
+    for o mesmo, mesmo que a tabela seja substituída por outra (p.ex. recriada por um
+    procedimento); se o esquema mudar, o plano é resolvido de novo. Cada resolução é um
+    objeto novo, por isso o plano pode ser executado em várias threads ao mesmo tempo.
+    """
+
+    __slots__ = ('table_name', 'columns', 'where', 'group_by', 'order_by', 'limit', 'aggregates', 'binding',
+                 'key')
+
+    def __init__(self, table_name, columns, clauses):
+        """
+        Atributos:
+            table_name (str): Tabela consultada.
+            columns: '*' ou a lista do SELECT (nomes de colunas e tuplos (função, coluna)).
+            where, group_by, order_by, limit: Cláusulas da consulta.
+            aggregates (bool): A lista do SELECT tem funções de agregação.
+            binding (Binding): Última resolução (None se ainda não foi resolvido).
+            key (tuple): Consulta normalizada (as várias formas de SELECT da AST com o mesmo
+                significado têm a mesma chave), usada na cache de resultados.
+        """
+        if isinstance(columns, str) and columns != '*':
+            columns = [col.strip() for col in columns.split(",")]
+        self.table_name = table_name
+        self.columns = columns
+        self.where = clauses.get('where') or []
+        self.group_by = clauses.get('group_by') or []
+        self.order_by = clauses.get('order_by') or []
+        self.limit = clauses.get('limit') or None
+        self.aggregates = columns != '*' and any(isinstance(col, tuple) for col in columns)
+        self.binding = None
+        self.key = freeze((columns, self.where, self.group_by, self.order_by, self.limit))
+
+    def bind(self, table):
+        """
+        Devolve a resolução do plano para o esquema da tabela (resolvendo-o, se mudou).
+        """
+        binding = self.binding
+        if binding is None or table.header != binding.header or table.types != binding.types:
+            binding = self.binding = Binding(self, table)
+        return binding
+
+
+class Binding:
+    """
+    Resolução de um QueryPlan para um esquema: posições das colunas projetadas e
+    condições do WHERE já preparadas (ver predicates.prepare_conditions).
+    """
+
+    __slots__ = ('where', 'header', 'types', 'positions', 'prepared')
+
+    def __init__(self, plan, table):
+        """
+        Atributos:
+            header, types (list): Esquema para o qual o plano foi resolvido.
+            positions (list): Posições das colunas projetadas (None com agregações).
+            prepared (dict): Condições preparadas, pela posição da condição resolvida por um
+                índice (None se nenhuma): (condições restantes, condições preparadas).
+        """
+        if plan.aggregates:
+            self.positions = None
+        elif plan.columns == '*':
+            self.positions = list(range(len(table.header)))
+        else:
+            self.positions = [table.index(col) for col in plan.columns]
+        self.where = plan.where
+        self.header, self.types = list(table.header), list(table.types)
+        self.prepared = {}
+
+    def conditions(self, table, skip=None):
+        """
+        Devolve (condições, condições preparadas) do WHERE, sem a condição na posição skip
+        (a resolvida por um índice).
+        """
+        entry = self.prepared.get(skip)
+        if entry is None:
+            remaining = self.where if skip is None else self.where[:skip] + self.where[skip + 1:]
+            entry = self.prepared[skip] = (remaining, prepare_conditions(table, remaining))
+        return entry
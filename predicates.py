@@ -0,0 +1,197 @@
+from bisect import bisect_left, bisect_right
+from itertools import compress, repeat, tee
+import operator
+
+from table import STR, TIMESTAMP, TimestampColumn, codes_of, dictionary_of, epochs_of, scan
+from timestamps import Timestamp, format_timestamp, parse_timestamp
+
+
+# Operadores de comparação suportados nas condições WHERE
+OPERATORS = {
+    '=': operator.eq,
+    '<>': operator.ne,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+}
+
+
+def never(cell, val):
+    return False
+
+
+def compile_conditions(table, conditions, prepared=None):
+    """
+    Compila uma lista de condições num filtro sobre as linhas de uma tabela.
+
+    As colunas, o tipo dos literais e a função de cada operador são resolvidos uma só
+    vez por consulta (ou reaproveitados de prepared, ver prepare_conditions). O filtro
+    devolvido recebe um iterável de posições de linhas (por exemplo range(len(table)) ou
+    um bloco range(a, b)) e devolve, de forma preguiçosa, as posições que satisfazem
+    todas as condições, pela mesma ordem.
+    """
+    if prepared is None:
+        prepared = prepare_conditions(table, conditions)
+    filters = [column_filter(table.columns[idx], mask) for idx, mask in prepared]
+
+    def predicate(ids):
+        for keep in filters:
+            ids = keep(ids)
+        return ids
+
+    return predicate
+
+
+def column_filter(column, mask):
+    """
+    Devolve a função que filtra posições de linhas pela máscara de uma condição sobre a coluna.
+
+    Numa coluna codificada por dicionário (ver EncodedColumn) a máscara é avaliada uma só
+    vez para cada texto distinto e as linhas são filtradas pelo código, sem ler o texto.
+    Numa coluna 'timestamp' são comparados diretamente os inteiros; se os instantes
+    estiverem ordenados, uma condição de intervalo passa a uma pesquisa binária.
+    """
+    values = dictionary_of(column)
+    if values is not None and len(values) <= len(column):
+        matches = list(mask(values))
+        codes = codes_of(column)
+        return lambda ids: select(codes, lambda found: map(matches.__getitem__, found), ids)
+    epochs = epochs_of(column)
+    if epochs is not None:
+        window = getattr(mask, 'window', None)
+        if window is not None and isinstance(column, TimestampColumn) and column.is_ordered():
+            bounds = window_bounds(epochs, *window)
+            return lambda ids: within(bounds, ids)
+        column = epochs
+    return lambda ids: select(column, mask, ids)
+
+
+def window_bounds(epochs, op, operand):
+    """
+    Devolve o intervalo (range) de posições de uma coluna ordenada que satisfazem "op operand".
+    """
+    if op == '=':
+        return range(bisect_left(epochs, operand), bisect_right(epochs, operand))
+    if op == '<':
+        return range(bisect_left(epochs, operand))
+    if op == '<=':
+        return range(bisect_right(epochs, operand))
+    if op == '>':
+        return range(bisect_right(epochs, operand), len(epochs))
+    return range(bisect_left(epochs, operand), len(epochs))
+
+
+def within(bounds, ids):
+    """
+    Filtra as posições ids pelas que estão no intervalo bounds.
+    """
+    if isinstance(ids, range) and ids.step == 1:
+        start = max(ids.start, bounds.start)
+        return range(start, max(start, min(ids.stop, bounds.stop)))
+    return filter(bounds.__contains__, ids)
+
+
+def prepare_conditions(table, conditions):
+    """
+    Resolve as condições para o esquema da tabela (cabeçalho e tipos), sem depender dos
+    valores: o resultado serve para qualquer tabela com o mesmo esquema.
+    """
+    return [compile_condition(table, cond) for cond in conditions]
+
+
+def compile_condition(table, cond):
+    """
+    Compila uma condição (col, op, val) ou ('AND', col, op, val).
+
+    Devolve (posição da coluna, máscara), em que máscara transforma um iterável de
+    valores da coluna num iterável de booleanos.
+    """
+    if cond[0] == 'AND':
+        _, col, op, val = cond
+    else:
+        col, op, val = cond
+
+    idx = table.index(col)
+    compare = OPERATORS.get(op, never)
+    if table.types[idx] == TIMESTAMP:
+        return idx, timestamp_mask(op, compare, val)
+    if table.types[idx] == STR:
+        instant = val if isinstance(val, Timestamp) else parse_timestamp(val, dates=True) if isinstance(val, str) else None
+        if instant is not None:
+            return idx, text_timestamp_mask(compare, instant, str(val))
+    if isinstance(val, Timestamp):
+        val = str(val)          # Literal TIMESTAMP numa coluna de outro tipo: compara o texto
+    try:
+        number = float(val)
+    except ValueError:
+        number = None
+
+    if table.types[idx] != STR:
+        if number is None:
+            # Coluna numérica com literal não numérico: compara o texto das células (o texto
+            # original, ver convert_column), como numa coluna de texto
+            return idx, lambda values: map(compare, map(str, values), repeat(val))
+        # Coluna numérica: os valores já estão convertidos, compara diretamente
+        return idx, lambda values: map(compare, values, repeat(number))
+
+    if number is None:
+        # Literal não numérico: comparação direta com o texto da célula
+        return idx, lambda values: map(compare, values, repeat(val))
+
+    # Coluna de texto com literal numérico: só a célula precisa de conversão; as células
+    # não numéricas comparam-se com o texto do literal
+    text = str(val)
+
+    def test(cell):
+        try:
+            return compare(float(cell), number)
+        except ValueError:
+            return compare(cell, text)
+
+    return idx, lambda values: map(test, values)
+
+
+def timestamp_mask(op, compare, val):
+    """
+    Máscara de uma condição sobre uma coluna 'timestamp'. O literal (TIMESTAMP "...", texto
+    ISO-8601 ou só a data) é convertido num instante e comparado com os inteiros; um
+    literal que não seja um instante é comparado com o texto normalizado de cada valor.
+    """
+    if isinstance(val, str):
+        operand = parse_timestamp(val, dates=True)
+    else:
+        operand = val
+    if operand is None:
+        return lambda values: map(compare, map(format_timestamp, values), repeat(val))
+
+    def mask(values):
+        return map(compare, values, repeat(operand))
+
+    if op in ('=', '<', '<=', '>', '>='):
+        mask.window = (op, operand)
+    return mask
+
+
+def text_timestamp_mask(compare, instant, text):
+    """
+    Máscara de uma condição sobre uma coluna de texto cujo literal é um instante: as
+    células que são datas e horas ISO-8601 comparam-se como instantes, como numa coluna
+    'timestamp' (é o caso das colunas de uma MappedTable, sempre de texto); as restantes
+    comparam-se com o texto do literal.
+    """
+    def test(cell):
+        seconds = parse_timestamp(cell)
+        return compare(cell, text) if seconds is None else compare(seconds, instant)
+
+    return lambda values: map(test, values)
+
+
+def select(column, mask, ids):
+    """
+    Filtra as posições ids pelos valores correspondentes da coluna.
+    """
+    if isinstance(ids, range) and ids.step == 1:
+        return compress(ids, mask(scan(column, ids.start, ids.stop)))
+    ids, probe = tee(ids)
+    return compress(ids, mask(map(column.__getitem__, probe)))
@@ -0,0 +1,134 @@
+from contextlib import contextmanager
+import time
+import tracemalloc
+
+
+def counted(ids, done):
+    """
+    Itera as posições ids e, quando se esgotam, chama done(número de posições, última posição).
+    """
+    count, last = 0, None
+    for last in ids:
+        count += 1
+        yield last
+    done(count, last)
+
+
+class StatementProfile:
+    """
+    Medições da execução de uma instrução: tempo de parede, linhas lidas das tabelas de
+    origem, linhas produzidas (impressas, exportadas ou guardadas) e pico de memória
+    alocada. As instruções executadas dentro de um CALL ficam em children.
+    """
+
+    __slots__ = ('statement', 'kind', 'seconds', 'rows_scanned', 'rows_produced', 'peak_bytes',
+                 'children', 'base', 'peak')
+
+    def __init__(self, statement, kind):
+        """
+        Atributos:
+            statement (str): Texto da instrução.
+            kind (str): Tipo da instrução na AST (p.ex. 'select_where', 'call').
+            seconds (float): Tempo de parede da execução.
+            rows_scanned (int): Linhas lidas das tabelas de origem.
+            rows_produced (int): Linhas do resultado.
+            peak_bytes (int): Pico de memória alocada durante a execução, acima da memória inicial (None sem tracemalloc).
+            children (list): Medições das instruções executadas por esta (CALL).
+        """
+        self.statement = statement
+        self.kind = kind
+        self.seconds = 0.0
+        self.rows_scanned = 0
+        self.rows_produced = 0
+        self.peak_bytes = None
+        self.children = []
+        self.base = self.peak = 0
+
+    def as_dict(self):
+        """
+        Devolve as medições como um dicionário (com as das instruções filhas em 'children').
+        """
+        return {
+            'statement': self.statement,
+            'kind': self.kind,
+            'seconds': self.seconds,
+            'rows_scanned': self.rows_scanned,
+            'rows_produced': self.rows_produced,
+            'peak_bytes': self.peak_bytes,
+            'children': [child.as_dict() for child in self.children],
+        }
+
+    def lines(self, depth=0):
+        """
+        Formata as medições (e as das instruções filhas, indentadas) para o EXPLAIN ANALYZE.
+        """
+        memory = '' if self.peak_bytes is None else f", peak {self.peak_bytes / 1024:.1f} KiB"
+        text = (f"{'  ' * depth}{self.statement}: {self.seconds * 1000:.3f} ms, "
+                f"{self.rows_scanned} rows scanned, {self.rows_produced} rows produced{memory}")
+        lines = [text]
+        for child in self.children:
+            lines.extend(child.lines(depth + 1))
+        return lines
+
+
+class Profiler:
+    """
+    Recolhe um StatementProfile por instrução executada pelo interpretador.
+
+    As contagens de linhas são acumuladas na instrução em curso e nas que a contêm (um
+    CALL soma as linhas das suas instruções). Com memory=True o pico de memória é medido
+    com tracemalloc, o que torna a execução mais lenta.
+    """
+
+    def __init__(self, memory=True):
+        """
+        Atributos:
+            records (list): Medições das instruções de topo, pela ordem de execução.
+            memory (bool): Mede também o pico de memória.
+        """
+        self.records = []
+        self.memory = memory
+        self.stack = []
+
+    @contextmanager
+    def measure(self, statement, kind):
+        """
+        Mede a execução do bloco como uma instrução; devolve o StatementProfile.
+        """
+        record = StatementProfile(statement, kind)
+        (self.stack[-1].children if self.stack else self.records).append(record)
+        owns_tracing = self.memory and not tracemalloc.is_tracing()
+        if owns_tracing:
+            tracemalloc.start()
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.stack:
+                # O pico até aqui pertence à instrução que contém esta
+                self.stack[-1].peak = max(self.stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            record.base = record.peak = current
+        self.stack.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            self.stack.pop()
+            if self.memory:
+                peak = max(record.peak, tracemalloc.get_traced_memory()[1])
+                record.peak_bytes = peak - record.base
+                if self.stack:
+                    self.stack[-1].peak = max(self.stack[-1].peak, peak)
+                if owns_tracing:
+                    tracemalloc.stop()
+
+    def note(self, scanned=0, produced=0):
+        """
+        Soma linhas lidas e produzidas à instrução em curso e às que a contêm.
+        """
+        for record in self.stack:
+            record.rows_scanned += scanned
+            record.rows_produced += produced
+
+    def clear(self):
+        self.records = []
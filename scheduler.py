@@ -0,0 +1,227 @@
+from contextlib import redirect_stdout
+import os
+import sys
+import threading
+
+
+# Instruções que escrevem resultados (no stdout ou no ficheiro do ResultWriter)
+OUTPUT_KINDS = ('print', 'select_table', 'select_columns', 'select_where', 'select_where_and',
+                'select_limit', 'select_limit_columns', 'select_query', 'explain')
+
+
+class OrderedOutput:
+    """
+    Substitui o sys.stdout enquanto o Scheduler executa um script: a saída de cada
+    instrução é escrita pela ordem original do script, qualquer que seja a ordem pela
+    qual as instruções terminam.
+
+    A instrução mais antiga ainda por terminar escreve diretamente no stream; as
+    seguintes acumulam a sua saída, que é escrita quando chega a sua vez. A saída das
+    instruções posteriores a uma que falhou é descartada, como se não tivessem sido executadas.
+    """
+
+    def __init__(self, stream, count):
+        self.stream = stream
+        self.buffers = [[] for _ in range(count)]
+        self.finished = [False] * count
+        self.head = 0
+        self.stop = count
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def write(self, text):
+        k = getattr(self.local, 'k', None)
+        with self.lock:
+            if k is None or k == self.head:
+                self.stream.write(text)
+            elif k < self.stop:
+                self.buffers[k].append(text)
+        return len(text)
+
+    def flush(self):
+        with self.lock:
+            self.stream.flush()
+
+    def finish(self, k, failed=False):
+        """
+        Marca a instrução k como terminada e escreve a saída acumulada das seguintes, até
+        à próxima ainda em execução.
+        """
+        with self.lock:
+            self.finished[k] = True
+            if failed:
+                self.stop = min(self.stop, k + 1)
+            while self.head < self.stop and self.finished[self.head]:
+                self.head += 1
+                if self.head < self.stop:
+                    self.stream.write(''.join(self.buffers[self.head]))
+                    self.buffers[self.head] = []
+
+
+class Scheduler:
+    """
+    Execução paralela das instruções de um script, respeitando as dependências entre elas.
+
+    Para cada instrução são determinados os recursos que lê e os que altera (tabelas,
+    ficheiros, procedimentos e índices; um CALL usa os das instruções do procedimento).
+    Uma instrução só começa depois de todas as anteriores com que entra em conflito (uma
+    altera um recurso que a outra lê ou altera); as independentes correm em simultâneo,
+    em threads. Instruções cujo efeito não se consegue prever (p.ex. EXPLAIN ANALYZE, ou
+    um CALL de um procedimento desconhecido) executam sozinhas.
+
+    A saída é escrita pela ordem do script (ver OrderedOutput). Se uma instrução falhar,
+    as anteriores terminam, não são iniciadas mais nenhumas e o erro é propagado; as
+    posteriores que já tinham começado terminam, mas a sua saída é descartada.
+    """
+
+    def __init__(self, interpreter, workers):
+        """
+        Atributos:
+            interpreter (Interpreter): Interpretador que executa as instruções.
+            workers (int): Número máximo de instruções executadas em simultâneo.
+        """
+        self.interpreter = interpreter
+        self.workers = workers
+
+    # --------- Análise ---------
+
+    def access(self, statement, procedures, calling=()):
+        """
+        Devolve (recursos lidos, recursos alterados) pela instrução, ou None se não for
+        possível saber (a instrução tem então de executar sozinha). procedures tem as
+        instruções de cada procedimento conhecido.
+        """
+        kind = statement[0]
+        table = lambda name: ('table', name)
+        path = lambda name: ('file', os.path.abspath(name))
+        if kind == 'import':
+            return {path(statement[2])}, {table(statement[1])}
+        if kind == 'export':
+            return {table(statement[1])}, {path(statement[2])}
+        if kind == 'export_query':
+            return {table(self.interpreter.query_parts(statement[1])[0])}, {path(statement[2])}
+        if kind in ('discard', 'materialize'):
+            return set(), {table(statement[1])}
+        if kind == 'rename':
+            return set(), {table(statement[1]), table(statement[2])}
+        if kind == 'print':
+            return {table(statement[1])}, set()
+        if kind in OUTPUT_KINDS and kind != 'explain':
+            return {table(self.interpreter.query_parts(statement)[0])}, set()
+        if kind == 'create_from_query':
+            return {table(self.interpreter.query_parts(statement[2])[0])}, {table(statement[1])}
+        if kind == 'create_join':
+            return {table(statement[2]), table(statement[3])}, {table(statement[1])}
+        if kind == 'create_select_columns':
+            return {table(statement[3])}, {table(statement[1])}
+        if kind == 'create_index':
+            return {table(statement[2])}, {('index', statement[1])}
+        if kind == 'drop_index':
+            return set(), {('index', statement[1])}
+        if kind == 'procedure':
+            return set(), {('procedure', statement[1])}
+        if kind == 'call':
+            name = statement[1]
+            if name not in procedures or name in calling:
+                return None
+            reads, writes = {('procedure', name)}, set()
+            for child in procedures[name]:
+                child_access = self.access(child, procedures, calling + (name,))
+                if child_access is None:
+                    return None
+                reads |= child_access[0]
+                writes |= child_access[1]
+            return reads, writes
+        if kind == 'explain' and not statement[2]:
+            inner = self.access(statement[1], procedures, calling)
+            return None if inner is None else (inner[0] | inner[1], set())
+        return None
+
+    def dependencies(self, statements):
+        """
+        Devolve, para cada instrução, as posições das instruções anteriores de que depende.
+        """
+        procedures = {name: procedure.statements for name, procedure in self.interpreter.procedures.items()}
+        accesses = []
+        for statement in statements:
+            if statement[0] == 'procedure':
+                procedures[statement[1]] = statement[2]
+            access = self.access(statement, procedures)
+            if access is not None and self.interpreter.writer.file is not None and self.writes_output(statement, procedures):
+                # Resultados num ficheiro partilhado: as instruções que escrevem seguem a ordem do script
+                access = (access[0], access[1] | {('output',)})
+            accesses.append(access)
+        dependencies = []
+        for j, current in enumerate(accesses):
+            depends = set()
+            for i in range(j):
+                earlier = accesses[i]
+                if (current is None or earlier is None or earlier[1] & (current[0] | current[1])
+                        or current[1] & earlier[0]):
+                    depends.add(i)
+            dependencies.append(depends)
+        return dependencies
+
+    def writes_output(self, statement, procedures, calling=()):
+        if statement[0] in OUTPUT_KINDS:
+            return True
+        if statement[0] == 'call' and statement[1] in procedures and statement[1] not in calling:
+            return any(self.writes_output(child, procedures, calling + (statement[1],))
+                       for child in procedures[statement[1]])
+        return False
+
+    # --------- Execução ---------
+
+    def run(self, statements):
+        """
+        Executa as instruções (já analisadas) de um script.
+        """
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+        interpreter = self.interpreter
+        plans = interpreter.compile_script(statements)
+        if interpreter.profiler is not None:
+            # As medições do profiler assumem uma instrução de cada vez
+            for plan in plans:
+                interpreter.run(plan)
+            return
+        dependencies = self.dependencies(statements)
+        dependents = [[] for _ in statements]
+        for j, depends in enumerate(dependencies):
+            for i in depends:
+                dependents[i].append(j)
+        waiting = [len(depends) for depends in dependencies]
+        output = OrderedOutput(sys.stdout, len(statements))
+        errors = {}
+
+        def work(k):
+            output.local.k = k
+            try:
+                interpreter.run(plans[k])
+            finally:
+                output.local.k = None
+
+        offload = interpreter.offload_reads
+        interpreter.offload_reads = True
+        try:
+            with ThreadPoolExecutor(self.workers) as pool, redirect_stdout(output):
+                running = {pool.submit(work, k): k for k in range(len(statements)) if not waiting[k]}
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        k = running.pop(future)
+                        error = future.exception()
+                        if error is not None:
+                            errors[k] = error
+                        output.finish(k, failed=error is not None)
+                        if error is not None:
+                            continue
+                        # Depois de um erro, só as instruções anteriores a ele continuam a ser iniciadas
+                        stop = min(errors, default=len(statements))
+                        for j in dependents[k]:
+                            waiting[j] -= 1
+                            if not waiting[j] and j < stop:
+                                running[pool.submit(work, j)] = j
+        finally:
+            interpreter.offload_reads = offload
+        if errors:
+            raise errors[min(errors)]
@@ -0,0 +1,120 @@
+import io
+import os
+import socketserver
+import stat
+import sys
+import threading
+
+from scheduler import Scheduler
+from writer import ThreadOutput, redirected
+
+
+# Separa a saída do script do estado final enviado ao cliente: "\0OK\n" ou "\0ERROR mensagem\n"
+TRAILER = '\0'
+
+
+class Handler(socketserver.StreamRequestHandler):
+    """
+    Uma ligação ao servidor: lê o script até o cliente fechar o seu lado da ligação,
+    executa-o e devolve a saída à medida que é produzida, seguida do estado final.
+    """
+
+    def handle(self):
+        script = self.rfile.read().decode('utf-8')
+        output = io.TextIOWrapper(self.wfile, encoding='utf-8', newline='')
+        try:
+            with redirected(output):
+                self.server.execute(script)
+        except Exception as e:
+            status = f"ERROR {e}"
+        else:
+            status = "OK"
+        try:
+            output.write(f"{TRAILER}{status}\n")
+            output.detach()             # Escreve o que falta sem fechar o socket
+        except OSError:
+            pass                        # O cliente desligou-se antes do fim
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Servidor de consultas num socket Unix local, com o catálogo (tabelas, procedimentos e
+    índices) sempre carregado em memória: cada script recebido é executado sobre as
+    tabelas já importadas, sem arrancar um novo processo nem reconstruir o parser.
+
+    Cada ligação é tratada numa thread, sobre uma cópia do catálogo publicado
+    (Interpreter.snapshot), por isso vê sempre um estado consistente:
+        - Scripts só de leitura (SELECT, PRINT, EXPORT, ...) executam em simultâneo, cada
+          um sobre o catálogo publicado quando começou; não são afetados por alterações
+          feitas entretanto.
+        - Scripts que alteram o catálogo (IMPORT, CREATE, DISCARD, RENAME, PROCEDURE, ...)
+          executam um de cada vez e as suas alterações só são publicadas, todas de uma vez,
+          quando o script termina sem erros; se falhar, nenhuma é publicada.
+    A saída de cada script (instruções e resultados) é enviada apenas ao seu cliente.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path, interpreter):
+        """
+        Atributos:
+            path (str): Caminho do socket (substituído, se já existir um socket nesse caminho).
+            interpreter (Interpreter): Interpretador cujo catálogo é publicado; é substituído
+                pela cópia alterada no fim de cada script de escrita.
+            write_lock (threading.Lock): Serializa os scripts que alteram o catálogo.
+        """
+        if interpreter.writer.file is not None:
+            raise ValueError("Server results cannot be written to a file")
+        if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+        self.path = path
+        self.interpreter = interpreter
+        self.write_lock = threading.Lock()
+        super().__init__(path, Handler)
+
+    def execute(self, script):
+        """
+        Executa um script sobre uma cópia do catálogo publicado (e publica-a, se o script o alterar).
+        """
+        published = self.interpreter
+        statements = published.parse(script)
+        if self.read_only(published, statements):
+            session = published.snapshot()
+            for statement in statements:
+                session.execute(statement)
+            return
+        with self.write_lock:
+            session = self.interpreter.snapshot()
+            for statement in statements:
+                session.execute(statement)
+            self.interpreter = session
+
+    def read_only(self, interpreter, statements):
+        """
+        Indica se as instruções não alteram o catálogo: só podem escrever ficheiros (ver
+        Scheduler.access). Na dúvida (p.ex. EXPLAIN ANALYZE), o script é tratado como escrita.
+        """
+        scheduler = Scheduler(interpreter, 1)
+        procedures = {name: procedure.statements for name, procedure in interpreter.procedures.items()}
+        for statement in statements:
+            access = scheduler.access(statement, procedures)
+            if access is None or any(resource[0] != 'file' for resource in access[1]):
+                return False
+        return True
+
+    def serve_forever(self, poll_interval=0.5):
+        """
+        Atende ligações até shutdown(). Enquanto o servidor corre, o sys.stdout é um
+        ThreadOutput, para que cada ligação escreva no seu próprio socket.
+        """
+        stdout = sys.stdout
+        sys.stdout = ThreadOutput(stdout)
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            sys.stdout = stdout
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
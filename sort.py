@@ -0,0 +1,141 @@
+from array import array
+from heapq import merge, nsmallest
+from itertools import chain, islice
+
+from table import STR, codes_of, comparable, dictionary_of, text_key
+
+
+# Número máximo de linhas ordenadas em memória; acima disto é usada a ordenação externa
+SORT_BUFFER = 1_000_000
+
+# Posições lidas de cada vez de um bloco ordenado, na intercalação
+RUN_BATCH = 4096
+
+
+class Descending:
+    """
+    Envolve a chave de um valor de texto invertendo a comparação, para as chaves DESC de
+    uma chave composta (os valores numéricos são simplesmente negados).
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+
+def column_key(table, idx):
+    """
+    Devolve a função que dá a chave de ordenação de uma linha (pela posição) numa coluna,
+    e se essa chave é numérica (pode ser negada nas chaves DESC).
+
+    Numa coluna de texto as chaves são as de text_key, as mesmas comparações do WHERE (p.ex.
+    os números escritos como texto ordenam pelo valor); numa coluna codificada são calculadas
+    uma vez por texto distinto e cada linha é ordenada pela posição do seu texto nessa ordem.
+    """
+    column = table.columns[idx]
+    if table.types[idx] != STR:
+        codes = comparable(column)
+        return (column if codes is None else codes).__getitem__, True
+    values = dictionary_of(column)
+    if values is None:
+        return lambda i: text_key(column[i]), False
+    codes = codes_of(column)
+    order = sorted(range(len(values)), key=lambda code: text_key(values[code]))
+    if order == list(range(len(values))):
+        return codes.__getitem__, True     # P.ex. só textos não numéricos: os códigos já estão por esta ordem
+    rank = array('l', [0]) * len(values)
+    for position, code in enumerate(order):
+        rank[code] = position
+    return lambda i: rank[codes[i]], True
+
+
+def key_function(table, keys):
+    """
+    Constrói a função que devolve a chave composta de uma linha (pela posição) para
+    uma lista de chaves (coluna, descendente).
+    """
+    parts = []
+    for column, descending in keys:
+        get, numeric = column_key(table, table.index(column))
+        if not descending:
+            parts.append(get)
+        elif numeric:
+            parts.append(lambda i, get=get: -get(i))
+        else:
+            parts.append(lambda i, get=get: Descending(get(i)))
+    if len(parts) == 1:
+        return parts[0]
+    return lambda i: tuple(part(i) for part in parts)
+
+
+def sort_ids(table, ids, keys, limit=None, buffer=SORT_BUFFER):
+    """
+    Ordena as posições ids (todas se None) pelas chaves [(coluna, descendente), ...] e
+    devolve-as como iterável. A ordenação é estável: linhas com chaves iguais mantêm a
+    ordem da tabela.
+
+    Com limit, só as primeiras limit posições são mantidas num heap (O(N log limit));
+    sem limit, até buffer linhas são ordenadas em memória e acima disso é feita uma
+    ordenação externa (blocos ordenados em ficheiros temporários, depois intercalados).
+    """
+    for column, _ in keys:
+        if column not in table.header:
+            raise ValueError(f"Column {column} does not exist")
+    if ids is None:
+        ids = range(len(table))
+    if limit is not None:
+        return nsmallest(int(limit), ids, key=key_function(table, keys))
+    ids = iter(ids)
+    first = list(islice(ids, buffer + 1))
+    if len(first) <= buffer:
+        return sort_in_memory(table, first, keys)
+    return external_sort(table, chain(first, ids), keys, buffer)
+
+
+def sort_in_memory(table, ids, keys):
+    """
+    Ordenação estável em memória, uma passagem por chave, da última para a primeira.
+    """
+    for column, descending in reversed(keys):
+        ids.sort(key=column_key(table, table.index(column))[0], reverse=descending)
+    return ids
+
+
+def external_sort(table, ids, keys, buffer):
+    """
+    Ordenação externa: cada bloco de buffer posições é ordenado em memória e escrito
+    num ficheiro temporário; os blocos são depois intercalados, calculando as chaves à
+    medida que são lidos. Como os blocos seguem a ordem da tabela e o merge desempata
+    pelo bloco, o resultado é estável.
+    """
+    import tempfile     # Importado só aqui, para não atrasar o arranque do interpretador
+    runs = []
+    while True:
+        block = list(islice(ids, buffer))
+        if not block:
+            break
+        run = tempfile.TemporaryFile()
+        run.write(array('q', sort_in_memory(table, block, keys)).tobytes())
+        run.seek(0)
+        runs.append(run)
+    return merge(*map(read_run, runs), key=key_function(table, keys))
+
+
+def read_run(run):
+    """
+    Lê as posições de um bloco ordenado, RUN_BATCH de cada vez, e fecha o ficheiro no fim.
+    """
+    with run:
+        while True:
+            batch = array('q')
+            batch.frombytes(run.read(RUN_BATCH * batch.itemsize))
+            if not batch:
+                return
+            yield from batch
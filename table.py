@@ -0,0 +1,726 @@
+from array import array
+from itertools import islice, repeat, tee
+from operator import eq, itemgetter
+import math
+
+from timestamps import STAMPS, VARIED, parse_timestamp, stamp, timestamp_layout
+
+
+# Tipos de coluna inferidos na importação
+INT = 'int'
+FLOAT = 'float'
+STR = 'str'
+TIMESTAMP = 'timestamp'
+
+
+# Número máximo de valores distintos de uma coluna de texto codificada por dicionário (ver EncodedColumn)
+MAX_CODES = 65536
+
+
+def convert_column(values):
+    """
+    Infere o tipo de uma coluna de textos e devolve (tipo, coluna).
+
+    Uma coluna é 'int' se todos os valores forem inteiros e 'float' se forem todos números
+    (reais, ou inteiros e reais misturados, ver NumberColumn), e fica guardada num array
+    compacto; caso contrário é 'str' e fica numa lista de strings. A conversão só é aceite
+    se for reversível (str(valor) == texto), para que PRINT e EXPORT escrevam o texto
+    original; valores não finitos e o zero negativo ficam como texto, para que a igualdade
+    entre valores seja a mesma que entre os textos.
+
+    As datas e horas ISO-8601 também são convertidas: uma coluna em que todos os valores o
+    sejam é 'timestamp' (ver TimestampColumn), e as várias escritas do mesmo instante
+    ('2025-04-10T19:00', '2025-04-10 19:00:00') são iguais, mas cada valor continua a ser
+    escrito como no ficheiro.
+    """
+    # Cada texto distinto é convertido e verificado uma só vez
+    distinct = set(values)
+    if distinct:
+        try:
+            parsed = {text: int(text) for text in distinct}
+        except ValueError:
+            parsed = None
+        if parsed is not None and all(map(eq, map(str, parsed.values()), parsed)):
+            try:
+                return INT, array('q', map(parsed.__getitem__, values))
+            except OverflowError:
+                pass
+        column = convert_reals(values, distinct)
+        if column is not None:
+            return FLOAT, column
+        parsed = {}
+        for text in distinct:
+            parsed[text] = parse_timestamp(text)
+            if parsed[text] is None:
+                break
+        else:
+            return TIMESTAMP, TimestampColumn(array('q', map(parsed.__getitem__, values)), layouts_of(values))
+    return STR, list(values)
+
+
+def convert_reals(values, distinct):
+    """
+    Converte uma coluna de números para 'float': um array se todos os textos forem reais
+    (escritos como repr), uma NumberColumn se também houver inteiros, ou None se algum texto
+    não for um número que se possa escrever de volta.
+
+    Uma coluna com inteiros e também reais de valor inteiro ('100' e '100.0') fica None:
+    só o texto os distingue.
+    """
+    try:
+        parsed = {text: float(text) for text in distinct}
+    except ValueError:
+        return None
+    if '-0.0' in parsed or not all(map(math.isfinite, parsed.values())):
+        return None
+    if all(map(eq, map(repr, parsed.values()), parsed)):
+        return array('d', map(parsed.__getitem__, values))
+    for text, value in parsed.items():
+        if repr(value) == text:
+            if value.is_integer():
+                return None
+        elif not value.is_integer() or str(int(value)) != text:
+            return None
+    return NumberColumn(array('d', map(parsed.__getitem__, values)))
+
+
+def merge_numbers(column, chunk):
+    """
+    Acrescenta a uma coluna numérica os valores de um bloco também numérico e devolve a
+    coluna resultante, do tipo que convert_column daria aos dois juntos ('int' só se ambos
+    o forem, 'float' caso contrário), ou None se a coluna tiver de passar a 'str'.
+    """
+    if isinstance(column, array) and isinstance(chunk, array) and column.typecode == chunk.typecode:
+        column.extend(chunk)
+        return column
+    left, right = as_reals(column), as_reals(chunk)
+    if left is None or right is None:
+        return None
+    (values, integers), (more, more_integers) = left, right
+    if integers != more_integers and any(map(float.is_integer, more if integers else values)):
+        return None     # Inteiros e reais de valor inteiro (ver convert_reals)
+    values.extend(more)
+    return NumberColumn(values)
+
+
+def as_reals(column):
+    """
+    Devolve (array 'd' com os valores, se há valores escritos como inteiros) de uma coluna
+    numérica, ou None se algum inteiro não for exato como real.
+    """
+    if isinstance(column, NumberColumn):
+        return column.values, True
+    if column.typecode == 'd':
+        return column, False
+    values = array('d', column)
+    return (values, True) if all(map(eq, values, column)) else None
+
+
+def number(value):
+    """
+    Valor lido de uma NumberColumn: int se o valor for inteiro (foi escrito como inteiro).
+    """
+    return int(value) if value.is_integer() else value
+
+
+def layouts_of(values):
+    """
+    Devolve a forma de escrita dos textos de uma coluna 'timestamp' (ver timestamp_layout):
+    um só número se todos estiverem escritos da mesma forma, ou um array com a de cada texto.
+    """
+    if len(set(map(len, values))) == 1 and len(set(map(itemgetter(10), values))) == 1:
+        return timestamp_layout(values[0])
+    return array('B', map(timestamp_layout, values))
+
+
+def scan(column, start, stop):
+    """
+    Itera sequencialmente os valores de uma coluna entre as posições start e stop.
+    """
+    if isinstance(column, (array, list)):
+        return islice(column, start, stop)
+    return column.scan(start, stop)
+
+
+def take(column, ids):
+    """
+    Devolve uma nova coluna, do mesmo tipo de armazenamento, com os valores nas posições dadas.
+    """
+    if isinstance(column, (EncodedColumn, TimestampColumn, NumberColumn)):
+        return column.take(ids)
+    values = map(column.__getitem__, ids)
+    if isinstance(column, array):
+        return array(column.typecode, values)
+    return list(values)
+
+
+def gather(column, ids):
+    """
+    Itera os valores de uma coluna nas posições ids.
+    """
+    if isinstance(column, EncodedColumn):
+        return map(column.values.__getitem__, map(column.codes.__getitem__, ids))
+    if isinstance(column, TimestampColumn) and isinstance(column.layouts, int):
+        return map(STAMPS[column.layouts], map(column.epochs.__getitem__, ids))
+    if isinstance(column, NumberColumn):
+        return map(number, map(column.values.__getitem__, ids))
+    return map(column.__getitem__, ids)
+
+
+def codes_of(column):
+    """
+    Devolve os códigos de uma coluna codificada por dicionário (ou de uma vista sobre ela),
+    que se comparam entre si como os textos, ou None se a coluna não for codificada.
+    """
+    if isinstance(column, EncodedColumn):
+        return column.codes
+    if isinstance(column, ViewColumn) and isinstance(column.column, EncodedColumn):
+        return ViewColumn(column.column.codes, column.ids)
+    return None
+
+
+def epochs_of(column):
+    """
+    Devolve os instantes, como inteiros, de uma coluna 'timestamp' (ou de uma vista sobre
+    ela), ou None se a coluna não for desse tipo.
+    """
+    if isinstance(column, TimestampColumn):
+        return column.epochs
+    if isinstance(column, ViewColumn) and isinstance(column.column, TimestampColumn):
+        return ViewColumn(column.column.epochs, column.ids)
+    return None
+
+
+def numbers_of(column):
+    """
+    Devolve o array de reais de uma NumberColumn (ou de uma vista sobre ela), ou None.
+    """
+    if isinstance(column, NumberColumn):
+        return column.values
+    if isinstance(column, ViewColumn) and isinstance(column.column, NumberColumn):
+        return ViewColumn(column.column.values, column.ids)
+    return None
+
+
+def comparable(column):
+    """
+    Devolve uma coluna de números que se comparam entre si como os valores da coluna dada
+    (códigos de uma coluna codificada, instantes de uma coluna 'timestamp', reais de uma
+    NumberColumn), ou None.
+    """
+    for of in (codes_of, epochs_of, numbers_of):
+        found = of(column)
+        if found is not None:
+            return found
+    return None
+
+
+def dictionary_of(column):
+    """
+    Devolve os textos distintos, ordenados, de uma coluna codificada (ou de uma vista sobre ela), ou None.
+    """
+    if isinstance(column, ViewColumn):
+        column = column.column
+    return column.values if isinstance(column, EncodedColumn) else None
+
+
+def text_key(cell):
+    """
+    Chave de comparação de um valor de uma coluna de texto, coerente com o WHERE (ver
+    predicates.compile_condition): os números comparam-se pelo valor, as datas e horas
+    ISO-8601 pelo instante e os restantes textos entre si. Os números vêm antes dos
+    instantes e estes antes dos outros textos.
+    """
+    try:
+        number = float(cell)
+    except ValueError:
+        seconds = parse_timestamp(cell)
+        return (2, cell) if seconds is None else (1, seconds)
+    return (0, number) if number == number else (2, cell)     # NaN não se ordena: fica como texto
+
+
+class TableBuilder:
+    """
+    Constrói uma Table bloco a bloco, convertendo cada bloco de linhas de texto para o
+    armazenamento por colunas assim que é recebido.
+
+    O tipo de cada coluna é inferido com o primeiro bloco e revisto nos seguintes: se um
+    valor posterior não couber no tipo atual, a coluna passa a 'str' (os valores já
+    convertidos voltam a texto sem perda), ou a 'float' se for uma coluna 'int' com reais
+    (ver merge_numbers). O resultado é o mesmo que inferir o tipo sobre
+    o ficheiro inteiro, mas só um bloco de strings está em memória de cada vez.
+
+    As colunas de texto são codificadas por dicionário à medida que são lidas (ver
+    EncodedColumn); uma coluna que passe de MAX_CODES valores distintos volta a ser uma
+    lista de strings.
+    """
+
+    def __init__(self, header):
+        self.header = list(header or [])
+        self.types = [None] * len(self.header)
+        self.columns = [None] * len(self.header)
+        self.lookups = [None] * len(self.header)    # Código de cada texto, nas colunas codificadas
+
+    def append(self, rows, positions=None):
+        """
+        Acrescenta um bloco de linhas (listas de strings) à tabela. Com positions, a coluna
+        j da tabela é a célula na posição positions[j] de cada linha (as restantes células
+        não são convertidas).
+        """
+        if positions is None:
+            positions = range(len(self.header))
+        width = max(positions, default=-1) + 1
+        if not rows or not width:
+            return
+        if min(map(len, rows)) < width:
+            rows = [row + [''] * (width - len(row)) for row in rows]
+        targets = {}
+        for j, i in enumerate(positions):
+            targets.setdefault(i, []).append(j)
+        for i, values in enumerate(islice(zip(*rows), width)):
+            for j in targets.get(i, ()):
+                self.extend(j, values)
+
+    def extend(self, j, values):
+        kind = self.types[j]
+        if kind is None:
+            self.types[j], self.columns[j] = convert_column(values)
+            if self.types[j] == STR:
+                self.start_encoding(j, [])
+                self.encode(j, values)
+            return
+        if kind != STR:
+            chunk_kind, chunk = convert_column(values)
+            if chunk_kind == kind == TIMESTAMP:
+                self.columns[j].extend(chunk)
+                return
+            if kind in (INT, FLOAT) and chunk_kind in (INT, FLOAT):
+                merged = merge_numbers(self.columns[j], chunk)
+                if merged is not None:
+                    self.types[j], self.columns[j] = (INT if kind == chunk_kind == INT else FLOAT), merged
+                    return
+            self.types[j] = STR
+            self.start_encoding(j, list(map(str, self.columns[j])))
+        if self.lookups[j] is not None:
+            self.encode(j, values)
+        else:
+            self.columns[j].extend(values)
+
+    def start_encoding(self, j, texts):
+        self.lookups[j] = {}
+        self.columns[j] = array('B')
+        self.encode(j, texts)
+
+    def encode(self, j, values):
+        """
+        Acrescenta textos à coluna codificada j (códigos pela ordem de aparição, ordenados
+        em build), ou passa-a a lista de strings se ultrapassar MAX_CODES valores distintos.
+        """
+        lookup, codes = self.lookups[j], self.columns[j]
+        for text in set(values).difference(lookup):
+            lookup[text] = len(lookup)
+        if len(lookup) > MAX_CODES:
+            texts = list(lookup)
+            self.columns[j] = list(map(texts.__getitem__, codes))
+            self.columns[j].extend(values)
+            self.lookups[j] = None
+            return
+        if len(lookup) > 256 and codes.typecode == 'B':
+            codes = self.columns[j] = array('H', codes)
+        codes.extend(map(lookup.__getitem__, values))
+
+    def build(self):
+        """
+        Devolve a Table construída (colunas sem linhas ficam do tipo 'str').
+        """
+        types = [kind or STR for kind in self.types]
+        columns = [[] if column is None else column for column in self.columns]
+        for j, lookup in enumerate(self.lookups):
+            if lookup is not None:
+                # Renumera os códigos pela ordem dos textos
+                texts = sorted(lookup)
+                rank = array('l', [0]) * len(texts)
+                for code, text in enumerate(texts):
+                    rank[lookup[text]] = code
+                codes = columns[j]
+                if codes.typecode == 'B':
+                    # Códigos de um byte: a renumeração é uma tradução dos bytes
+                    codes = array('B', codes.tobytes().translate(bytes(rank.tolist()) + bytes(256 - len(rank))))
+                else:
+                    codes = array(codes.typecode, map(rank.__getitem__, codes))
+                columns[j] = EncodedColumn(texts, codes)
+        return Table(self.header, types, columns)
+
+
+class Table:
+    """
+    Tabela guardada por colunas.
+
+    Cada coluna numérica é um array ('q' para inteiros, 'd' para reais) ou uma NumberColumn, e
+    cada coluna de texto é uma lista de strings ou, com poucos valores distintos, uma EncodedColumn. As colunas nunca são alteradas depois de criadas, por
+    isso podem ser partilhadas entre tabelas (p.ex. numa projeção).
+    """
+
+    __slots__ = ('header', 'types', 'columns')
+
+    def __init__(self, header, types, columns):
+        """
+        Atributos:
+            header (list): Nomes das colunas.
+            types (list): Tipo de cada coluna ('int', 'float', 'str' ou 'timestamp').
+            columns (list): Valores de cada coluna.
+        """
+        self.header = header
+        self.types = types
+        self.columns = columns
+
+    @classmethod
+    def from_rows(cls, header, rows):
+        """
+        Constrói uma tabela a partir de linhas de texto, inferindo o tipo de cada coluna.
+        Linhas mais curtas que o cabeçalho são completadas com strings vazias.
+        """
+        builder = TableBuilder(header)
+        builder.append(rows)
+        return builder.build()
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def __getitem__(self, key):
+        # Compatibilidade com a representação antiga {"header": [...], "data": [[str, ...], ...]}
+        if key == 'header':
+            return self.header
+        if key == 'data':
+            return list(self.text_rows())
+        raise KeyError(key)
+
+    def index(self, name):
+        """
+        Devolve a posição de uma coluna pelo nome.
+        """
+        return self.header.index(name)
+
+    def rows(self, ids=None, positions=None):
+        """
+        Itera as linhas (tuplos de valores tipados), todas ou só as das posições ids,
+        opcionalmente só com as colunas nas posições dadas.
+        """
+        columns = self.columns if positions is None else [self.columns[i] for i in positions]
+        if ids is None:
+            return zip(*columns)
+        if not columns:
+            return (() for _ in ids)
+        return zip(*map(gather, columns, tee(ids, len(columns))))
+
+    def text_rows(self, ids=None, positions=None):
+        """
+        Itera as linhas como listas de strings, no formato em que foram lidas.
+        """
+        return (list(map(str, row)) for row in self.rows(ids, positions))
+
+    def project(self, positions):
+        """
+        Devolve uma tabela só com as colunas nas posições dadas, sem copiar valores.
+        """
+        return Table([self.header[i] for i in positions],
+                     [self.types[i] for i in positions],
+                     [self.columns[i] for i in positions])
+
+    def take(self, ids, positions=None):
+        """
+        Devolve uma nova tabela com as linhas nas posições ids (e, opcionalmente, só
+        as colunas nas posições dadas).
+        """
+        if positions is None:
+            positions = range(len(self.header))
+        return Table([self.header[i] for i in positions],
+                     [self.types[i] for i in positions],
+                     [take(self.columns[i], ids) for i in positions])
+
+
+class Selection:
+    """
+    Resultado preguiçoso de uma consulta: uma tabela, as posições das colunas a
+    projetar e um iterador com as posições das linhas selecionadas.
+
+    Nada é lido nem copiado até o resultado ser percorrido (text_rows) ou
+    materializado numa nova tabela (materialize). O iterador só pode ser consumido uma vez.
+    """
+
+    __slots__ = ('table', 'positions', 'ids')
+
+    def __init__(self, table, positions, ids=None):
+        """
+        Atributos:
+            table (Table): Tabela de origem.
+            positions (list): Posições das colunas projetadas.
+            ids (iterable): Posições das linhas selecionadas (None para todas).
+        """
+        self.table = table
+        self.positions = positions
+        self.ids = ids
+
+    @property
+    def header(self):
+        return [self.table.header[i] for i in self.positions]
+
+    def rows(self):
+        return self.table.rows(self.ids, self.positions)
+
+    def text_rows(self):
+        return self.table.text_rows(self.ids, self.positions)
+
+    def materialize(self):
+        """
+        Constrói uma Table com o resultado (só as colunas projetadas são copiadas).
+        """
+        if self.ids is None:
+            return self.table.project(self.positions)
+        return self.table.take(list(self.ids), self.positions)
+
+    def view(self):
+        """
+        Guarda o resultado como tabela derivada sem copiar valores: uma projeção, ou uma
+        TableView com as posições das linhas selecionadas. Tabelas que não estão em memória
+        (MappedTable) são materializadas.
+        """
+        if self.ids is None:
+            return self.table.project(self.positions)
+        if isinstance(self.table, TableView):
+            return self.table.select(self.ids, self.positions)
+        if isinstance(self.table, Table):
+            return TableView(self.table, self.positions, array('q', self.ids))
+        return self.materialize()
+
+
+class TableView:
+    """
+    Tabela derivada sem cópia dos valores: uma Table de origem, as posições das colunas
+    projetadas e um vetor de seleção (array 'q') com as posições das linhas escolhidas.
+
+    Comporta-se como uma Table (header, types, columns, rows, take, ...), com posições
+    de linha relativas à vista; cada acesso é traduzido para a origem. Como as Tables não
+    são alteradas, a vista fica válida enquanto a origem existir; materialize() copia os
+    valores para uma Table independente.
+    """
+
+    __slots__ = ('source', 'positions', 'ids', 'header', 'types', 'columns')
+
+    def __init__(self, source, positions, ids):
+        """
+        Atributos:
+            source (Table): Tabela de origem (nunca outra vista).
+            positions (list): Posições, na origem, das colunas da vista.
+            ids (array): Posições, na origem, das linhas da vista.
+            columns (list): Uma ViewColumn por coluna.
+        """
+        self.source = source
+        self.positions = positions
+        self.ids = ids
+        self.header = [source.header[p] for p in positions]
+        self.types = [source.types[p] for p in positions]
+        self.columns = [ViewColumn(source.columns[p], ids) for p in positions]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, key):
+        # Compatibilidade com a representação antiga {"header": [...], "data": [[str, ...], ...]}
+        if key == 'header':
+            return self.header
+        if key == 'data':
+            return list(self.text_rows())
+        raise KeyError(key)
+
+    def index(self, name):
+        return self.header.index(name)
+
+    def source_ids(self, ids):
+        return self.ids if ids is None else array('q', map(self.ids.__getitem__, ids))
+
+    def source_positions(self, positions):
+        return self.positions if positions is None else [self.positions[p] for p in positions]
+
+    def rows(self, ids=None, positions=None):
+        ids = self.ids if ids is None else map(self.ids.__getitem__, ids)
+        return self.source.rows(ids, self.source_positions(positions))
+
+    def text_rows(self, ids=None, positions=None):
+        return (list(map(str, row)) for row in self.rows(ids, positions))
+
+    def project(self, positions):
+        return TableView(self.source, self.source_positions(positions), self.ids)
+
+    def select(self, ids, positions=None):
+        """
+        Vista sobre as linhas ids (e colunas positions) desta vista, com a mesma origem.
+        """
+        return TableView(self.source, self.source_positions(positions), self.source_ids(ids))
+
+    def take(self, ids, positions=None):
+        return self.source.take(self.source_ids(ids), self.source_positions(positions))
+
+    def materialize(self):
+        """
+        Copia os valores da vista para uma Table independente da origem.
+        """
+        return self.source.take(self.ids, self.positions)
+
+
+class ViewColumn:
+    """
+    Coluna de uma TableView: sequência só de leitura que lê da coluna de origem através
+    do vetor de seleção.
+    """
+
+    __slots__ = ('column', 'ids')
+
+    def __init__(self, column, ids):
+        self.column = column
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        return self.column[self.ids[i]]
+
+    def __iter__(self):
+        return gather(self.column, self.ids)
+
+    def scan(self, start, stop):
+        return gather(self.column, self.ids[start:stop])
+
+
+class EncodedColumn:
+    """
+    Coluna de texto codificada por dicionário: os textos distintos, ordenados (values), e
+    o código de cada linha, a posição do seu texto em values (codes, um array de 1 ou 2
+    bytes por linha). Cada texto fica em memória uma só vez.
+
+    Como os códigos seguem a ordem dos textos, comparar dois códigos é o mesmo que
+    comparar os textos: o WHERE avalia cada condição uma vez por valor distinto e filtra
+    as linhas pelos códigos, e o JOIN e o ORDER BY comparam códigos (ver codes_of). Os
+    textos só são lidos quando o resultado é escrito.
+    """
+
+    __slots__ = ('values', 'codes')
+
+    def __init__(self, values, codes):
+        self.values = values
+        self.codes = codes
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return EncodedColumn(self.values, self.codes[i])
+        return self.values[self.codes[i]]
+
+    def __iter__(self):
+        return map(self.values.__getitem__, self.codes)
+
+    def scan(self, start, stop):
+        return map(self.values.__getitem__, islice(self.codes, start, stop))
+
+    def take(self, ids):
+        return EncodedColumn(self.values, array(self.codes.typecode, map(self.codes.__getitem__, ids)))
+
+
+class NumberColumn:
+    """
+    Coluna 'float' com números escritos no ficheiro como inteiros ('100') e como reais
+    ('23.5'): um array de reais com todos os valores. Os valores inteiros são lidos como
+    int, para que PRINT e EXPORT escrevam o texto original; o ORDER BY e o JOIN comparam
+    diretamente os reais (ver numbers_of).
+    """
+
+    __slots__ = ('values',)
+
+    def __init__(self, values):
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return NumberColumn(self.values[i])
+        return number(self.values[i])
+
+    def __iter__(self):
+        return map(number, self.values)
+
+    def scan(self, start, stop):
+        return map(number, islice(self.values, start, stop))
+
+    def take(self, ids):
+        return NumberColumn(array('d', map(self.values.__getitem__, ids)))
+
+
+class TimestampColumn:
+    """
+    Coluna 'timestamp': um array de inteiros com os segundos desde 1970-01-01 de cada
+    linha e a forma como cada instante estava escrito (layouts, ver layouts_of). Os valores
+    lidos são Timestamp (inteiros escritos em ISO-8601 nessa forma); as condições do WHERE,
+    o ORDER BY e o JOIN comparam diretamente os inteiros (ver epochs_of).
+
+    ordered indica se os instantes estão por ordem crescente (calculado no primeiro uso):
+    nesse caso, uma condição de intervalo (<, <=, >, >=) é resolvida por pesquisa binária.
+    """
+
+    __slots__ = ('epochs', 'layouts', 'ordered')
+
+    def __init__(self, epochs, layouts=0):
+        self.epochs = epochs
+        self.layouts = layouts
+        self.ordered = None
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def __getitem__(self, i):
+        layouts = self.layouts
+        if isinstance(i, slice):
+            return TimestampColumn(self.epochs[i], layouts if isinstance(layouts, int) else layouts[i])
+        if isinstance(layouts, int):
+            return STAMPS[layouts](self.epochs[i])
+        return VARIED[layouts[i]](self.epochs[i])
+
+    def __iter__(self):
+        return self.scan(0, len(self.epochs))
+
+    def scan(self, start, stop):
+        epochs = islice(self.epochs, start, stop)
+        if isinstance(self.layouts, int):
+            return map(STAMPS[self.layouts], epochs)
+        return map(stamp, epochs, islice(self.layouts, start, stop), repeat(True))
+
+    def take(self, ids):
+        epochs = array('q', map(self.epochs.__getitem__, ids))
+        if isinstance(self.layouts, int):
+            return TimestampColumn(epochs, self.layouts)
+        return TimestampColumn(epochs, array('B', map(self.layouts.__getitem__, ids)))
+
+    def extend(self, other):
+        if not (isinstance(self.layouts, int) and self.layouts == other.layouts):
+            self.layouts = self.spread()
+            self.layouts.extend(other.spread())
+        self.epochs.extend(other.epochs)
+        self.ordered = None
+
+    def spread(self):
+        """
+        Devolve a forma de escrita de cada instante, como array.
+        """
+        if isinstance(self.layouts, int):
+            return array('B', [self.layouts]) * len(self.epochs)
+        return self.layouts
+
+    def is_ordered(self):
+        if self.ordered is None:
+            epochs = self.epochs
+            self.ordered = all(map(int.__le__, epochs, islice(epochs, 1, None)))
+        return self.ordered
@@ -9,10 +9,17 @@ interpreter = Interpreter()
 examples = [
     'IMPORT TABLE observacoes FROM "examples/observacoes.csv";',
     'IMPORT TABLE estacoes FROM "examples/estacoes.csv";',
+    'IMPORT TABLE obsmap FROM "examples/observacoes.csv" MAPPED;',
+    "SELECT * FROM obsmap WHERE Temperatura > 15;",
     "SELECT * FROM observacoes;",
     "SELECT Temperatura FROM observacoes;",
     "SELECT * FROM observacoes WHERE Temperatura > 15;",
     "SELECT * FROM observacoes WHERE Temperatura > 15 AND Temperatura < 20;",
+    'SELECT Id FROM observacoes WHERE Temperatura < "abc";',
+    "SELECT Id FROM observacoes WHERE Id < 5;",
+    "CREATE INDEX idx_temp ON observacoes (Temperatura);",
+    "SELECT * FROM observacoes WHERE Temperatura > 15 AND Temperatura < 20;",
+    "DROP INDEX idx_temp;",
     "SELECT * FROM observacoes LIMIT 3;",
     "SELECT Temperatura FROM observacoes LIMIT 2;",
     "CREATE TABLE Temp SELECT Temperatura FROM observacoes LIMIT 2;",
@@ -21,8 +28,17 @@ examples = [
     "DISCARD TABLE Temp;",
     "RENAME TABLE estacoes station;",
     "PRINT TABLE station;",
+    "CREATE TABLE Junto FROM observacoes JOIN station USING Id;",
+    "PRINT TABLE Junto;",
     "PROCEDURE Teste DO CREATE TABLE Testetemp SELECT * FROM observacoes WHERE Temperatura > 22; END;",
     "CALL Teste;",
+    "SELECT Id, AVG(Temperatura), MAX(Humidade) FROM observacoes GROUP BY Id;",
+    "CREATE TABLE Medias SELECT DirecaoVento, COUNT(*), AVG(Temperatura) FROM observacoes GROUP BY DirecaoVento;",
+    "PRINT TABLE Medias;",
+    "SELECT Id, Temperatura FROM observacoes ORDER BY Temperatura DESC LIMIT 2;",
+    "SELECT * FROM observacoes ORDER BY DirecaoVento, Humidade DESC;",
+    "EXPLAIN SELECT Id, AVG(Temperatura) FROM observacoes WHERE Humidade < 90 GROUP BY Id;",
+    "EXPLAIN ANALYZE CALL Teste;",
 ]
 
 for example in examples:
@@ -30,4 +46,358 @@ for example in examples:
     output = interpreter.start(example)
     if output:
         print(output)
-    print("-" * 40)
\ No newline at end of file
+    print("-" * 40)
+
+# Modo streaming: instruções analisadas e executadas à medida que as linhas são lidas
+script = [
+    "PRINT TABLE station; -- comentário;\n",
+    'SELECT * FROM observacoes WHERE Id = "; não termina";\n',
+    "PROCEDURE Outro DO PRINT TABLE station;\n",
+    "END;\n",
+    "CALL Outro;\n",
+]
+print("Input (stream):", "".join(script))
+interpreter.start_stream(script)
+print("-" * 40)
+
+# WHERE avaliado em paralelo (limiar 0 para forçar a divisão em partições)
+paralelo = Interpreter(workers=2, parallel_threshold=0)
+paralelo.start('IMPORT TABLE observacoes FROM "examples/observacoes.csv";')
+print("Input (paralelo):", "SELECT * FROM observacoes WHERE Temperatura > 15;")
+paralelo.start("SELECT * FROM observacoes WHERE Temperatura > 15;")
+paralelo.scan_pool.close()
+print("-" * 40)
+
+# Resultados escritos em blocos, noutros formatos e com limite de linhas
+from writer import ResultWriter
+for fmt in ("table", "csv", "tsv"):
+    formatado = Interpreter(quiet=True, writer=ResultWriter(format=fmt, max_rows=3))
+    formatado.start('IMPORT TABLE observacoes FROM "examples/observacoes.csv";')
+    print(f"Input ({fmt}, max 3):", "SELECT Id, Temperatura, DirecaoVento FROM observacoes;")
+    formatado.start("SELECT Id, Temperatura, DirecaoVento FROM observacoes;")
+    print("-" * 40)
+
+# EXPORT de uma consulta, sem tabela intermédia, e leitura/escrita de CSV comprimido
+import tempfile
+with tempfile.TemporaryDirectory() as directory:
+    comprimido = Interpreter(quiet=True, cache=False)
+    for example in [
+        'IMPORT TABLE observacoes FROM "examples/observacoes.csv";',
+        f'EXPORT SELECT Id, Temperatura FROM observacoes WHERE Temperatura > 15 AS "{directory}/quentes.csv.gz";',
+        f'IMPORT TABLE quentes FROM "{directory}/quentes.csv.gz";',
+        "PRINT TABLE quentes;",
+        f'EXPORT TABLE quentes AS "{directory}/quentes.csv.xz";',
+        f'IMPORT TABLE copia FROM "{directory}/quentes.csv.xz";',
+        "PRINT TABLE copia;",
+    ]:
+        print("Input:", example.replace(directory, "<tmp>"))
+        comprimido.start(example)
+        print("-" * 40)
+
+    # Resultados num ficheiro: o EXPLAIN é escrito com eles, os da instrução analisada não
+    em_ficheiro = Interpreter(quiet=True, cache=False, writer=ResultWriter(f"{directory}/resultados.txt"))
+    em_ficheiro.start('IMPORT TABLE observacoes FROM "examples/observacoes.csv"; '
+                      "SELECT Id FROM observacoes LIMIT 1; "
+                      "EXPLAIN ANALYZE SELECT Id FROM observacoes WHERE Temperatura > 15;")
+    em_ficheiro.close()
+    with open(f"{directory}/resultados.txt") as file:
+        print("Ficheiro de resultados:", [line.split(":")[0] for line in file.read().splitlines()])
+
+# Tabelas derivadas como vistas (sem cópia), materializadas a pedido ou quando a origem é removida
+vistas = Interpreter(quiet=True, cache=False)
+for example in [
+    'IMPORT TABLE observacoes FROM "examples/observacoes.csv";',
+    "CREATE TABLE Quentes SELECT Id, Temperatura FROM observacoes WHERE Temperatura > 15;",
+    "EXPLAIN SELECT * FROM Quentes WHERE Temperatura < 20;",
+    "SELECT * FROM Quentes WHERE Temperatura < 20;",
+    "MATERIALIZE TABLE Quentes;",
+    "CREATE TABLE Amenas SELECT * FROM Quentes WHERE Temperatura < 20;",
+    "DISCARD TABLE Quentes;",
+    "PRINT TABLE Amenas;",
+]:
+    print("Input:", example)
+    vistas.start(example)
+    print("Tipo:", {name: type(table).__name__ for name, table in vistas.dictionary.items()})
+    print("-" * 40)
+
+# Procedimentos compilados na definição; o plano é resolvido de novo quando o esquema da tabela muda
+compilado = Interpreter(quiet=True, cache=False)
+for example in [
+    'IMPORT TABLE observacoes FROM "examples/observacoes.csv";',
+    "CREATE TABLE Fonte SELECT Id, Temperatura FROM observacoes;",
+    'PROCEDURE Ler DO SELECT * FROM Fonte WHERE Id <> "E2"; END;',
+    "CALL Ler;",
+    "DISCARD TABLE Fonte;",
+    "CREATE TABLE Fonte SELECT Humidade, Id FROM observacoes;",
+    "CALL Ler;",
+]:
+    print("Input:", example)
+    compilado.start(example)
+    print("-" * 40)
+
+# Instruções independentes executadas em paralelo, com a saída pela ordem do script
+concorrente = Interpreter(quiet=True, cache=False, concurrency=4)
+script = """
+IMPORT TABLE observacoes FROM "examples/observacoes.csv";
+IMPORT TABLE estacoes FROM "examples/estacoes.csv";
+SELECT * FROM estacoes LIMIT 1;
+CREATE TABLE Quentes SELECT * FROM observacoes WHERE Temperatura > 15;
+SELECT Id, Temperatura FROM Quentes;
+CREATE TABLE Junto FROM Quentes JOIN estacoes USING Id;
+SELECT Id, Local FROM Junto;
+"""
+print("Input (paralelo):", script)
+concorrente.start(script)
+print("-" * 40)
+
+# Servidor com o catálogo em memória: leituras sobre uma cópia estável, escritas publicadas no fim
+import threading
+import client
+from server import Server
+with tempfile.TemporaryDirectory() as directory:
+    servidor = Server(os.path.join(directory, "consultas.sock"), Interpreter(quiet=True, cache=False))
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    for script in [
+        'IMPORT TABLE observacoes FROM "examples/observacoes.csv";',
+        "SELECT Id, Temperatura FROM observacoes WHERE Temperatura > 15;",
+        "CREATE TABLE Quentes SELECT Id FROM observacoes WHERE Temperatura > 15; DISCARD TABLE Inexistente;",
+        "PRINT TABLE Quentes;",
+        "RENAME TABLE observacoes Obs; PRINT TABLE Obs;",
+    ]:
+        print("Input (servidor):", script)
+        print("Erro:", client.run(servidor.path, script))
+        print("-" * 40)
+    servidor.shutdown()
+    servidor.server_close()
+
+# Cache de resultados: a mesma consulta sobre uma tabela que não mudou não volta a percorrê-la
+resultados = Interpreter(quiet=True, cache=False)
+for example in [
+    'IMPORT TABLE observacoes FROM "examples/observacoes.csv";',
+    "SELECT Id FROM observacoes WHERE Temperatura > 15;",
+    "SELECT * FROM observacoes WHERE Temperatura > 15;",
+    "SELECT Id FROM observacoes WHERE Temperatura > 15;",
+    "EXPLAIN SELECT Id FROM observacoes WHERE Temperatura > 15;",
+    "DISCARD TABLE observacoes;",
+    'IMPORT TABLE observacoes FROM "examples/estacoes.csv";',
+    'SELECT Id FROM observacoes WHERE Id = "E1";',
+]:
+    print("Input:", example)
+    resultados.start(example)
+    print("Cache:", resultados.results.stats())
+    print("-" * 40)
+
+# Colunas de texto com poucos valores distintos codificadas por dicionário
+codificado = Interpreter(quiet=True, cache=False)
+codificado.start('IMPORT TABLE observacoes FROM "examples/observacoes.csv"; IMPORT TABLE estacoes FROM "examples/estacoes.csv";')
+coluna = codificado.dictionary["observacoes"].columns[codificado.dictionary["observacoes"].index("DirecaoVento")]
+print("DirecaoVento:", type(coluna).__name__, coluna.values, list(coluna.codes))
+for example in [
+    'SELECT Id, DirecaoVento FROM observacoes WHERE DirecaoVento = "NE";',
+    'SELECT Id FROM observacoes WHERE DirecaoVento >= "N" ORDER BY DirecaoVento DESC;',
+    "CREATE TABLE Junto FROM observacoes JOIN estacoes USING Id;",
+    "SELECT Id, DirecaoVento, Local FROM Junto;",
+]:
+    print("Input:", example)
+    codificado.start(example)
+    print("-" * 40)
+
+# Coluna 'timestamp': datas e horas ISO-8601 normalizadas e comparadas como instantes
+instantes = Interpreter(quiet=True, cache=False)
+for example in [
+    'IMPORT TABLE observacoes FROM "examples/observacoes.csv";',
+    "SELECT Id, DataHoraObservacao FROM observacoes;",
+    'SELECT Id FROM observacoes WHERE DataHoraObservacao = "2025-04-10T19:00:00";',
+    'SELECT Id FROM observacoes WHERE DataHoraObservacao >= TIMESTAMP "2025-04-10 19:00" AND DataHoraObservacao < TIMESTAMP "2025-04-11";',
+    'EXPLAIN SELECT Id FROM observacoes WHERE DataHoraObservacao > TIMESTAMP "2025-04-10";',
+    "SELECT DataHoraObservacao, COUNT(*) FROM observacoes GROUP BY DataHoraObservacao;",
+    'IMPORT TABLE mapeadas FROM "examples/observacoes.csv" MAPPED;',
+    'SELECT Id FROM mapeadas WHERE DataHoraObservacao = "2025-04-10T19:00:00";',
+    'SELECT Id FROM mapeadas WHERE DataHoraObservacao >= TIMESTAMP "2025-04-10 19:00" AND DataHoraObservacao < TIMESTAMP "2025-04-11";',
+]:
+    print("Input:", example)
+    instantes.start(example)
+    print("-" * 40)
+print("Tipos:", instantes.dictionary["observacoes"].types)
+
+# Uma coluna de datas que passa a texto num bloco posterior mantém o texto original
+with tempfile.TemporaryDirectory() as directory:
+    with open(os.path.join(directory, "datas.csv"), "w") as file:
+        file.write("Data\n2025-04-10T19:00\n2025-04-11 08:30\ndesconhecido\n")
+    blocos = Interpreter(quiet=True, cache=False, memory_budget=1)
+    blocos.start(f'IMPORT TABLE datas FROM "{directory}/datas.csv"; PRINT TABLE datas;')
+    print("Tipos:", blocos.dictionary["datas"].types)
+
+# Importação só das colunas e linhas pedidas (COLUMNS e WHERE no IMPORT)
+parcial = Interpreter(quiet=True, cache=False)
+for example in [
+    'IMPORT TABLE quentes FROM "examples/observacoes.csv" COLUMNS Id, Temperatura WHERE Temperatura > 15;',
+    "PRINT TABLE quentes;",
+    'EXPLAIN IMPORT TABLE ventos FROM "examples/observacoes.csv" COLUMNS Id, DirecaoVento WHERE DirecaoVento = "NE";',
+]:
+    print("Input:", example)
+    parcial.start(example)
+    print("-" * 40)
+
+# WHERE no IMPORT com uma coluna cujo tipo muda entre blocos: o mesmo resultado que o SELECT
+with tempfile.TemporaryDirectory() as directory:
+    with open(os.path.join(directory, "mistas.csv"), "w") as file:
+        file.write("Id,Data\nA,2025-04-10 19:00\nB,2025-04-11 08:30\nC,desconhecido\n")
+    mistas = Interpreter(quiet=True, cache=False, memory_budget=1)
+    for example in [
+        f'IMPORT TABLE filtrada FROM "{directory}/mistas.csv" COLUMNS Id WHERE Data > "2025-04-10S";',
+        "PRINT TABLE filtrada;",
+        f'IMPORT TABLE completa FROM "{directory}/mistas.csv";',
+        'SELECT Id FROM completa WHERE Data > "2025-04-10S";',
+    ]:
+        print("Input:", example.replace(directory, "<tmp>"))
+        mistas.start(example)
+        print("-" * 40)
+
+# Com prune_imports, cada IMPORT só lê as colunas que o script usa
+podado = Interpreter(quiet=True, cache=False, prune_imports=True)
+podado.start('IMPORT TABLE observacoes FROM "examples/observacoes.csv"; '
+             "SELECT Id, AVG(Temperatura) FROM observacoes WHERE Humidade > 50 GROUP BY Id;")
+print("Colunas lidas:", podado.dictionary["observacoes"].header)
+
+# Colunas e tabelas com o nome de uma palavra reservada, entre acentos graves
+with tempfile.TemporaryDirectory() as directory:
+    with open(os.path.join(directory, "contagens.csv"), "w") as file:
+        file.write("Id,count,min,Data Hora\nE1,3,1,2025-04-10T19:00\nE2,5,2,2025-04-11T08:30\nE1,7,0,2025-04-12T10:00\n")
+    reservadas = Interpreter(quiet=True, cache=False)
+    for example in [
+        f'IMPORT TABLE `index` FROM "{directory}/contagens.csv";',
+        "SELECT Id, `count` FROM `index` WHERE `count` > 4 ORDER BY `min`;",
+        "SELECT Id, SUM(`count`), MAX(`Data Hora`) FROM `index` GROUP BY Id;",
+        "CREATE INDEX `on` ON `index` (`count`);",
+        "SELECT `Data Hora` FROM `index` WHERE `count` = 3;",
+    ]:
+        print("Input:", example.replace(directory, "<tmp>"))
+        reservadas.start(example)
+        print("-" * 40)
+
+
+# --------- Verificações (pytest) ---------
+
+def consultar(interpretador, consulta):
+    """
+    Devolve o resultado de um SELECT como listas de textos.
+    """
+    return list(interpretador.execute_select(interpretador.parse(consulta)[0]).text_rows())
+
+
+def test_join_instantes_com_texto(tmp_path):
+    (tmp_path / "a.csv").write_text("K,A\n2025-04-10T19:00,1\nunknown,2\n")
+    (tmp_path / "b.csv").write_text("K,B\n2025-04-10 19:00,3\n")
+    juncao = Interpreter(quiet=True, cache=False)
+    juncao.start(f'IMPORT TABLE a FROM "{tmp_path}/a.csv"; IMPORT TABLE b FROM "{tmp_path}/b.csv"; '
+                 f'IMPORT TABLE m FROM "{tmp_path}/b.csv" MAPPED; '
+                 "CREATE TABLE j FROM a JOIN b USING K; CREATE TABLE k FROM m JOIN b USING K;")
+    assert (juncao.dictionary["a"].types[0], juncao.dictionary["b"].types[0]) == ("str", "timestamp")
+    assert consultar(juncao, "SELECT A, B FROM j;") == [["1", "3"]]
+    assert len(juncao.dictionary["k"]) == 1
+
+
+def test_order_by_numeros_em_texto(tmp_path):
+    (tmp_path / "k.csv").write_text("K\n100\n23.5\n9\nabc\n")
+    for options in ({}, {"sort_buffer": 1}):
+        ordenado = Interpreter(quiet=True, cache=False, **options)
+        ordenado.start(f'IMPORT TABLE k FROM "{tmp_path}/k.csv"; IMPORT TABLE m FROM "{tmp_path}/k.csv" MAPPED;')
+        for table in ("k", "m"):
+            assert consultar(ordenado, f"SELECT K FROM {table} ORDER BY K DESC;") == [["abc"], ["100"], ["23.5"], ["9"]]
+            assert consultar(ordenado, f"SELECT K FROM {table} ORDER BY K LIMIT 2;") == [["9"], ["23.5"]]
+            assert consultar(ordenado, f"SELECT K FROM {table} WHERE K > 20 ORDER BY K;") == [["23.5"], ["100"], ["abc"]]
+
+
+def test_min_max_numeros_em_texto(tmp_path):
+    (tmp_path / "v.csv").write_text("G,V\na,9.5\na,10.5\na,100.25\nb,x\nb,7\n")
+    agregado = Interpreter(quiet=True, cache=False)
+    agregado.start(f'IMPORT TABLE v FROM "{tmp_path}/v.csv"; IMPORT TABLE m FROM "{tmp_path}/v.csv" MAPPED;')
+    for table in ("v", "m"):
+        assert consultar(agregado, f"SELECT G, MIN(V), MAX(V) FROM {table} GROUP BY G;") == [
+            ["a", "9.5", "100.25"], ["b", "7", "x"]]
+        assert consultar(agregado, f'SELECT MAX(V), SUM(V) FROM {table} WHERE G = "a";') == [["100.25", "120.25"]]
+
+
+def test_inteiros_e_reais_sao_float(tmp_path):
+    (tmp_path / "k.csv").write_text("K\n100\n23.5\n9\n")
+    for budget in (1, 64 * 1024 * 1024):
+        numeros = Interpreter(quiet=True, cache=False, memory_budget=budget)
+        numeros.start(f'IMPORT TABLE k FROM "{tmp_path}/k.csv"; EXPORT TABLE k AS "{tmp_path}/copia.csv";')
+        assert numeros.dictionary["k"].types == ["float"]
+        assert (tmp_path / "copia.csv").read_bytes() == b"K\r\n100\r\n23.5\r\n9\r\n"
+        assert consultar(numeros, "SELECT K FROM k ORDER BY K DESC;") == [["100"], ["23.5"], ["9"]]
+        assert consultar(numeros, "SELECT K FROM k WHERE K > 20;") == [["100"], ["23.5"]]
+
+
+def test_export_mantem_o_texto_dos_instantes(tmp_path):
+    texto = "Id,Data\nA,2025-04-10T19:00\nB,2025-04-11 08:30:15\nC,2025-04-10 19:00\n"
+    (tmp_path / "datas.csv").write_text(texto)
+    for budget in (1, 64 * 1024 * 1024):
+        instantes = Interpreter(quiet=True, cache=False, memory_budget=budget)
+        instantes.start(f'IMPORT TABLE d FROM "{tmp_path}/datas.csv"; IMPORT TABLE m FROM "{tmp_path}/datas.csv" MAPPED; '
+                        f'EXPORT TABLE d AS "{tmp_path}/copia.csv";')
+        assert instantes.dictionary["d"].types == ["str", "timestamp"]
+        assert (tmp_path / "copia.csv").read_bytes() == texto.replace("\n", "\r\n").encode()
+        assert consultar(instantes, "SELECT * FROM d;") == consultar(instantes, "SELECT * FROM m;")
+        assert consultar(instantes, 'SELECT Id FROM d WHERE Data = "2025-04-10T19:00:00";') == [["A"], ["C"]]
+        assert consultar(instantes, "SELECT Id, Data FROM d ORDER BY Data DESC LIMIT 1;") == [["B", "2025-04-11 08:30:15"]]
+
+
+def test_estrategia_do_join_nos_resultados(tmp_path, capsys):
+    saida = tmp_path / "resultados.txt"
+    script = ('IMPORT TABLE o FROM "examples/observacoes.csv"; IMPORT TABLE e FROM "examples/estacoes.csv"; '
+              "CREATE TABLE j FROM o JOIN e USING Id;")
+    for quiet in (False, True):
+        saida.write_text("")
+        juncao = Interpreter(quiet=quiet, cache=False, writer=ResultWriter(str(saida)))
+        juncao.start(script)
+        juncao.close()
+        assert ("Join strategy:" in saida.read_text()) == (not quiet)
+        assert "Join strategy:" not in capsys.readouterr().out
+
+
+def test_explain_no_ficheiro_de_resultados(tmp_path, capsys):
+    saida = tmp_path / "resultados.txt"
+    explicado = Interpreter(quiet=True, cache=False, writer=ResultWriter(str(saida)))
+    explicado.start('IMPORT TABLE o FROM "examples/observacoes.csv"; '
+                    "EXPLAIN ANALYZE SELECT Id FROM o WHERE Temperatura > 15;")
+    explicado.close()
+    linhas = saida.read_text().splitlines()
+    assert linhas and not any(linha.startswith("['Id']") for linha in linhas)
+    assert capsys.readouterr().out == ""
+
+
+def test_datas_que_passam_a_texto_num_bloco_posterior(tmp_path):
+    (tmp_path / "datas.csv").write_text("Data\n2025-04-10T19:00\n2025-04-11 08:30\ndesconhecido\n")
+    for budget in (1, 64 * 1024 * 1024):
+        blocos = Interpreter(quiet=True, cache=False, memory_budget=budget)
+        blocos.start(f'IMPORT TABLE d FROM "{tmp_path}/datas.csv";')
+        assert blocos.dictionary["d"].types == ["str"]
+        assert consultar(blocos, "SELECT * FROM d;") == [["2025-04-10T19:00"], ["2025-04-11 08:30"], ["desconhecido"]]
+
+
+def test_import_where_com_tipos_que_mudam_entre_blocos(tmp_path):
+    (tmp_path / "mistas.csv").write_text("Id,V,Data\nA,5,2025-04-10 19:00\nB,23.5,2025-04-11 08:30\n"
+                                         "C,x,desconhecido\nD,100,2025-04-12T00:00\n")
+    for condicao in ('V > 20', 'V < "y"', 'Data > "2025-04-10S"', 'Data >= TIMESTAMP "2025-04-11"'):
+        blocos = Interpreter(quiet=True, cache=False, memory_budget=1)
+        blocos.start(f'IMPORT TABLE f FROM "{tmp_path}/mistas.csv" COLUMNS Id WHERE {condicao}; '
+                     f'IMPORT TABLE c FROM "{tmp_path}/mistas.csv";')
+        assert consultar(blocos, "SELECT * FROM f;") == consultar(blocos, f"SELECT Id FROM c WHERE {condicao};")
+
+
+def test_comparacoes_entre_tipos_diferentes():
+    tipos = Interpreter(quiet=True, cache=False)
+    tipos.start('IMPORT TABLE o FROM "examples/observacoes.csv";')
+    assert consultar(tipos, 'SELECT Id FROM o WHERE Temperatura < "abc";')
+    assert consultar(tipos, "SELECT Id FROM o WHERE Id < 5;") == []
+
+
+def test_nomes_reservados_entre_acentos_graves(tmp_path):
+    (tmp_path / "contagens.csv").write_text("Id,count,min\nE1,3,1\nE2,5,2\nE1,7,0\n")
+    reservadas = Interpreter(quiet=True, cache=False)
+    reservadas.start(f'IMPORT TABLE `index` FROM "{tmp_path}/contagens.csv";')
+    assert consultar(reservadas, "SELECT Id, `count` FROM `index` WHERE `count` > 4 ORDER BY `min`;") == [
+        ["E1", "7"], ["E2", "5"]]
+    assert consultar(reservadas, "SELECT Id, SUM(`count`) FROM `index` GROUP BY Id;") == [["E1", "10"], ["E2", "5"]]
@@ -12,6 +12,7 @@ examples = [
     "SELECT * FROM observacoes WHERE Temperatura > 22;",
     "-- Comentario teste\nSELECT Id FROM estacoes;",
     '{- Comentario teste\n Comentario teste-}\nEXPORT TABLE estacoes AS "station.csv";',
+    "SELECT `count`, `Data Hora` FROM `index`;",
 ]
 
 for example in examples:
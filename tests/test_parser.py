@@ -8,11 +8,23 @@ parser = Parser()
 
 examples = [
     'IMPORT TABLE obs FROM "observacoes.csv";',
+    'IMPORT TABLE obs FROM "observacoes.csv" MAPPED;',
     "SELECT IntensidadeVentoKM,Temperatura FROM obs;",
     "SELECT * FROM obs WHERE Temperatura > 15;",
     "CREATE TABLE Tempmaior SELECT * FROM obs WHERE Temperatura > 15;",
     "PROCEDURE atualizar DO CREATE TABLE Tempmaior SELECT * FROM obs WHERE Temperatura > 20 ; END",
     '-- comment\nEXPORT TABLE obs AS "obs.csv";',
+    "CREATE INDEX idx_id ON obs (Id);",
+    "DROP INDEX idx_id;",
+    "SELECT Id, AVG(Temperatura), MAX(Humidade) FROM obs GROUP BY Id;",
+    "CREATE TABLE Medias SELECT Id, COUNT(*) FROM obs WHERE Temperatura > 15 GROUP BY Id;",
+    "SELECT * FROM obs ORDER BY Temperatura DESC, Id ASC LIMIT 3;",
+    "SELECT Id, AVG(Temperatura) FROM obs GROUP BY Id ORDER BY AVG(Temperatura) DESC;",
+    "EXPLAIN SELECT * FROM obs WHERE Temperatura > 15;",
+    "EXPLAIN ANALYZE CALL atualizar;",
+    'EXPORT SELECT Id, Temperatura FROM obs WHERE Temperatura > 15 AS "quentes.csv.gz";',
+    "MATERIALIZE TABLE Tempmaior;",
+    'IMPORT TABLE obs FROM "observacoes.csv" COLUMNS Id, Temperatura WHERE Temperatura > 15;',
 ]
 
 for example in examples:
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+import re
+
+
+# Formatos ISO-8601 reconhecidos numa coluna: data e hora, separadas por 'T' ou espaço, com ou sem segundos
+DATETIME = re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2})?\Z')
+
+# Nos literais do WHERE também é aceite só a data (meia-noite)
+DATE = re.compile(r'\d{4}-\d{2}-\d{2}\Z')
+
+# Formas de escrever um instante aceites por DATETIME: (separador, precisão) de isoformat
+LAYOUTS = (('T', 'seconds'), ('T', 'minutes'), (' ', 'seconds'), (' ', 'minutes'))
+
+EPOCH = datetime(1970, 1, 1)
+SECOND = timedelta(seconds=1)
+
+
+def parse_timestamp(text, dates=False):
+    """
+    Converte um texto ISO-8601 ('2025-04-10T19:00', '2025-04-10 19:00:00', ...) no número
+    de segundos desde 1970-01-01, ou devolve None se não for um instante válido. As datas
+    e horas não têm fuso horário: duas escritas do mesmo instante dão o mesmo número.
+    Com dates, uma data sem hora também é aceite.
+    """
+    if not (DATETIME.match(text) or dates and DATE.match(text)):
+        return None
+    try:
+        return (datetime.fromisoformat(text) - EPOCH) // SECOND
+    except ValueError:
+        return None
+
+
+def timestamp_layout(text):
+    """
+    Devolve a posição em LAYOUTS da forma como um instante válido (ver DATETIME) está escrito.
+    """
+    return 2 * (text[10] == ' ') + (len(text) == 16)
+
+
+def format_timestamp(seconds, layout=0):
+    """
+    Escreve um instante (segundos desde 1970-01-01) no formato normalizado 'AAAA-MM-DDTHH:MM:SS',
+    ou, com layout (ver timestamp_layout), na forma em que foi escrito no ficheiro.
+    """
+    sep, timespec = LAYOUTS[layout]
+    return (EPOCH + timedelta(seconds=int(seconds))).isoformat(sep, timespec)
+
+
+class Timestamp(int):
+    """
+    Valor de uma coluna 'timestamp': um inteiro (segundos desde 1970-01-01), que se
+    compara, ordena e agrupa como tal, mas é escrito em ISO-8601 na forma layout (ver
+    LAYOUTS): os valores de uma coluna são instâncias de STAMPS, uma subclasse por forma,
+    e PRINT e EXPORT escrevem cada instante como estava no ficheiro. Também é o valor de
+    um literal TIMESTAMP "...", escrito no formato normalizado.
+
+    varied indica que o valor vem de uma coluna com instantes escritos de várias formas:
+    aí dois valores iguais podem ter textos diferentes (ver writer.TextCache).
+    """
+
+    __slots__ = ()
+
+    layout = 0
+    varied = False
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Converte o texto de um literal TIMESTAMP; lança ValueError se não for um instante válido.
+        """
+        seconds = parse_timestamp(text, dates=True)
+        if seconds is None:
+            raise ValueError(f"Invalid timestamp: {text}")
+        return cls(seconds)
+
+    def __str__(self):
+        return format_timestamp(self, self.layout)
+
+    def __repr__(self):
+        return f'TIMESTAMP "{self}"'
+
+    def __reduce__(self):
+        return stamp, (int(self), self.layout, self.varied)
+
+
+# Classe dos valores escritos em cada forma de LAYOUTS, e dos de uma coluna com várias formas
+STAMPS = (Timestamp,) + tuple(type('Timestamp', (Timestamp,), {'__slots__': (), 'layout': layout})
+                              for layout in range(1, len(LAYOUTS)))
+VARIED = tuple(type('Timestamp', (Timestamp,), {'__slots__': (), 'layout': layout, 'varied': True})
+               for layout in range(len(LAYOUTS)))
+
+
+def stamp(seconds, layout=0, varied=False):
+    """
+    Devolve o Timestamp de um instante escrito na forma layout (ver timestamp_layout).
+    """
+    return (VARIED if varied else STAMPS)[layout](seconds)
@@ -0,0 +1,241 @@
+from contextlib import contextmanager, redirect_stdout
+from itertools import islice
+from operator import getitem
+import csv
+import io
+import sys
+import threading
+
+from compression import open_text
+from timestamps import Timestamp
+
+
+# Formatos de saída dos resultados
+LIST = 'list'       # Cabeçalho e linhas como listas Python (o formato original)
+TABLE = 'table'     # Colunas alinhadas
+CSV = 'csv'
+TSV = 'tsv'
+FORMATS = (LIST, TABLE, CSV, TSV)
+
+# Linhas formatadas e escritas de cada vez
+BATCH_ROWS = 4096
+
+# Número máximo de valores distintos guardados por coluna em TextCache
+TEXT_CACHE_SIZE = 65536
+
+
+class TextCache(dict):
+    """
+    Texto de cada valor de uma coluna, calculado uma só vez por valor distinto (converter
+    um float para texto é a parte mais cara da escrita). É esvaziada quando passa de
+    TEXT_CACHE_SIZE valores, para colunas com muitos valores distintos.
+
+    Numa coluna com instantes escritos de várias formas, Timestamp iguais podem ter textos
+    diferentes (ver timestamps.Timestamp), por isso esses ficam à parte, em stamps, pelo
+    instante e forma.
+    """
+
+    __slots__ = ('convert', 'stamps')
+
+    def __init__(self, convert):
+        super().__init__()
+        self.convert = convert
+        self.stamps = {}
+
+    def __missing__(self, value):
+        if isinstance(value, Timestamp) and value.varied:
+            key = (value, value.layout)
+            text = self.stamps.get(key)
+            if text is None:
+                if len(self.stamps) >= TEXT_CACHE_SIZE:
+                    self.stamps.clear()
+                text = self.stamps[key] = self.convert(value)
+            return text
+        if len(self) >= TEXT_CACHE_SIZE:
+            self.clear()
+        text = self[value] = self.convert(value)
+        return text
+
+
+def quoted(value):
+    return repr(str(value))
+
+
+class ResultWriter:
+    """
+    Escreve os resultados das consultas (cabeçalho e linhas) num stream, em blocos.
+
+    Cada bloco de BATCH_ROWS linhas é formatado para uma única string e escrito com uma só
+    chamada, em vez de um print() por linha. Com max_rows só as primeiras max_rows linhas
+    de cada resultado são escritas, seguidas de um resumo "(N more rows)"; as restantes
+    são apenas contadas.
+
+    No formato 'table' a largura de cada coluna é calculada com o cabeçalho e o primeiro
+    bloco de linhas; valores mais largos nos blocos seguintes não são cortados.
+    """
+
+    def __init__(self, file=None, format=LIST, max_rows=None, batch=BATCH_ROWS):
+        """
+        Atributos:
+            file (str): Ficheiro onde escrever os resultados (None para o stdout). É criado na
+                primeira escrita e mantido aberto até close(); com extensão .gz, .bz2 ou .xz é
+                comprimido. Em ficheiro, as linhas CSV terminam em \\r\\n, como no EXPORT.
+            format (str): Formato da saída ('list', 'table', 'csv' ou 'tsv').
+            max_rows (int): Número máximo de linhas escritas por resultado (None sem limite).
+            batch (int): Linhas formatadas e escritas de cada vez.
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown output format: {format}")
+        if max_rows is not None and max_rows < 0:
+            raise ValueError("Row limit must not be negative")
+        self.file = file
+        self.format = format
+        self.max_rows = max_rows
+        self.batch = batch
+        self.handle = None
+
+    @property
+    def stream(self):
+        """
+        Stream de saída: o ficheiro (aberto na primeira escrita) ou o sys.stdout atual, para
+        que redirect_stdout também desvie os resultados.
+        """
+        if self.file is None:
+            return sys.stdout
+        if self.handle is None:
+            self.handle = open_text(self.file, 'w', newline='')
+        return self.handle
+
+    def write(self, header, rows):
+        """
+        Escreve um resultado e devolve o seu número total de linhas (incluindo as não escritas).
+        """
+        stream = self.stream
+        rows = iter(rows)
+        shown = rows if self.max_rows is None else islice(rows, self.max_rows)
+        format_batch = getattr(self, 'format_' + self.format)
+        count = 0
+        batch = list(islice(shown, self.batch))
+        state = self.start(header, batch, stream)
+        while batch:
+            stream.write(format_batch(batch, state))
+            count += len(batch)
+            batch = list(islice(shown, self.batch))
+        hidden = sum(1 for _ in rows)
+        if hidden:
+            stream.write(f"({hidden} more {'row' if hidden == 1 else 'rows'})\n")
+        if self.handle is not None:
+            self.handle.flush()
+        return count + hidden
+
+    def message(self, text):
+        """
+        Escreve uma linha de texto que não é um resultado (p.ex. o plano de um EXPLAIN) no
+        mesmo destino dos resultados.
+        """
+        self.stream.write(text + '\n')
+        if self.handle is not None:
+            self.handle.flush()
+
+    def close(self):
+        """
+        Fecha o ficheiro de saída, se tiver sido aberto.
+        """
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+
+    # --------- Formatos ---------
+
+    def start(self, header, first, stream):
+        """
+        Escreve o cabeçalho e devolve o estado usado para formatar os blocos: as larguras
+        das colunas (formato 'table'), a função de escrita do módulo csv e as caches de
+        texto de cada coluna.
+        """
+        if self.format == LIST:
+            stream.write(f"{header}\n")
+            return [TextCache(quoted) for _ in header]
+        texts = [TextCache(str) for _ in header]
+        if self.format == TABLE:
+            widths = [len(name) for name in header]
+            for row in first:
+                widths = [max(width, len(text)) for width, text in zip(widths, map(getitem, texts, row))]
+            stream.write(format_line(header, widths, [False] * len(header)))
+            stream.write('  '.join('-' * width for width in widths).rstrip() + '\n')
+            return widths, texts
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, dialect='excel' if self.format == CSV else 'excel-tab',
+                            lineterminator='\n' if self.file is None else '\r\n')
+        writer.writerow(header)
+        stream.write(buffer.getvalue())
+        return buffer, writer, texts
+
+    def format_list(self, batch, texts):
+        return ''.join(['[' + ', '.join(map(getitem, texts, row)) + ']\n' for row in batch])
+
+    def format_table(self, batch, state):
+        widths, texts = state
+        return ''.join([format_line(map(getitem, texts, row), widths,
+                                    [isinstance(cell, (int, float)) for cell in row])
+                        for row in batch])
+
+    def format_csv(self, batch, state):
+        buffer, writer, texts = state
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([map(getitem, texts, row) for row in batch])
+        return buffer.getvalue()
+
+    format_tsv = format_csv
+
+
+def format_line(texts, widths, numeric):
+    """
+    Formata uma linha do formato 'table': números alinhados à direita, texto à esquerda.
+    """
+    parts = [text.rjust(width) if right else text.ljust(width)
+             for text, width, right in zip(texts, widths, numeric)]
+    return '  '.join(parts).rstrip() + '\n'
+
+
+class ThreadOutput:
+    """
+    Substituto do sys.stdout com um destino por thread: cada thread escreve no stream
+    indicado por redirect (p.ex. o socket da sua sessão, no servidor) ou, por omissão, no
+    stream original. Ao contrário de redirect_stdout, que troca o sys.stdout de todo o
+    processo, permite desviar a saída de várias threads ao mesmo tempo.
+    """
+
+    def __init__(self, default):
+        self.default = default
+        self.local = threading.local()
+
+    @property
+    def target(self):
+        return getattr(self.local, 'stream', None) or self.default
+
+    def write(self, text):
+        return self.target.write(text)
+
+    def flush(self):
+        self.target.flush()
+
+    @contextmanager
+    def redirect(self, stream):
+        previous = getattr(self.local, 'stream', None)
+        self.local.stream = stream
+        try:
+            yield stream
+        finally:
+            self.local.stream = previous
+
+
+def redirected(stream):
+    """
+    Desvia o sys.stdout para stream: só na thread atual, se o sys.stdout for um
+    ThreadOutput, ou em todo o processo (redirect_stdout) caso contrário.
+    """
+    if isinstance(sys.stdout, ThreadOutput):
+        return sys.stdout.redirect(stream)
+    return redirect_stdout(stream)